@@ -1,9 +1,128 @@
 import os
+import re
 import json
+import functools
 import requests
+from requests.adapters import HTTPAdapter
 import webbrowser
 import time
-from urllib.parse import urlparse, parse_qs, urlencode, quote
+import threading
+import queue
+import http.server
+import concurrent.futures
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs, urlencode, quote, unquote_plus
+
+# orjson is optional; fall back to the standard library when it's missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _env_int(name, default):
+    """Read an integer from the environment, ignoring malformed values"""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        print(f"Ignoring invalid {name}; using {default}")
+        return default
+
+# Refresh access tokens this many seconds before they actually expire
+TOKEN_REFRESH_LEAD_SECONDS = _env_int("FLASHGET_TOKEN_REFRESH_LEAD_SECONDS", 60)
+
+# Local redirect target used to capture OAuth authorization codes
+OAUTH_REDIRECT_PORT = 8080
+OAUTH_REDIRECT_URI = f"http://localhost:{OAUTH_REDIRECT_PORT}"
+OAUTH_CALLBACK_TIMEOUT = 120
+
+# How long get_file_info results are reused before asking the service again
+FILE_INFO_CACHE_TTL = 30
+FILE_INFO_CACHE_SIZE = 256  # Most recent results kept per service
+
+# Parsed config files keyed by path: {config_path: (mtime, config)}
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+def _dump_config(config):
+    """Serialize a config dict to bytes with stable key order"""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(config, sort_keys=True).encode('utf-8')
+
+
+def _parse_config(data):
+    """Parse config bytes read from disk"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Hosts the cloud services are allowed to call
+_ALLOWED_API_HOSTS = frozenset({
+    "oauth2.googleapis.com",
+    "www.googleapis.com",
+    "api.dropboxapi.com",
+    "login.microsoftonline.com",
+    "graph.microsoft.com",
+})
+
+# Host name to service name lookup used by detect_cloud_service
+_NETLOC_TO_SERVICE = {
+    "drive.google.com": "gdrive",
+    "docs.google.com": "gdrive",
+    "dropbox.com": "dropbox",
+    "www.dropbox.com": "dropbox",
+    "onedrive.live.com": "onedrive",
+    "1drv.ms": "onedrive",
+}
+
+# Precompiled patterns for the cloud URL shapes we recognize
+_GDRIVE_FILE_D = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://drive\.google\.com/file/d/([^/?#]*)")
+_GDRIVE_OPEN_ID = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://drive\.google\.com/open\?(?:[^#]*?&)?id=([^&#]*)")
+_DROPBOX_PATH = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://(?:www\.)?dropbox\.com(/[^?#]*)")
+_ONEDRIVE_ID = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://(?:onedrive\.live\.com|1drv\.ms)(?:/[^?#]*)?\?(?:[^#]*?&)?id=([^&#]+)")
+_ONEDRIVE_RESID = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://(?:onedrive\.live\.com|1drv\.ms)(?:/[^?#]*)?\?(?:[^#]*?&)?resid=([^&#]+)")
+
+
+@functools.lru_cache(maxsize=1024)
+def _gdrive_file_id(url):
+    """Extract file ID from a Google Drive URL"""
+    # https://drive.google.com/file/d/{file_id}/view
+    m = _GDRIVE_FILE_D.match(url)
+    if m:
+        return m.group(1)
+    
+    # https://drive.google.com/open?id={file_id}
+    m = _GDRIVE_OPEN_ID.match(url)
+    if m:
+        return unquote_plus(m.group(1))
+    
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _dropbox_file_path(url):
+    """Extract file path from a Dropbox URL"""
+    m = _DROPBOX_PATH.match(url)
+    if not m:
+        return None
+    
+    path = m.group(1)
+    if path.startswith("/s/") or path.startswith("/scl/"):
+        # Shared links need to be resolved through the Dropbox API
+        return None
+    
+    return path
+
+
+@functools.lru_cache(maxsize=1024)
+def _onedrive_file_id(url):
+    """Extract item ID from a OneDrive URL"""
+    m = _ONEDRIVE_ID.match(url) or _ONEDRIVE_RESID.match(url)
+    if m:
+        return unquote_plus(m.group(1))
+    
+    return None
 
 class CloudServiceError(Exception):
     """Base exception for cloud service errors"""
@@ -20,11 +139,94 @@ class CloudService:
         self.authenticated = False
         self.token = None
         self.config_path = None
+        
+        # Last payload written to (or read from) config_path, used to skip no-op saves
+        self._last_written_payload = None
+        self._config_dir_ready = False
+        
+        # Persistent session so repeated API calls reuse pooled connections
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        
+        # Recent get_file_info results: {file_url: (fetched_at, file_info)},
+        # oldest first so expired entries can be dropped from the front
+        self._file_info_cache = OrderedDict()
+        self._file_info_lock = threading.Lock()
+    
+    @property
+    def token(self):
+        """Current access token"""
+        return self._token
+    
+    @token.setter
+    def token(self, value):
+        # Build the Authorization header once per token instead of once per request
+        self._token = value
+        self._auth_header = {"Authorization": f"Bearer {value}"} if value else {}
+    
+    @staticmethod
+    def _validate_endpoint(url):
+        """Make sure an API endpoint is an HTTPS URL on a known host"""
+        parsed_url = urlparse(url)
+        if parsed_url.scheme != "https" or parsed_url.netloc not in _ALLOWED_API_HOSTS:
+            raise CloudServiceError(f"Invalid API endpoint: {url}")
+        return url
     
     def authenticate(self):
         """Authenticate with the cloud service"""
         raise NotImplementedError("Authentication not implemented")
     
+    def _capture_auth_code_via_localhost(self, auth_url, port=OAUTH_REDIRECT_PORT, timeout=OAUTH_CALLBACK_TIMEOUT):
+        """Open the auth URL and wait for the OAuth redirect to deliver the authorization code"""
+        results = queue.Queue()
+        
+        class RedirectHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                if "code" in query:
+                    results.put(("code", query["code"][0]))
+                    body = b"<html><body>Authentication complete. You may close this window.</body></html>"
+                elif "error" in query:
+                    results.put(("error", query["error"][0]))
+                    body = b"<html><body>Authentication failed. You may close this window.</body></html>"
+                else:
+                    # Ignore unrelated requests such as /favicon.ico
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        # Bind before opening the browser so the redirect can't arrive early
+        try:
+            server = http.server.HTTPServer(("127.0.0.1", port), RedirectHandler)
+        except OSError as e:
+            raise CloudServiceAuthError(f"Could not listen for the OAuth redirect on port {port}: {e}")
+        
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        
+        try:
+            webbrowser.open(auth_url)
+            kind, value = results.get(timeout=timeout)
+        except queue.Empty:
+            raise CloudServiceAuthError("Timed out waiting for the authorization code")
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        if kind == "error":
+            raise CloudServiceAuthError(f"Authentication failed: {value}")
+        
+        return value
+    
     def is_authenticated(self):
         """Check if authenticated"""
         return self.authenticated
@@ -33,33 +235,73 @@ class CloudService:
         """Logout from the service"""
         self.authenticated = False
         self.token = None
+        with self._file_info_lock:
+            self._file_info_cache.clear()
         self.save_config()
     
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
+    
+    def _ensure_valid_token(self):
+        """Make sure we hold a usable token before calling the API"""
+        if not self.authenticated:
+            raise CloudServiceAuthError("Not authenticated")
+    
     def save_config(self):
         """Save configuration to file"""
         if not self.config_path:
             return
-            
-        config_dir = os.path.dirname(self.config_path)
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
+        
+        config = self.get_config()
+        payload = _dump_config(config)
+        if payload == self._last_written_payload:
+            return
             
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(self.get_config(), f)
+            if not self._config_dir_ready:
+                os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+                self._config_dir_ready = True
+            
+            # Write to a temporary file and swap it in so a crash never leaves a truncated config
+            tmp_path = self.config_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.config_path)
+            self._last_written_payload = payload
+            
+            # Keep the cache in sync so the next load skips the disk read
+            mtime = os.stat(self.config_path).st_mtime_ns
+            with _CONFIG_CACHE_LOCK:
+                _CONFIG_CACHE[self.config_path] = (mtime, dict(config))
         except Exception as e:
             print(f"Error saving config: {e}")
     
     def load_config(self):
         """Load configuration from file"""
-        if not self.config_path or not os.path.exists(self.config_path):
+        if not self.config_path:
+            return False
+        
+        try:
+            mtime = os.stat(self.config_path).st_mtime_ns
+        except OSError:
             return False
             
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
-                self.set_config(config)
-                return True
+            with _CONFIG_CACHE_LOCK:
+                cached = _CONFIG_CACHE.get(self.config_path)
+            
+            if cached and cached[0] == mtime:
+                config = dict(cached[1])
+            else:
+                with open(self.config_path, 'rb') as f:
+                    config = _parse_config(f.read())
+                with _CONFIG_CACHE_LOCK:
+                    _CONFIG_CACHE[self.config_path] = (mtime, dict(config))
+            
+            self._last_written_payload = _dump_config(config)
+            self.set_config(config)
+            return True
         except Exception as e:
             print(f"Error loading config: {e}")
             return False
@@ -74,16 +316,88 @@ class CloudService:
         self.authenticated = config.get("authenticated", False)
     
     def get_file_info(self, file_url):
-        """Get information about a file"""
+        """Get information about a file, reusing recent results for the same URL"""
+        with self._file_info_lock:
+            entry = self._file_info_cache.get(file_url)
+        if entry and time.time() - entry[0] < FILE_INFO_CACHE_TTL:
+            return dict(entry[1])
+        
+        file_info = self._fetch_file_info(file_url)
+        self._cache_file_info(file_url, file_info)
+        return dict(file_info)
+    
+    def _cache_file_info(self, file_url, file_info):
+        """Remember a file info result, dropping expired and excess entries"""
+        with self._file_info_lock:
+            cache = self._file_info_cache
+            now = time.time()
+            cache[file_url] = (now, file_info)
+            cache.move_to_end(file_url)
+            while cache:
+                fetched_at = next(iter(cache.values()))[0]
+                if now - fetched_at < FILE_INFO_CACHE_TTL and len(cache) <= FILE_INFO_CACHE_SIZE:
+                    break
+                cache.popitem(last=False)
+    
+    def get_file_info_batch(self, file_urls, max_workers=8):
+        """Get information about several files in parallel over the pooled session
+        
+        Returns a dict mapping each URL to its file info, or to the
+        CloudServiceError raised while looking it up.
+        """
+        unique_urls = list(dict.fromkeys(file_urls))
+        if not unique_urls:
+            return {}
+        
+        # Make sure the token is fresh once up front instead of in every worker
+        self._ensure_valid_token()
+        
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(unique_urls))) as executor:
+            futures = {executor.submit(self.get_file_info, url): url for url in unique_urls}
+            for future in concurrent.futures.as_completed(futures):
+                url = futures[future]
+                try:
+                    results[url] = future.result()
+                except CloudServiceError as e:
+                    results[url] = e
+                except requests.exceptions.RequestException as e:
+                    # A dropped connection only fails this URL, not the batch
+                    results[url] = CloudServiceError(str(e))
+        
+        return results
+    
+    def _fetch_file_info(self, file_url):
+        """Fetch information about a file from the service"""
         raise NotImplementedError("Get file info not implemented")
     
     def get_download_url(self, file_url):
         """Get direct download URL for a file"""
         raise NotImplementedError("Get download URL not implemented")
+    
+    def get_download_headers(self):
+        """Get extra HTTP headers needed to fetch a URL from get_download_url"""
+        return {}
+    
+    def get_file_metadata_and_url(self, file_url):
+        """Get file information together with its direct download URL"""
+        file_info = self.get_file_info(file_url)
+        file_info["download_url"] = self.get_download_url(file_url)
+        return file_info
 
 
-class GoogleDriveService(CloudService):
-    """Implementation for Google Drive"""
+class OAuth2RefreshMixin(CloudService):
+    """Shared OAuth2 authorization code flow for services with refresh tokens
+    
+    Subclasses declare the endpoints below and implement the file API calls.
+    """
+    
+    SERVICE_NAME = None
+    AUTH_URL = None
+    TOKEN_URL = None
+    SCOPE = None
+    EXTRA_AUTH_PARAMS = {}
+    CONFIG_FILE = None
     
     def __init__(self, client_id=None, client_secret=None):
         super().__init__()
@@ -92,13 +406,19 @@ class GoogleDriveService(CloudService):
         self.refresh_token = None
         self.token_expires = 0
         
+        # Single-flight token refresh state
+        self.refresh_lead_seconds = TOKEN_REFRESH_LEAD_SECONDS
+        self._refresh_lock = threading.Lock()
+        self._refresh_future = None
+        self._refresh_executor = None
+        
+        # The token endpoint is validated once here instead of on every refresh
+        self._token_url = self._validate_endpoint(self.TOKEN_URL)
+        
         # Set up config path
         app_dir = os.path.dirname(os.path.abspath(__file__))
         config_dir = os.path.join(app_dir, 'config')
-        self.config_path = os.path.join(config_dir, 'gdrive_config.json')
-        
-        # Try to load existing config
-        self.load_config()
+        self.config_path = os.path.join(config_dir, self.CONFIG_FILE)
     
     def get_config(self):
         """Get configuration for saving"""
@@ -116,52 +436,44 @@ class GoogleDriveService(CloudService):
         self.token_expires = config.get("token_expires", 0)
         self.authenticated = config.get("authenticated", False)
         
-        # Check if token is expired and needs refresh
-        if self.token and self.refresh_token and time.time() > self.token_expires:
+        # Check if token is expired (or about to expire) and needs refresh
+        if self.token and self.refresh_token and time.time() > self.token_expires - self.refresh_lead_seconds:
             try:
-                self._refresh_access_token()
+                self._refresh_access_token(self.token)
             except Exception:
                 # If refresh fails, we'll need to re-authenticate
                 pass
     
     def authenticate(self):
-        """Start OAuth flow for Google Drive"""
+        """Start OAuth flow for the service"""
         if not self.client_id or not self.client_secret:
             raise CloudServiceAuthError("Client ID and Client Secret are required")
         
-        # This is a simplification. In a real app, you would:
-        # 1. Generate an auth URL
-        # 2. Open browser or show URL to user
-        # 3. Get the authorization code from redirect
-        # 4. Exchange code for tokens
+        # Open the consent page in the browser, capture the authorization code
+        # from the localhost redirect and exchange it for tokens
         
-        print("Please authenticate with Google in your browser...")
-        auth_url = (
-            "https://accounts.google.com/o/oauth2/auth?"
-            f"client_id={self.client_id}&"
-            "response_type=code&"
-            "scope=https://www.googleapis.com/auth/drive.readonly&"
-            "access_type=offline&"
-            "redirect_uri=http://localhost:8080"
-        )
-        
-        webbrowser.open(auth_url)
+        print(f"Please authenticate with {self.SERVICE_NAME} in your browser...")
+        params = {
+            "client_id": self.client_id,
+            "response_type": "code",
+            "scope": self.SCOPE,
+            "redirect_uri": OAUTH_REDIRECT_URI
+        }
+        params.update(self.EXTRA_AUTH_PARAMS)
+        auth_url = f"{self.AUTH_URL}?{urlencode(params)}"
         
-        # In a real app, you would have a local server listening on the redirect URI
-        # to capture the authorization code
-        auth_code = input("Enter the authorization code from the browser: ")
+        auth_code = self._capture_auth_code_via_localhost(auth_url)
         
         # Exchange code for tokens
-        token_url = "https://oauth2.googleapis.com/token"
         data = {
             "code": auth_code,
             "client_id": self.client_id,
             "client_secret": self.client_secret,
-            "redirect_uri": "http://localhost:8080",
+            "redirect_uri": OAUTH_REDIRECT_URI,
             "grant_type": "authorization_code"
         }
         
-        response = requests.post(token_url, data=data)
+        response = self._session.post(self._token_url, data=data)
         if response.status_code != 200:
             raise CloudServiceAuthError(f"Authentication failed: {response.text}")
         
@@ -174,12 +486,54 @@ class GoogleDriveService(CloudService):
         
         return True
     
-    def _refresh_access_token(self):
+    def close(self):
+        """Close the underlying HTTP session and refresh worker"""
+        if self._refresh_executor is not None:
+            self._refresh_executor.shutdown(wait=False)
+        super().close()
+    
+    def _ensure_valid_token(self):
+        """Make sure we hold a usable token, refreshing it shortly before expiry"""
+        token = self.token
+        if self.authenticated and time.time() <= self.token_expires - self.refresh_lead_seconds:
+            return
+        
+        if not self.refresh_token:
+            raise CloudServiceAuthError("Not authenticated")
+        
+        self._refresh_access_token(token)
+    
+    def _refresh_access_token(self, stale_token=None):
+        """Refresh the access token, sharing one in-flight request between callers
+        
+        stale_token is the token the caller found unusable. If another thread
+        has replaced it in the meantime, no new request is made.
+        """
+        with self._refresh_lock:
+            future = self._refresh_future
+            if future is None:
+                if stale_token is not None and self.token != stale_token:
+                    return True
+                if self._refresh_executor is None:
+                    self._refresh_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+                future = self._refresh_executor.submit(self._run_token_refresh)
+                self._refresh_future = future
+        
+        return future.result()
+    
+    def _run_token_refresh(self):
+        """Run the token refresh and clear the in-flight future when done"""
+        try:
+            return self._request_access_token()
+        finally:
+            with self._refresh_lock:
+                self._refresh_future = None
+    
+    def _request_access_token(self):
         """Refresh the access token using the refresh token"""
         if not self.refresh_token:
             raise CloudServiceAuthError("No refresh token available")
         
-        token_url = "https://oauth2.googleapis.com/token"
         data = {
             "refresh_token": self.refresh_token,
             "client_id": self.client_id,
@@ -187,7 +541,7 @@ class GoogleDriveService(CloudService):
             "grant_type": "refresh_token"
         }
         
-        response = requests.post(token_url, data=data)
+        response = self._session.post(self._token_url, data=data)
         if response.status_code != 200:
             raise CloudServiceAuthError(f"Token refresh failed: {response.text}")
         
@@ -198,7 +552,40 @@ class GoogleDriveService(CloudService):
         
         return True
     
-    def get_file_info(self, file_url):
+    def _authorized_get(self, url, **kwargs):
+        """GET an API URL, refreshing the token and retrying once on 401"""
+        token = self.token
+        response = self._session.get(url, headers=self._auth_header, **kwargs)
+        if response.status_code == 401:
+            # Token expired or invalid
+            self._refresh_access_token(token)
+            # Retry request
+            response = self._session.get(url, headers=self._auth_header, **kwargs)
+        return response
+
+
+class GoogleDriveService(OAuth2RefreshMixin):
+    """Implementation for Google Drive"""
+    
+    SERVICE_NAME = "Google"
+    AUTH_URL = "https://accounts.google.com/o/oauth2/auth"
+    TOKEN_URL = "https://oauth2.googleapis.com/token"
+    SCOPE = "https://www.googleapis.com/auth/drive.readonly"
+    EXTRA_AUTH_PARAMS = {"access_type": "offline"}
+    CONFIG_FILE = 'gdrive_config.json'
+    FILES_ENDPOINT = "https://www.googleapis.com/drive/v3/files/"
+    
+    def __init__(self, client_id=None, client_secret=None):
+        super().__init__(client_id, client_secret)
+        
+        # API endpoints are validated once here so requests only append the file ID
+        self._files_endpoint = self._validate_endpoint(self.FILES_ENDPOINT)
+        self._metadata_params = {"fields": "name,size,mimeType"}
+        
+        # Try to load existing config
+        self.load_config()
+    
+    def _fetch_file_info(self, file_url):
         """Get information about a Google Drive file"""
         # Extract file ID from URL
         file_id = self._extract_file_id(file_url)
@@ -206,29 +593,12 @@ class GoogleDriveService(CloudService):
             raise CloudServiceError("Invalid Google Drive URL")
         
         # Check authentication and refresh if needed
-        if not self.is_authenticated() or time.time() > self.token_expires:
-            if self.refresh_token:
-                self._refresh_access_token()
-            else:
-                raise CloudServiceAuthError("Not authenticated")
+        self._ensure_valid_token()
         
         # Get file metadata
-        url = f"https://www.googleapis.com/drive/v3/files/{file_id}"
-        params = {"fields": "name,size,mimeType"}
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
-        response = requests.get(url, headers=headers, params=params)
+        response = self._authorized_get(self._files_endpoint + file_id, params=self._metadata_params)
         if response.status_code != 200:
-            if response.status_code == 401:
-                # Token expired or invalid
-                self._refresh_access_token()
-                # Retry request
-                headers = {"Authorization": f"Bearer {self.token}"}
-                response = requests.get(url, headers=headers, params=params)
-                if response.status_code != 200:
-                    raise CloudServiceError(f"Error getting file info: {response.text}")
-            else:
-                raise CloudServiceError(f"Error getting file info: {response.text}")
+            raise CloudServiceError(f"Error getting file info: {response.text}")
         
         file_info = response.json()
         return {
@@ -240,38 +610,30 @@ class GoogleDriveService(CloudService):
         }
     
     def get_download_url(self, file_url):
-        """Get direct download URL for a Google Drive file"""
+        """Get direct download URL for a Google Drive file
+        
+        The URL carries no credentials; send the headers from
+        get_download_headers() with the request so it stays valid
+        across token refreshes.
+        """
         file_id = self._extract_file_id(file_url)
         if not file_id:
             raise CloudServiceError("Invalid Google Drive URL")
         
         # Check authentication and refresh if needed
-        if not self.is_authenticated() or time.time() > self.token_expires:
-            if self.refresh_token:
-                self._refresh_access_token()
-            else:
-                raise CloudServiceAuthError("Not authenticated")
+        self._ensure_valid_token()
         
         # Get download URL
-        return f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media&access_token={self.token}"
+        return f"{self._files_endpoint}{file_id}?alt=media"
+    
+    def get_download_headers(self):
+        """Get the Authorization header required by media downloads"""
+        self._ensure_valid_token()
+        return dict(self._auth_header)
     
     def _extract_file_id(self, url):
         """Extract file ID from Google Drive URL"""
-        parsed_url = urlparse(url)
-        
-        # Handle different URL formats
-        if parsed_url.netloc == "drive.google.com":
-            if parsed_url.path.startswith("/file/d/"):
-                # https://drive.google.com/file/d/{file_id}/view
-                parts = parsed_url.path.split("/")
-                if len(parts) >= 4:
-                    return parts[3]
-            elif parsed_url.path == "/open":
-                # https://drive.google.com/open?id={file_id}
-                query = parse_qs(parsed_url.query)
-                return query.get("id", [None])[0]
-        
-        return None
+        return _gdrive_file_id(url)
 
 
 class DropboxService(CloudService):
@@ -282,6 +644,11 @@ class DropboxService(CloudService):
         self.app_key = app_key
         self.app_secret = app_secret
         
+        # API endpoints are validated once here instead of on every request
+        self._token_url = self._validate_endpoint("https://api.dropboxapi.com/oauth2/token")
+        self._metadata_endpoint = self._validate_endpoint("https://api.dropboxapi.com/2/files/get_metadata")
+        self._temporary_link_endpoint = self._validate_endpoint("https://api.dropboxapi.com/2/files/get_temporary_link")
+        
         # Set up config path
         app_dir = os.path.dirname(os.path.abspath(__file__))
         config_dir = os.path.join(app_dir, 'config')
@@ -295,36 +662,31 @@ class DropboxService(CloudService):
         if not self.app_key or not self.app_secret:
             raise CloudServiceAuthError("App Key and App Secret are required")
         
-        # This is a simplification. In a real app, you would:
-        # 1. Generate an auth URL
-        # 2. Open browser or show URL to user
-        # 3. Get the authorization code from redirect
-        # 4. Exchange code for tokens
+        # Open the consent page in the browser, capture the authorization code
+        # from the localhost redirect and exchange it for tokens
         
         print("Please authenticate with Dropbox in your browser...")
         auth_url = (
             "https://www.dropbox.com/oauth2/authorize?"
             f"client_id={self.app_key}&"
             "response_type=code&"
-            "token_access_type=offline"
+            "token_access_type=offline&"
+            f"redirect_uri={OAUTH_REDIRECT_URI}"
         )
         
-        webbrowser.open(auth_url)
-        
-        # In a real app, you would have a local server listening on the redirect URI
-        # to capture the authorization code
-        auth_code = input("Enter the authorization code from the browser: ")
+        auth_code = self._capture_auth_code_via_localhost(auth_url)
         
         # Exchange code for tokens
-        token_url = "https://api.dropboxapi.com/oauth2/token"
+        token_url = self._token_url
         data = {
             "code": auth_code,
             "grant_type": "authorization_code",
             "client_id": self.app_key,
-            "client_secret": self.app_secret
+            "client_secret": self.app_secret,
+            "redirect_uri": OAUTH_REDIRECT_URI
         }
         
-        response = requests.post(token_url, data=data)
+        response = self._session.post(token_url, data=data)
         if response.status_code != 200:
             raise CloudServiceAuthError(f"Authentication failed: {response.text}")
         
@@ -335,7 +697,7 @@ class DropboxService(CloudService):
         
         return True
     
-    def get_file_info(self, file_url):
+    def _fetch_file_info(self, file_url):
         """Get information about a Dropbox file"""
         # Extract file path from URL
         file_path = self._extract_file_path(file_url)
@@ -343,18 +705,14 @@ class DropboxService(CloudService):
             raise CloudServiceError("Invalid Dropbox URL")
         
         # Check authentication
-        if not self.is_authenticated():
-            raise CloudServiceAuthError("Not authenticated")
+        self._ensure_valid_token()
         
         # Get file metadata
-        url = "https://api.dropboxapi.com/2/files/get_metadata"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = self._metadata_endpoint
         data = {"path": file_path}
         
-        response = requests.post(url, headers=headers, json=data)
+        # json= sets the application/json Content-Type header for us
+        response = self._session.post(url, headers=self._auth_header, json=data)
         if response.status_code != 200:
             raise CloudServiceError(f"Error getting file info: {response.text}")
         
@@ -373,160 +731,73 @@ class DropboxService(CloudService):
             raise CloudServiceError("Invalid Dropbox URL")
         
         # Check authentication
-        if not self.is_authenticated():
-            raise CloudServiceAuthError("Not authenticated")
+        self._ensure_valid_token()
         
         # Create direct download link
-        url = "https://api.dropboxapi.com/2/files/get_temporary_link"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = self._temporary_link_endpoint
         data = {"path": file_path}
         
-        response = requests.post(url, headers=headers, json=data)
+        # json= sets the application/json Content-Type header for us
+        response = self._session.post(url, headers=self._auth_header, json=data)
         if response.status_code != 200:
             raise CloudServiceError(f"Error getting download URL: {response.text}")
         
         link_data = response.json()
         return link_data.get("link")
     
-    def _extract_file_path(self, url):
-        """Extract file path from Dropbox URL"""
-        parsed_url = urlparse(url)
+    def get_file_metadata_and_url(self, file_url):
+        """Get file information and a temporary download link in one API call"""
+        file_path = self._extract_file_path(file_url)
+        if not file_path:
+            raise CloudServiceError("Invalid Dropbox URL")
         
-        # Handle different URL formats
-        if parsed_url.netloc in ["www.dropbox.com", "dropbox.com"]:
-            if parsed_url.path.startswith("/s/"):
-                # Shared link - we need to resolve it
-                # This is simplified - in a real app, you would use the Dropbox API
-                return None
-            elif parsed_url.path.startswith("/scl/"):
-                # Another shared link format
-                return None
-            else:
-                # Handle direct path format
-                return parsed_url.path
+        # Check authentication
+        self._ensure_valid_token()
         
-        return None
+        # get_temporary_link returns the file metadata alongside the link
+        data = {"path": file_path}
+        response = self._session.post(self._temporary_link_endpoint, headers=self._auth_header, json=data)
+        if response.status_code != 200:
+            raise CloudServiceError(f"Error getting download URL: {response.text}")
+        
+        link_data = response.json()
+        metadata = link_data.get("metadata", {})
+        file_info = {
+            "name": metadata.get("name"),
+            "size": metadata.get("size", 0),
+            "path": file_path,
+            "url": file_url
+        }
+        self._cache_file_info(file_url, file_info)
+        
+        return dict(file_info, download_url=link_data.get("link"))
+    
+    def _extract_file_path(self, url):
+        """Extract file path from Dropbox URL"""
+        return _dropbox_file_path(url)
 
 
-class OneDriveService(CloudService):
+class OneDriveService(OAuth2RefreshMixin):
     """Implementation for OneDrive"""
     
+    SERVICE_NAME = "OneDrive"
+    AUTH_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/authorize"
+    TOKEN_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
+    SCOPE = "files.read offline_access"
+    CONFIG_FILE = 'onedrive_config.json'
+    ITEMS_ENDPOINT = "https://graph.microsoft.com/v1.0/me/drive/items/"
+    
     def __init__(self, client_id=None, client_secret=None):
-        super().__init__()
-        self.client_id = client_id
-        self.client_secret = client_secret
-        self.refresh_token = None
-        self.token_expires = 0
+        super().__init__(client_id, client_secret)
         
-        # Set up config path
-        app_dir = os.path.dirname(os.path.abspath(__file__))
-        config_dir = os.path.join(app_dir, 'config')
-        self.config_path = os.path.join(config_dir, 'onedrive_config.json')
+        # API endpoints are validated once here so requests only append the item ID
+        self._items_endpoint = self._validate_endpoint(self.ITEMS_ENDPOINT)
+        self._metadata_and_url_params = {"$select": "name,size,@microsoft.graph.downloadUrl"}
         
         # Try to load existing config
         self.load_config()
     
-    def get_config(self):
-        """Get configuration for saving"""
-        return {
-            "token": self.token,
-            "refresh_token": self.refresh_token,
-            "token_expires": self.token_expires,
-            "authenticated": self.authenticated
-        }
-    
-    def set_config(self, config):
-        """Set configuration from loaded data"""
-        self.token = config.get("token")
-        self.refresh_token = config.get("refresh_token")
-        self.token_expires = config.get("token_expires", 0)
-        self.authenticated = config.get("authenticated", False)
-        
-        # Check if token is expired and needs refresh
-        if self.token and self.refresh_token and time.time() > self.token_expires:
-            try:
-                self._refresh_access_token()
-            except Exception:
-                # If refresh fails, we'll need to re-authenticate
-                pass
-    
-    def authenticate(self):
-        """Start OAuth flow for OneDrive"""
-        if not self.client_id or not self.client_secret:
-            raise CloudServiceAuthError("Client ID and Client Secret are required")
-        
-        # This is a simplification. In a real app, you would:
-        # 1. Generate an auth URL
-        # 2. Open browser or show URL to user
-        # 3. Get the authorization code from redirect
-        # 4. Exchange code for tokens
-        
-        print("Please authenticate with OneDrive in your browser...")
-        auth_url = (
-            "https://login.microsoftonline.com/common/oauth2/v2.0/authorize?"
-            f"client_id={self.client_id}&"
-            "response_type=code&"
-            "scope=files.read offline_access&"
-            "redirect_uri=http://localhost:8080"
-        )
-        
-        webbrowser.open(auth_url)
-        
-        # In a real app, you would have a local server listening on the redirect URI
-        # to capture the authorization code
-        auth_code = input("Enter the authorization code from the browser: ")
-        
-        # Exchange code for tokens
-        token_url = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
-        data = {
-            "code": auth_code,
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "redirect_uri": "http://localhost:8080",
-            "grant_type": "authorization_code"
-        }
-        
-        response = requests.post(token_url, data=data)
-        if response.status_code != 200:
-            raise CloudServiceAuthError(f"Authentication failed: {response.text}")
-        
-        token_data = response.json()
-        self.token = token_data.get("access_token")
-        self.refresh_token = token_data.get("refresh_token")
-        self.token_expires = time.time() + token_data.get("expires_in", 3600)
-        self.authenticated = True
-        self.save_config()
-        
-        return True
-    
-    def _refresh_access_token(self):
-        """Refresh the access token using the refresh token"""
-        if not self.refresh_token:
-            raise CloudServiceAuthError("No refresh token available")
-        
-        token_url = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
-        data = {
-            "refresh_token": self.refresh_token,
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "grant_type": "refresh_token"
-        }
-        
-        response = requests.post(token_url, data=data)
-        if response.status_code != 200:
-            raise CloudServiceAuthError(f"Token refresh failed: {response.text}")
-        
-        token_data = response.json()
-        self.token = token_data.get("access_token")
-        self.token_expires = time.time() + token_data.get("expires_in", 3600)
-        self.save_config()
-        
-        return True
-    
-    def get_file_info(self, file_url):
+    def _fetch_file_info(self, file_url):
         """Get information about a OneDrive file"""
         # Extract item ID and drive ID from URL
         file_id = self._extract_file_id(file_url)
@@ -534,28 +805,12 @@ class OneDriveService(CloudService):
             raise CloudServiceError("Invalid OneDrive URL")
         
         # Check authentication and refresh if needed
-        if not self.is_authenticated() or time.time() > self.token_expires:
-            if self.refresh_token:
-                self._refresh_access_token()
-            else:
-                raise CloudServiceAuthError("Not authenticated")
+        self._ensure_valid_token()
         
         # Get file metadata
-        url = f"https://graph.microsoft.com/v1.0/me/drive/items/{file_id}"
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
-        response = requests.get(url, headers=headers)
+        response = self._authorized_get(self._items_endpoint + file_id)
         if response.status_code != 200:
-            if response.status_code == 401:
-                # Token expired or invalid
-                self._refresh_access_token()
-                # Retry request
-                headers = {"Authorization": f"Bearer {self.token}"}
-                response = requests.get(url, headers=headers)
-                if response.status_code != 200:
-                    raise CloudServiceError(f"Error getting file info: {response.text}")
-            else:
-                raise CloudServiceError(f"Error getting file info: {response.text}")
+            raise CloudServiceError(f"Error getting file info: {response.text}")
         
         file_info = response.json()
         return {
@@ -572,38 +827,46 @@ class OneDriveService(CloudService):
             raise CloudServiceError("Invalid OneDrive URL")
         
         # Check authentication and refresh if needed
-        if not self.is_authenticated() or time.time() > self.token_expires:
-            if self.refresh_token:
-                self._refresh_access_token()
-            else:
-                raise CloudServiceAuthError("Not authenticated")
+        self._ensure_valid_token()
         
         # Get download URL
-        url = f"https://graph.microsoft.com/v1.0/me/drive/items/{file_id}/content"
-        headers = {"Authorization": f"Bearer {self.token}"}
+        url = self._items_endpoint + file_id + "/content"
         
-        response = requests.get(url, headers=headers, allow_redirects=False)
+        response = self._session.get(url, headers=self._auth_header, allow_redirects=False)
         if response.status_code == 302:
             # Follow redirect to get the download URL
             return response.headers.get("Location")
         else:
             raise CloudServiceError(f"Error getting download URL: {response.status_code} - {response.text}")
     
-    def _extract_file_id(self, url):
-        """Extract file ID from OneDrive URL"""
-        parsed_url = urlparse(url)
+    def get_file_metadata_and_url(self, file_url):
+        """Get file information and a pre-authenticated download URL in one API call"""
+        file_id = self._extract_file_id(file_url)
+        if not file_id:
+            raise CloudServiceError("Invalid OneDrive URL")
         
-        # Handle different URL formats
-        if parsed_url.netloc in ["onedrive.live.com", "1drv.ms"]:
-            query = parse_qs(parsed_url.query)
-            
-            # Look for item ID in query parameters
-            if "id" in query:
-                return query["id"][0]
-            elif "resid" in query:
-                return query["resid"][0]
+        # Check authentication and refresh if needed
+        self._ensure_valid_token()
         
-        return None
+        # The item resource includes the download URL when it is selected explicitly
+        response = self._authorized_get(self._items_endpoint + file_id, params=self._metadata_and_url_params)
+        if response.status_code != 200:
+            raise CloudServiceError(f"Error getting file info: {response.text}")
+        
+        item = response.json()
+        file_info = {
+            "name": item.get("name"),
+            "size": item.get("size", 0),
+            "url": file_url,
+            "file_id": file_id
+        }
+        self._cache_file_info(file_url, file_info)
+        
+        return dict(file_info, download_url=item.get("@microsoft.graph.downloadUrl"))
+    
+    def _extract_file_id(self, url):
+        """Extract file ID from OneDrive URL"""
+        return _onedrive_file_id(url)
 
 
 # Factory to create cloud service instances
@@ -619,15 +882,7 @@ def create_cloud_service(service_name, **kwargs):
         raise ValueError(f"Unsupported cloud service: {service_name}")
 
 
+@functools.lru_cache(maxsize=4096)
 def detect_cloud_service(url):
     """Detect cloud service from URL"""
-    parsed_url = urlparse(url)
-    
-    if parsed_url.netloc in ["drive.google.com", "docs.google.com"]:
-        return "gdrive"
-    elif parsed_url.netloc in ["dropbox.com", "www.dropbox.com"]:
-        return "dropbox"
-    elif parsed_url.netloc in ["onedrive.live.com", "1drv.ms"]:
-        return "onedrive"
-    else:
-        return None 
\ No newline at end of file
+    return _NETLOC_TO_SERVICE.get(urlparse(url).netloc)
\ No newline at end of file
@@ -1,27 +1,178 @@
 import os
-import sqlite3
+import copy
 import json
 import time
+import queue
+import threading
+import concurrent.futures
+from contextlib import contextmanager
 from datetime import datetime
 
+# pysqlite3 is optional; it is a drop-in DB-API module bundling a current SQLite
+# (RETURNING, UPSERT) for systems whose Python links an old library
+try:
+    from pysqlite3 import dbapi2 as sqlite3
+except ImportError:
+    import sqlite3
+
+# Resolved once at import instead of on every Database() construction
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+_DEFAULT_DB_PATH = os.path.join(_APP_DIR, 'adx_downloader.db')
+_DEFAULT_DOWNLOADS_DIR = os.path.join(os.path.expanduser("~"), "Downloads")
+
+# Columns returned by the getters; the history list only needs a summary and
+# skips the metadata blob, get_download_detail() returns every column
+DOWNLOAD_FIELDS = (
+    'id', 'url', 'file_name', 'save_path', 'file_size', 'status', 'start_time',
+    'end_time', 'connections', 'avg_speed', 'completed', 'metadata'
+)
+DEFAULT_SUMMARY_FIELDS = ('id', 'file_name', 'file_size', 'status', 'start_time', 'avg_speed', 'completed')
+SCHEDULED_FIELDS = (
+    'id', 'url', 'save_path', 'schedule_time', 'connections', 'recurring', 'status', 'metadata'
+)
+
+# PRAGMA synchronous values for Database(durability=...). 'normal' only loses
+# the last few transactions on power loss, which is fine for progress metadata
+DURABILITY_LEVELS = {
+    'full': 'FULL',
+    'normal': 'NORMAL',
+    'off': 'OFF'
+}
+
+# INSERT ... RETURNING needs SQLite 3.35+; older builds fall back to lastrowid
+_RETURNING_ID = " RETURNING id" if sqlite3.sqlite_version_info >= (3, 35, 0) else ""
+
+# Settings are stored with SQLite's native types; 'kind' records how to turn
+# the stored value back into the Python value that was saved
+def _encode_setting(value):
+    """Return (stored value, kind) for a setting value"""
+    if isinstance(value, bool):
+        return int(value), 'bool'
+    if isinstance(value, int):
+        return value, 'int'
+    if isinstance(value, float):
+        return value, 'real'
+    if isinstance(value, str):
+        return value, 'text'
+    return json.dumps(value), 'json'
+
+def _copy_setting(value):
+    """Copy a cached setting so callers can't modify the cached value"""
+    # Only JSON settings decode to mutable containers
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+def _decode_setting(value, kind):
+    """Turn a stored setting back into its Python value"""
+    if kind == 'bool':
+        return bool(value)
+    if kind == 'json':
+        return json.loads(value)
+    return value
+
+# UPSERT (SQLite 3.24+) updates the row in place; OR REPLACE deletes and reinserts it
+if sqlite3.sqlite_version_info >= (3, 24, 0):
+    _SET_SETTING_SQL = (
+        "INSERT INTO settings (key, value, kind) VALUES (?, ?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, kind = excluded.kind"
+    )
+else:
+    _SET_SETTING_SQL = "INSERT OR REPLACE INTO settings (key, value, kind) VALUES (?, ?, ?)"
+
+# Marks a setting that isn't cached yet (None is a valid cached value)
+_MISSING = object()
+
+# Number of read-only connections shared by the UI, scheduler and worker threads
+READ_POOL_SIZE = 4
+
+# Maximum number of queued writes the background writer commits together
+WRITE_BATCH_SIZE = 100
+
 class Database:
-    def __init__(self, db_path=None):
+    # Columns that update_download()/update_scheduled_download() may set; these
+    # names are interpolated into SQL, so anything else is rejected
+    _DOWNLOAD_COLS = frozenset({
+        'url', 'file_name', 'save_path', 'file_size', 'status', 'start_time',
+        'end_time', 'connections', 'avg_speed', 'completed', 'metadata'
+    })
+    _SCHEDULED_COLS = frozenset({
+        'url', 'save_path', 'schedule_time', 'connections', 'recurring', 'status', 'metadata'
+    })
+    _ORDER_BY_WHITELIST = frozenset({
+        'start_time DESC', 'start_time ASC', 'end_time DESC', 'end_time ASC',
+        'file_name ASC', 'file_name DESC', 'file_size DESC', 'file_size ASC',
+        'avg_speed DESC', 'avg_speed ASC', 'id DESC', 'id ASC'
+    })
+    _DOWNLOAD_DETAIL_SQL = f"SELECT {', '.join(DOWNLOAD_FIELDS)} FROM downloads WHERE id = ?"
+    _SCHEDULED_SELECT = ', '.join(SCHEDULED_FIELDS)
+    
+    # Shared by every window through instance(); the connections are
+    # thread-safe, so one Database serves the whole process
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    @classmethod
+    def instance(cls):
+        """Return the process-wide Database for the default path, opening it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
+    def __init__(self, db_path=None, durability='normal'):
         # Set default database path to application directory
         if db_path is None:
-            app_dir = os.path.dirname(os.path.abspath(__file__))
-            db_path = os.path.join(app_dir, 'adx_downloader.db')
+            db_path = _DEFAULT_DB_PATH
+        
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unsupported durability: {durability}")
         
         self.db_path = db_path
+        self.durability = durability
         self.conn = None
         self.cursor = None
+        self._stmts = {}
+        self._settings_cache = {}  # key -> decoded value
+        # Bumped by every settings write; a read that raced a write doesn't
+        # store its possibly stale value
+        self._settings_generation = 0
+        self._settings_lock = threading.Lock()
+        
+        # SQLite allows a single writer, so all writes share self.conn under
+        # _write_lock while reads are served from a pool of extra connections
+        self._write_lock = threading.RLock()
+        self._read_pool = None
+        self._batch_owner = None
+        
+        # Queued writes (progress updates) are applied by a background thread
+        # in batched transactions so callers never wait on disk I/O
+        self._write_queue = queue.Queue()
+        self._writer_ident = None
         self.initialize()
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
     
     def initialize(self):
         """Initialize the database and create tables if they don't exist"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # sqlite3 keeps compiled statements in a per-connection LRU keyed by
+            # SQL text, so identical queries skip parsing and planning
+            self.conn = self._connect()
             self.cursor = self.conn.cursor()
             
+            # WAL lets the UI read history while downloads write progress, and
+            # synchronous=NORMAL only fsyncs at checkpoints instead of every commit
+            if self.db_path != ':memory:':
+                self.cursor.execute("PRAGMA journal_mode=WAL")
+                # Large enough that checkpoints rarely interleave with writes;
+                # checkpoint() runs one explicitly when the app is idle
+                self.cursor.execute("PRAGMA wal_autocheckpoint=10000")
+                self.cursor.execute("PRAGMA journal_size_limit=6144000")
+            
+            # Create the schema and seed defaults in one transaction (one fsync)
+            self.cursor.execute("BEGIN")
+            
             # Create downloads history table
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS downloads (
@@ -40,14 +191,21 @@ class Database:
                 )
             ''')
             
-            # Create settings table
+            # Create settings table. value has no declared type so SQLite keeps
+            # integers, reals and text as they are instead of coercing them
+            legacy_settings = self._read_legacy_settings()
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS settings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    key TEXT UNIQUE NOT NULL,
-                    value TEXT
+                    key TEXT PRIMARY KEY,
+                    value,
+                    kind TEXT NOT NULL
                 )
             ''')
+            if legacy_settings:
+                self.cursor.executemany(
+                    "INSERT INTO settings (key, value, kind) VALUES (?, ?, ?)",
+                    [(key,) + _encode_setting(value) for key, value in legacy_settings.items()]
+                )
             
             # Create scheduled_downloads table
             self.cursor.execute('''
@@ -63,11 +221,22 @@ class Database:
                 )
             ''')
             
+            # Indexes for the history pagination and scheduler queries
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_downloads_start_time ON downloads(start_time DESC)"
+            )
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_downloads_completed ON downloads(completed, start_time DESC)"
+            )
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sched_status_time ON scheduled_downloads(status, schedule_time)"
+            )
+            
             # Insert default settings if they don't exist
             default_settings = {
                 'default_connections': 8,
                 'max_connections': 16,
-                'default_save_path': os.path.join(os.path.expanduser("~"), "Downloads"),
+                'default_save_path': _DEFAULT_DOWNLOADS_DIR,
                 'bandwidth_limit': 0,  # 0 means no limit
                 'theme': 'dark',
                 'notifications_enabled': 1,
@@ -80,55 +249,264 @@ class Database:
                 'schedule_shutdown': 0
             }
             
-            for key, value in default_settings.items():
-                self.cursor.execute(
-                    "INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)",
-                    (key, json.dumps(value))
-                )
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO settings (key, value, kind) VALUES (?, ?, ?)",
+                [(key,) + _encode_setting(value) for key, value in default_settings.items()]
+            )
             
             self.conn.commit()
+            
+            # An in-memory database is private to its connection, so reads
+            # there go through the writer as well
+            if self.db_path != ':memory:':
+                self._read_pool = queue.Queue()
+                for _ in range(READ_POOL_SIZE):
+                    self._read_pool.put(self._connect())
             return True
         except sqlite3.Error as e:
             print(f"Database initialization error: {e}")
             return False
     
+    def _read_legacy_settings(self):
+        """Read and drop a settings table that still stores JSON-encoded text
+        
+        Returns the decoded settings, or None when there is nothing to migrate.
+        """
+        columns = [row[1] for row in self.cursor.execute("PRAGMA table_info(settings)")]
+        if not columns or 'kind' in columns:
+            return None
+        
+        self.cursor.execute("SELECT key, value FROM settings")
+        settings = {key: json.loads(value) for key, value in self.cursor.fetchall()}
+        self.cursor.execute("DROP TABLE settings")
+        return settings
+    
+    def _connect(self):
+        """Open a connection usable from any thread, with per-connection PRAGMAs"""
+        # sqlite3 keeps compiled statements in a per-connection LRU keyed by
+        # SQL text, so identical queries skip parsing and planning
+        conn = sqlite3.connect(self.db_path, cached_statements=256, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA synchronous={DURABILITY_LEVELS[self.durability]}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # 20 MB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        return conn
+    
     def close(self):
-        """Close the database connection"""
+        """Close the database connections"""
+        if self._writer_thread.is_alive():
+            self._write_queue.put(None)
+            self._writer_thread.join()
+        if self.conn:
+            self.checkpoint()
+        if self._read_pool is not None:
+            while not self._read_pool.empty():
+                self._read_pool.get_nowait().close()
+            self._read_pool = None
         if self.conn:
             self.conn.close()
     
+    def checkpoint(self):
+        """Copy the write-ahead log back into the database file
+        
+        Call on shutdown or when the app goes idle. PASSIVE never blocks
+        readers or writers.
+        """
+        if self.db_path == ':memory:':
+            return False
+        
+        try:
+            with self._acquire(write=True) as (conn, cursor):
+                cursor.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                return True
+        except sqlite3.Error as e:
+            print(f"Error checkpointing database: {e}")
+            return False
+    
+    def _writer_loop(self):
+        """Apply queued writes, committing up to WRITE_BATCH_SIZE at a time"""
+        self._writer_ident = threading.get_ident()
+        running = True
+        while running:
+            items = [self._write_queue.get()]
+            while len(items) < WRITE_BATCH_SIZE:
+                try:
+                    items.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            writes = [item for item in items if item is not None]
+            running = len(writes) == len(items)
+            # Results are held back until the batch commits, so no caller is
+            # told a write succeeded when it was rolled back
+            outcomes = []
+            try:
+                with self.batch():
+                    for future, func, args, kwargs in writes:
+                        # The caller may have cancelled the future meanwhile
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        try:
+                            outcomes.append((future, func(*args, **kwargs), None))
+                        except Exception as e:
+                            outcomes.append((future, None, e))
+            except Exception as e:
+                # Anything escaping here would kill the only writer thread
+                print(f"Error committing queued writes: {e}")
+                for future, _, _, _ in writes:
+                    if future.running() or future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+            else:
+                for future, result, error in outcomes:
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+            finally:
+                for _ in items:
+                    self._write_queue.task_done()
+    
+    def submit_write(self, func, *args, **kwargs):
+        """Queue a write method for the background writer
+        
+        Returns a Future with the method's result, e.g.
+        db.submit_write(db.add_download, url, file_name, save_path).result()
+        """
+        future = concurrent.futures.Future()
+        self._write_queue.put((future, func, args, kwargs))
+        return future
+    
+    def flush(self):
+        """Wait until all queued writes have been applied"""
+        if threading.get_ident() not in (self._writer_ident, self._batch_owner):
+            self._write_queue.join()
+    
+    @contextmanager
+    def _acquire(self, write=False):
+        """Yield a (connection, cursor) pair for one operation
+        
+        Writes always use the single writer connection; reads borrow a pooled
+        connection unless the calling thread has an open batch, so it sees
+        its own uncommitted changes.
+        """
+        if write or self._read_pool is None or self._batch_owner == threading.get_ident():
+            if write:
+                # Keep direct writes ordered after previously queued ones
+                self.flush()
+            with self._write_lock:
+                yield self.conn, self.cursor
+            return
+        
+        conn = self._read_pool.get()
+        try:
+            yield conn, conn.cursor()
+        finally:
+            self._read_pool.put(conn)
+    
+    def _commit(self):
+        """Commit the current write unless it is part of a batch"""
+        if self._batch_owner is None:
+            self.conn.commit()
+    
+    @contextmanager
+    def batch(self):
+        """Group several writes into one transaction (and one fsync)
+        
+        Usage:
+            with db.batch():
+                db.update_download(download_id, status='downloading')
+                ...
+        """
+        self.flush()
+        with self._write_lock:
+            if self._batch_owner is not None:
+                # Nested batches are folded into the outer transaction
+                yield self
+                return
+            
+            if self.conn.in_transaction:
+                self.conn.commit()
+            self._batch_owner = threading.get_ident()
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                yield self
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                self._batch_owner = None
+                # Other threads may have cached values from before the commit
+                self._invalidate_settings()
+    
+    def _update_sql(self, table, columns):
+        """Build (once) the UPDATE statement for a given set of columns"""
+        key = (table, columns)
+        sql = self._stmts.get(key)
+        if sql is None:
+            set_clause = ", ".join([f"{column} = ?" for column in columns])
+            sql = f"UPDATE {table} SET {set_clause} WHERE id = ?"
+            self._stmts[key] = sql
+        return sql
+    
+    @staticmethod
+    def _inserted_id(cursor):
+        """Get the id of the row just inserted through cursor"""
+        if _RETURNING_ID:
+            return cursor.fetchone()[0]
+        return cursor.lastrowid
+    
     def add_download(self, url, file_name, save_path, connections=8):
         """Add a new download to history"""
         try:
-            current_time = int(time.time())
-            self.cursor.execute(
-                """INSERT INTO downloads 
-                   (url, file_name, save_path, status, start_time, connections) 
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (url, file_name, save_path, 'started', current_time, connections)
-            )
-            self.conn.commit()
-            return self.cursor.lastrowid
+            with self._acquire(write=True) as (conn, cursor):
+                current_time = int(time.time())
+                cursor.execute(
+                    """INSERT INTO downloads 
+                       (url, file_name, save_path, status, start_time, connections) 
+                       VALUES (?, ?, ?, ?, ?, ?)""" + _RETURNING_ID,
+                    (url, file_name, save_path, 'started', current_time, connections)
+                )
+                download_id = self._inserted_id(cursor)
+                self._commit()
+                return download_id
         except sqlite3.Error as e:
             print(f"Error adding download: {e}")
             return None
     
     def update_download(self, download_id, **kwargs):
-        """Update download information"""
+        """Update download information
+        
+        The update is queued for the background writer and applied shortly
+        after; call flush() when a following read must see it.
+        """
         if not kwargs:
             return False
         
+        unknown = kwargs.keys() - self._DOWNLOAD_COLS
+        if unknown:
+            raise ValueError(f"Unknown download columns: {', '.join(sorted(unknown))}")
+        
+        if threading.get_ident() in (self._writer_ident, self._batch_owner):
+            # Inside a batch the update joins the caller's transaction
+            return self._write_download_update(download_id, kwargs)
+        self.submit_write(self._write_download_update, download_id, kwargs)
+        return True
+    
+    def _write_download_update(self, download_id, kwargs):
+        """Apply an update_download() call"""
         try:
-            set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
-            values = list(kwargs.values())
-            values.append(download_id)
-            
-            self.cursor.execute(
-                f"UPDATE downloads SET {set_clause} WHERE id = ?",
-                values
-            )
-            self.conn.commit()
-            return True
+            with self._acquire(write=True) as (conn, cursor):
+                # Sorting the columns gives every update shape one stable SQL text,
+                # so repeated progress updates hit the statement cache
+                columns = tuple(sorted(kwargs))
+                values = [kwargs[column] for column in columns]
+                values.append(download_id)
+                
+                cursor.execute(self._update_sql("downloads", columns), values)
+                self._commit()
+                return True
         except sqlite3.Error as e:
             print(f"Error updating download: {e}")
             return False
@@ -136,59 +514,64 @@ class Database:
     def complete_download(self, download_id, file_size, avg_speed):
         """Mark a download as completed"""
         try:
-            current_time = int(time.time())
-            self.cursor.execute(
-                """UPDATE downloads SET 
-                   status = ?, end_time = ?, file_size = ?, 
-                   avg_speed = ?, completed = 1 
-                   WHERE id = ?""",
-                ('completed', current_time, file_size, avg_speed, download_id)
-            )
-            self.conn.commit()
-            return True
+            with self._acquire(write=True) as (conn, cursor):
+                current_time = int(time.time())
+                cursor.execute(
+                    """UPDATE downloads SET 
+                       status = ?, end_time = ?, file_size = ?, 
+                       avg_speed = ?, completed = 1 
+                       WHERE id = ?""",
+                    ('completed', current_time, file_size, avg_speed, download_id)
+                )
+                self._commit()
+                return True
         except sqlite3.Error as e:
             print(f"Error completing download: {e}")
             return False
     
-    def get_download_history(self, limit=50, offset=0, order_by="start_time DESC"):
-        """Get download history"""
+    def get_download_history(self, limit=50, offset=0, order_by="start_time DESC", fields=DEFAULT_SUMMARY_FIELDS):
+        """Get download history, returning only the requested fields"""
+        if order_by not in self._ORDER_BY_WHITELIST:
+            raise ValueError(f"Unsupported order_by: {order_by}")
+        unknown = set(fields) - set(DOWNLOAD_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown download fields: {', '.join(sorted(unknown))}")
+        
         try:
-            self.cursor.execute(
-                f"SELECT * FROM downloads ORDER BY {order_by} LIMIT ? OFFSET ?", 
-                (limit, offset)
-            )
-            columns = [description[0] for description in self.cursor.description]
-            downloads = []
-            
-            for row in self.cursor.fetchall():
-                download = dict(zip(columns, row))
-                downloads.append(download)
-            
-            return downloads
+            with self._acquire() as (conn, cursor):
+                cursor.execute(
+                    f"SELECT {', '.join(fields)} FROM downloads ORDER BY {order_by} LIMIT ? OFFSET ?", 
+                    (limit, offset)
+                )
+                return [dict(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
             print(f"Error getting download history: {e}")
             return []
     
-    def get_download(self, download_id):
-        """Get a specific download by ID"""
+    def get_download_detail(self, download_id):
+        """Get every column of a specific download, including metadata"""
         try:
-            self.cursor.execute("SELECT * FROM downloads WHERE id = ?", (download_id,))
-            columns = [description[0] for description in self.cursor.description]
-            row = self.cursor.fetchone()
-            
-            if row:
-                return dict(zip(columns, row))
-            return None
+            with self._acquire() as (conn, cursor):
+                cursor.execute(self._DOWNLOAD_DETAIL_SQL, (download_id,))
+                row = cursor.fetchone()
+                
+                if row:
+                    return dict(row)
+                return None
         except sqlite3.Error as e:
             print(f"Error getting download: {e}")
             return None
     
+    # Kept for existing callers
+    get_download = get_download_detail
+    
     def delete_download(self, download_id):
         """Delete a download from history"""
         try:
-            self.cursor.execute("DELETE FROM downloads WHERE id = ?", (download_id,))
-            self.conn.commit()
-            return True
+            with self._acquire(write=True) as (conn, cursor):
+                cursor.execute("DELETE FROM downloads WHERE id = ?", (download_id,))
+                self._commit()
+                return True
         except sqlite3.Error as e:
             print(f"Error deleting download: {e}")
             return False
@@ -196,22 +579,45 @@ class Database:
     def clear_history(self):
         """Clear all download history"""
         try:
-            self.cursor.execute("DELETE FROM downloads")
-            self.conn.commit()
-            return True
+            with self._acquire(write=True) as (conn, cursor):
+                cursor.execute("DELETE FROM downloads")
+                self._commit()
+                return True
         except sqlite3.Error as e:
             print(f"Error clearing history: {e}")
             return False
     
+    def _invalidate_settings(self, keys=None):
+        """Drop cached settings (all of them when keys is None) after a write"""
+        with self._settings_lock:
+            self._settings_generation += 1
+            if keys is None:
+                self._settings_cache.clear()
+            else:
+                for key in keys:
+                    self._settings_cache.pop(key, None)
+    
     def get_setting(self, key, default=None):
         """Get a setting value"""
+        # Settings are probed constantly by the UI, so decoded values are cached
+        # until set_setting() changes them
+        value = self._settings_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return _copy_setting(value)
+        
+        generation = self._settings_generation
         try:
-            self.cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-            result = self.cursor.fetchone()
-            
-            if result:
-                return json.loads(result[0])
-            return default
+            with self._acquire() as (conn, cursor):
+                cursor.execute("SELECT value, kind FROM settings WHERE key = ?", (key,))
+                result = cursor.fetchone()
+                
+                if result:
+                    value = _decode_setting(result[0], result[1])
+                    with self._settings_lock:
+                        if generation == self._settings_generation:
+                            self._settings_cache[key] = value
+                    return _copy_setting(value)
+                return default
         except sqlite3.Error as e:
             print(f"Error getting setting: {e}")
             return default
@@ -219,27 +625,36 @@ class Database:
     def set_setting(self, key, value):
         """Set a setting value"""
         try:
-            serialized_value = json.dumps(value)
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                (key, serialized_value)
-            )
-            self.conn.commit()
-            return True
+            with self._acquire(write=True) as (conn, cursor):
+                stored_value, kind = _encode_setting(value)
+                cursor.execute(_SET_SETTING_SQL, (key, stored_value, kind))
+                self._commit()
+                self._invalidate_settings((key,))
+                return True
         except sqlite3.Error as e:
             print(f"Error setting setting: {e}")
             return False
     
+    def set_settings(self, settings):
+        """Set several settings in one statement and one commit"""
+        try:
+            with self._acquire(write=True) as (conn, cursor):
+                cursor.executemany(_SET_SETTING_SQL, [
+                    (key,) + _encode_setting(value) for key, value in settings.items()
+                ])
+                self._commit()
+                self._invalidate_settings(settings)
+                return True
+        except sqlite3.Error as e:
+            print(f"Error setting settings: {e}")
+            return False
+    
     def get_all_settings(self):
         """Get all settings"""
         try:
-            self.cursor.execute("SELECT key, value FROM settings")
-            settings = {}
-            
-            for key, value in self.cursor.fetchall():
-                settings[key] = json.loads(value)
-            
-            return settings
+            with self._acquire() as (conn, cursor):
+                cursor.execute("SELECT key, value, kind FROM settings")
+                return {key: _decode_setting(value, kind) for key, value, kind in cursor.fetchall()}
         except sqlite3.Error as e:
             print(f"Error getting all settings: {e}")
             return {}
@@ -247,17 +662,19 @@ class Database:
     def add_scheduled_download(self, url, save_path, schedule_time, connections=8, recurring=None, metadata=None):
         """Add a scheduled download"""
         try:
-            if metadata is not None:
-                metadata = json.dumps(metadata)
-                
-            self.cursor.execute(
-                """INSERT INTO scheduled_downloads 
-                   (url, save_path, schedule_time, connections, recurring, metadata) 
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (url, save_path, schedule_time, connections, recurring, metadata)
-            )
-            self.conn.commit()
-            return self.cursor.lastrowid
+            with self._acquire(write=True) as (conn, cursor):
+                if metadata is not None:
+                    metadata = json.dumps(metadata)
+                    
+                cursor.execute(
+                    """INSERT INTO scheduled_downloads 
+                       (url, save_path, schedule_time, connections, recurring, metadata) 
+                       VALUES (?, ?, ?, ?, ?, ?)""" + _RETURNING_ID,
+                    (url, save_path, schedule_time, connections, recurring, metadata)
+                )
+                download_id = self._inserted_id(cursor)
+                self._commit()
+                return download_id
         except sqlite3.Error as e:
             print(f"Error adding scheduled download: {e}")
             return None
@@ -265,25 +682,25 @@ class Database:
     def get_scheduled_downloads(self, status='waiting'):
         """Get scheduled downloads with specified status"""
         try:
-            if status:
-                self.cursor.execute(
-                    "SELECT * FROM scheduled_downloads WHERE status = ? ORDER BY schedule_time", 
-                    (status,)
-                )
-            else:
-                self.cursor.execute("SELECT * FROM scheduled_downloads ORDER BY schedule_time")
+            with self._acquire() as (conn, cursor):
+                if status:
+                    cursor.execute(
+                        f"SELECT {self._SCHEDULED_SELECT} FROM scheduled_downloads WHERE status = ? ORDER BY schedule_time", 
+                        (status,)
+                    )
+                else:
+                    cursor.execute(f"SELECT {self._SCHEDULED_SELECT} FROM scheduled_downloads ORDER BY schedule_time")
+                    
+                downloads = []
                 
-            columns = [description[0] for description in self.cursor.description]
-            downloads = []
-            
-            for row in self.cursor.fetchall():
-                download = dict(zip(columns, row))
-                # Parse metadata if exists
-                if download.get('metadata'):
-                    download['metadata'] = json.loads(download['metadata'])
-                downloads.append(download)
-            
-            return downloads
+                for row in cursor.fetchall():
+                    download = dict(row)
+                    # Parse metadata if exists
+                    if download.get('metadata'):
+                        download['metadata'] = json.loads(download['metadata'])
+                    downloads.append(download)
+                
+                return downloads
         except sqlite3.Error as e:
             print(f"Error getting scheduled downloads: {e}")
             return []
@@ -293,21 +710,23 @@ class Database:
         if not kwargs:
             return False
         
+        unknown = kwargs.keys() - self._SCHEDULED_COLS
+        if unknown:
+            raise ValueError(f"Unknown scheduled download columns: {', '.join(sorted(unknown))}")
+        
         try:
-            # Handle metadata serialization
-            if 'metadata' in kwargs and kwargs['metadata'] is not None:
-                kwargs['metadata'] = json.dumps(kwargs['metadata'])
+            with self._acquire(write=True) as (conn, cursor):
+                # Handle metadata serialization
+                if 'metadata' in kwargs and kwargs['metadata'] is not None:
+                    kwargs['metadata'] = json.dumps(kwargs['metadata'])
+                    
+                columns = tuple(sorted(kwargs))
+                values = [kwargs[column] for column in columns]
+                values.append(download_id)
                 
-            set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
-            values = list(kwargs.values())
-            values.append(download_id)
-            
-            self.cursor.execute(
-                f"UPDATE scheduled_downloads SET {set_clause} WHERE id = ?",
-                values
-            )
-            self.conn.commit()
-            return True
+                cursor.execute(self._update_sql("scheduled_downloads", columns), values)
+                self._commit()
+                return True
         except sqlite3.Error as e:
             print(f"Error updating scheduled download: {e}")
             return False
@@ -315,9 +734,10 @@ class Database:
     def delete_scheduled_download(self, download_id):
         """Delete a scheduled download"""
         try:
-            self.cursor.execute("DELETE FROM scheduled_downloads WHERE id = ?", (download_id,))
-            self.conn.commit()
-            return True
+            with self._acquire(write=True) as (conn, cursor):
+                cursor.execute("DELETE FROM scheduled_downloads WHERE id = ?", (download_id,))
+                self._commit()
+                return True
         except sqlite3.Error as e:
             print(f"Error deleting scheduled download: {e}")
             return False 
\ No newline at end of file
@@ -1,9 +1,15 @@
 import sys
 import os
+import re
+import socket
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
 import threading
 import time
 import queue
+import math
+import random
 import concurrent.futures
 from urllib.parse import urlparse
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
@@ -11,8 +17,8 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QProgressBar, QFileDialog, QListWidget, QListWidgetItem,
                             QMessageBox, QMenu, QStyleFactory, QFrame, QSlider,
                             QToolBar, QAction, QSizePolicy, QGraphicsDropShadowEffect,
-                            QComboBox)
-from PyQt5.QtCore import Qt, pyqtSignal, QObject, QTimer, QSize, QPoint
+                            QComboBox, QGridLayout)
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QTimer, QSize
 from PyQt5.QtGui import QIcon, QFont, QPalette, QColor, QMouseEvent, QCursor
 
 # Update color scheme to a modern palette
@@ -25,28 +31,296 @@ DISABLED_COLOR = "#555555"
 PROGRESS_COLOR = "#4CAF50"  # Green
 CARD_SHADOW = "0px 2px 6px rgba(0, 0, 0, 0.3)"
 
+# Progress bar stylesheets per download state, rendered once at import
+_PROGRESS_STYLE_TEMPLATE = """
+    QProgressBar {{
+        border: 1px solid #555555;
+        border-radius: 3px;
+        background-color: {background};
+        height: 15px;
+        text-align: center;
+        color: {text};
+        font-weight: bold;
+    }}
+    
+    QProgressBar::chunk {{
+        background-color: {chunk};
+        border-radius: 2px;
+    }}
+"""
+PROGRESS_STYLE_PAUSED = _PROGRESS_STYLE_TEMPLATE.format(
+    background=DARK_TERTIARY, text=TEXT_COLOR, chunk="#f39c12")
+PROGRESS_STYLE_DOWNLOADING = _PROGRESS_STYLE_TEMPLATE.format(
+    background=DARK_TERTIARY, text=TEXT_COLOR, chunk=PROGRESS_COLOR)
+PROGRESS_STYLE_COMPLETED = _PROGRESS_STYLE_TEMPLATE.format(
+    background=DARK_TERTIARY, text=TEXT_COLOR, chunk="#3498db")
+
+# Application stylesheet for the main window, parsed once by Qt in setDarkTheme.
+# Every rule is scoped by object name so dialogs and download rows keep their own styles.
+_APP_QSS = f"""
+#mainContainer {{
+    background-color: {DARK_PRIMARY};
+    border-radius: 10px;
+    border: 1px solid {DARK_TERTIARY};
+}}
+
+#titleBar {{
+    background-color: {DARK_PRIMARY};
+    border-top-left-radius: 10px;
+    border-top-right-radius: 10px;
+}}
+
+#appTitle {{
+    color: {TEXT_COLOR};
+    font-size: 18px;
+    font-weight: bold;
+}}
+
+QComboBox#languageSelector {{
+    background-color: {DARK_TERTIARY};
+    color: {TEXT_COLOR};
+    border: none;
+    border-radius: 5px;
+    padding: 5px;
+    min-height: 25px;
+}}
+QComboBox#languageSelector::drop-down {{
+    width: 20px;
+    border: none;
+    background: {DARK_TERTIARY};
+}}
+QComboBox#languageSelector QAbstractItemView {{
+    background-color: {DARK_SECONDARY};
+    color: {TEXT_COLOR};
+    selection-background-color: {ACCENT_COLOR};
+    selection-color: {TEXT_COLOR};
+    border: none;
+    outline: none;
+}}
+
+QPushButton#minimizeBtn, QPushButton#closeBtn {{
+    background-color: {DARK_PRIMARY};
+    color: {TEXT_COLOR};
+    border: none;
+    font-size: 16px;
+    font-weight: bold;
+}}
+QPushButton#minimizeBtn:hover {{
+    background-color: {DARK_TERTIARY};
+    border-radius: 15px;
+}}
+QPushButton#closeBtn:hover {{
+    background-color: {ACCENT_COLOR};
+    border-radius: 15px;
+}}
+
+#headerContainer {{
+    background-color: {DARK_PRIMARY};
+    border-radius: 8px;
+    padding: 0px;
+}}
+
+QPushButton#toolbarBtn {{
+    background-color: {DARK_TERTIARY};
+    color: {TEXT_COLOR};
+    border-radius: 6px;
+    padding: 8px 12px;
+    font-weight: bold;
+}}
+QPushButton#toolbarBtn:hover {{
+    background-color: {ACCENT_COLOR};
+}}
+
+#inputContainer {{
+    background-color: {DARK_SECONDARY};
+    border-radius: 10px;
+    padding: 0px;
+}}
+
+#url_label, #save_label, #conn_label {{
+    color: {TEXT_COLOR};
+    font-weight: bold;
+}}
+
+QLineEdit#urlInput, QLineEdit#savePathInput {{
+    background-color: {DARK_TERTIARY};
+    color: {TEXT_COLOR};
+    border: none;
+    border-radius: 8px;
+    padding: 12px 10px;
+    font-size: 13px;
+}}
+
+QPushButton#browseBtn {{
+    background-color: {DARK_PRIMARY};
+    color: {TEXT_COLOR};
+    border-radius: 6px;
+    padding: 8px 12px;
+    font-weight: bold;
+}}
+QPushButton#browseBtn:hover {{
+    background-color: {ACCENT_COLOR};
+}}
+
+QSlider#connSlider::groove:horizontal {{
+    height: 8px;
+    background: {DARK_PRIMARY};
+    margin: 2px 0;
+    border-radius: 4px;
+}}
+QSlider#connSlider::handle:horizontal {{
+    background: {ACCENT_COLOR};
+    border: none;
+    width: 18px;
+    height: 18px;
+    margin: -5px 0;
+    border-radius: 9px;
+}}
+QSlider#connSlider::handle:horizontal:hover {{
+    background: #ff5b76;
+}}
+QSlider#connSlider::sub-page:horizontal {{
+    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 0,
+        stop: 0 {ACCENT_COLOR}, stop: 1 #ff5b76);
+    height: 8px;
+    border-radius: 4px;
+}}
+
+#connValue {{
+    color: {TEXT_COLOR};
+    min-width: 25px;
+    text-align: center;
+}}
+
+#downloadsHeaderContainer {{
+    background-color: transparent;
+}}
+
+QPushButton#downloadBtn {{
+    background-color: {ACCENT_COLOR};
+    color: white;
+    border-radius: 8px;
+    padding: 12px 20px;
+    font-weight: bold;
+    font-size: 14px;
+}}
+QPushButton#downloadBtn:hover {{
+    background-color: #ff5b76;
+}}
+
+#downloads_header {{
+    color: {TEXT_COLOR};
+    font-size: 16px;
+    font-weight: bold;
+}}
+
+#downloadsContainer {{
+    background-color: {DARK_SECONDARY};
+    border-radius: 10px;
+}}
+
+QListWidget#downloadsList {{
+    background-color: transparent;
+    color: {TEXT_COLOR};
+    border: none;
+    outline: none;
+}}
+QListWidget#downloadsList::item {{
+    border: none;
+    padding: 4px;
+}}
+
+#statusContainer {{
+    background-color: {DARK_PRIMARY};
+    border-radius: 6px;
+}}
+
+#statusLabel, #versionLabel {{
+    color: {TEXT_COLOR};
+}}
+
+QToolTip {{
+    border: 1px solid #555555;
+    background-color: {DARK_TERTIARY};
+    color: {TEXT_COLOR};
+    padding: 5px;
+    opacity: 200;
+}}
+QMenu {{
+    background-color: {DARK_SECONDARY};
+    color: {TEXT_COLOR};
+    border: 1px solid #555555;
+}}
+QMenu::item {{
+    padding: 5px 30px 5px 20px;
+}}
+QMenu::item:selected {{
+    background-color: {ACCENT_COLOR};
+}}
+"""
+
 # Default settings
 DEFAULT_CONNECTIONS = 8  # Number of concurrent connections
 DEFAULT_CHUNK_SIZE = 1024 * 1024 * 2  # 2MB chunks
 DEFAULT_TIMEOUT = 30  # 30 seconds timeout
+READ_SIZE = 1024 * 1024  # Bytes read from the socket per iteration
+SIZE_UNITS = ((1, 'B'), (1024, 'KB'), (1024 ** 2, 'MB'), (1024 ** 3, 'GB'))
+MAX_RETRIES = 5  # Attempts per chunk after the first request fails
+MAX_RETRY_DELAY = 30  # Cap for the exponential backoff between attempts (seconds)
+PROGRESS_INTERVAL = 0.5  # Seconds between progress reports (chunks and UI)
 MAX_CONNECTIONS = 16  # Maximum number of connections
+MIN_CONNECTIONS = 4  # Fewest connections the adaptive split picks
+MIN_CHUNK_SIZE = 1024 * 1024  # Never split into ranges smaller than 1MB
+PROBE_SIZE = 256 * 1024  # Bytes timed from the first response to estimate throughput
+TARGET_BANDWIDTH = 125 * 1024 * 1024  # Aim to fill a 1 Gbit/s link
+SOCKET_RECV_BUFFER = 4 * 1024 * 1024  # 4MB receive buffer for high-BDP links
+_DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "Downloads")
+_URL_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://[^/\s?#]+")  # Scheme and host present
 
 # Import the module files
 from database import Database
 from notifier import NotificationManager
-from cloud_services import create_cloud_service, detect_cloud_service
-import utils
 import translations
+# utils is imported lazily by show_history, its only user
 
 class DownloadSignals(QObject):
     progress = pyqtSignal(str, int, str, str)  # id, progress percentage, speed, downloaded/total
     status = pyqtSignal(str, str)  # id, status message
     completed = pyqtSignal(str)  # id
 
+class DownloadAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets disable Nagle and use a large receive buffer"""
+    
+    # Applied by urllib3 before connect(), so the enlarged buffer also
+    # lets the kernel advertise a bigger TCP window from the handshake on
+    socket_options = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RECV_BUFFER),
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+    
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        return super().proxy_manager_for(*args, **kwargs)
+
+class ChunkDownloadError(Exception):
+    """A chunk request failed; retryable errors are tried again with backoff"""
+    
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
 class ChunkDownloader(threading.Thread):
-    def __init__(self, url, start_byte, end_byte, output_file, chunk_id, chunk_queue, download_tracker):
+    def __init__(self, url, start_byte, end_byte, output_file, chunk_id, chunk_queue, download_tracker,
+                 session=None, pause_event=None, cancel_event=None, response=None, initial_data=b''):
         super().__init__()
         self.url = url
+        # Shared with the other chunks of the same download so keep-alive
+        # connections (and their TLS sessions) are reused
+        self.session = session or requests
         self.start_byte = start_byte
         self.end_byte = end_byte
         self.output_file = output_file
@@ -54,117 +328,214 @@ class ChunkDownloader(threading.Thread):
         self.chunk_queue = chunk_queue
         self.download_tracker = download_tracker
         self.daemon = True
-        self.is_paused = False
-        self.is_cancelled = False
+        # Events shared by all chunks of a download: pause_event is set while
+        # downloading and cleared while paused
+        self.pause_event = pause_event or threading.Event()
+        self.cancel_event = cancel_event or threading.Event()
+        if pause_event is None:
+            self.pause_event.set()
+        # An already open response for this range (the speculative probe GET)
+        # and the bytes already read from it while measuring throughput
+        self.response = response
+        self.initial_data = initial_data
+    
+    @property
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
         
     def run(self):
-        headers = {'Range': f'bytes={self.start_byte}-{self.end_byte}'}
+        total_chunk_size = self.end_byte - self.start_byte + 1
+        # Bytes of the range already written; kept across retries
+        self.downloaded = 0
         
         try:
-            with requests.get(self.url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT) as response:
-                if response.status_code not in [206, 200]:  # Partial Content or OK
-                    self.chunk_queue.put((self.chunk_id, False, f"Chunk download failed with status {response.status_code}"))
-                    return
+            # Every chunk writes its own byte range of the shared, pre-sized
+            # output file, so no merge pass is needed afterwards
+            with open(self.output_file, 'r+b') as f:
+                f.seek(self.start_byte)
+                if self.initial_data:
+                    f.write(self.initial_data)
+                    self.downloaded = len(self.initial_data)
+                    self.download_tracker.update_chunk_progress(self.chunk_id, self.downloaded, 0)
+                    self.initial_data = b''
                 
-                total_chunk_size = self.end_byte - self.start_byte + 1
-                downloaded = 0
+                attempt = 0
+                while True:
+                    try:
+                        self._download_range(f, total_chunk_size)
+                        break
+                    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, ChunkDownloadError) as e:
+                        retryable = getattr(e, 'retryable', True)
+                        if self.is_cancelled or not retryable or attempt >= MAX_RETRIES:
+                            raise
+                        attempt += 1
+                        # Back off, then ask only for the bytes still missing
+                        delay = min(2 ** attempt, MAX_RETRY_DELAY) + random.uniform(0, 0.5)
+                        if self.cancel_event.wait(delay):
+                            break
                 
-                with open(f"{self.output_file}.part{self.chunk_id}", 'wb') as f:
-                    start_time = time.time()
-                    bytes_since_last = 0
+                if self.is_cancelled:
+                    self.chunk_queue.put((self.chunk_id, False, "Cancelled"))
+                    return
+            
+            # Final update with the total downloaded for this chunk
+            self.download_tracker.update_chunk_progress(self.chunk_id, 0, 0, total_chunk_size)
+            self.chunk_queue.put((self.chunk_id, True, "Completed"))
+            
+        except Exception as e:
+            self.chunk_queue.put((self.chunk_id, False, str(e)))
+    
+    def _download_range(self, f, total_chunk_size):
+        """Fetch the rest of this chunk's range into f
+        
+        Returns early when the download is cancelled.
+        """
+        offset = self.start_byte + self.downloaded
+        
+        response = self.response
+        self.response = None
+        if response is None:
+            # identity keeps the byte range literal, since the body is read raw below
+            headers = {'Range': f'bytes={offset}-{self.end_byte}', 'Accept-Encoding': 'identity'}
+            response = self.session.get(self.url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT)
+        
+        with response:
+            if response.status_code == 200 and offset != 0:
+                # The server sent the whole file; it can't fill a range in the middle
+                raise ChunkDownloadError("Server ignored the range request", retryable=False)
+            if response.status_code not in [206, 200]:  # Partial Content or OK
+                retryable = response.status_code >= 500 or response.status_code == 429
+                raise ChunkDownloadError(f"Chunk download failed with status {response.status_code}", retryable)
+            
+            f.seek(offset)
+            start_time = time.time()
+            bytes_since_last = 0
+            
+            # Read the urllib3 response directly in large blocks, skipping
+            # requests' per-chunk decoding and buffering
+            raw = response.raw
+            raw.decode_content = False
+            
+            try:
+                while self.downloaded < total_chunk_size:
+                    data = raw.read(min(READ_SIZE, total_chunk_size - self.downloaded))
+                    if not data:
+                        raise ChunkDownloadError("Connection closed before the chunk was complete")
+                    
+                    if self.is_cancelled:
+                        return
                     
-                    for data in response.iter_content(chunk_size=65536):  # 64KB sub-chunks
+                    if not self.pause_event.is_set():
+                        # cancel() also sets the pause event to wake us up
+                        self.pause_event.wait()
                         if self.is_cancelled:
-                            self.chunk_queue.put((self.chunk_id, False, "Cancelled"))
                             return
-                        
-                        while self.is_paused:
-                            time.sleep(0.1)
-                            if self.is_cancelled:
-                                self.chunk_queue.put((self.chunk_id, False, "Cancelled"))
-                                return
-                        
-                        if data:
-                            f.write(data)
-                            data_len = len(data)
-                            downloaded += data_len
-                            bytes_since_last += data_len
-                            
-                            # Update download tracker periodically
-                            current_time = time.time()
-                            time_diff = current_time - start_time
-                            if time_diff >= 0.5:
-                                speed = bytes_since_last / time_diff
-                                self.download_tracker.update_chunk_progress(self.chunk_id, bytes_since_last, speed)
-                                start_time = current_time
-                                bytes_since_last = 0
-                
-                # Final update with the total downloaded for this chunk
-                self.download_tracker.update_chunk_progress(self.chunk_id, 0, 0, total_chunk_size)
-                self.chunk_queue.put((self.chunk_id, True, "Completed"))
-                
-        except Exception as e:
-            self.chunk_queue.put((self.chunk_id, False, str(e)))
+                    
+                    f.write(data)
+                    data_len = len(data)
+                    self.downloaded += data_len
+                    bytes_since_last += data_len
+                    
+                    # Update download tracker periodically
+                    current_time = time.time()
+                    time_diff = current_time - start_time
+                    if time_diff >= PROGRESS_INTERVAL:
+                        speed = bytes_since_last / time_diff
+                        self.download_tracker.update_chunk_progress(self.chunk_id, bytes_since_last, speed)
+                        start_time = current_time
+                        bytes_since_last = 0
+            finally:
+                # Count whatever arrived, also when the connection broke
+                if bytes_since_last:
+                    self.download_tracker.update_chunk_progress(self.chunk_id, bytes_since_last, 0)
 
 class DownloadTracker:
+    """Striped progress counters for the chunks of one download
+    
+    Each slot is written only by its own chunk thread, so updates need no
+    lock; the totals are summed when the monitor reads them.
+    """
+    
     def __init__(self, total_size, num_chunks):
         self.total_size = total_size
         self.chunks_progress = [0] * num_chunks
         self.chunks_speeds = [0] * num_chunks
-        self.lock = threading.Lock()
-        self.total_downloaded = 0
-        self.current_speed = 0
         
     def update_chunk_progress(self, chunk_id, bytes_downloaded, speed, total_chunk_size=None):
-        with self.lock:
-            if total_chunk_size is not None:
-                # Final update with total size
-                self.chunks_progress[chunk_id] = total_chunk_size
-            else:
-                # Incremental update
-                self.chunks_progress[chunk_id] += bytes_downloaded
-                self.chunks_speeds[chunk_id] = speed
-            
-            self.total_downloaded = sum(self.chunks_progress)
-            self.current_speed = sum(self.chunks_speeds)
+        if total_chunk_size is not None:
+            # Final update with total size; a finished chunk no longer adds speed
+            self.chunks_progress[chunk_id] = total_chunk_size
+            self.chunks_speeds[chunk_id] = 0
+        else:
+            # Incremental update
+            self.chunks_progress[chunk_id] += bytes_downloaded
+            self.chunks_speeds[chunk_id] = speed
+    
+    @property
+    def total_downloaded(self):
+        return sum(self.chunks_progress)
+    
+    @property
+    def current_speed(self):
+        return sum(self.chunks_speeds)
 
 class DownloadThread(threading.Thread):
-    def __init__(self, url, save_path, download_id, signals, num_connections=DEFAULT_CONNECTIONS):
+    def __init__(self, url, save_path, download_id, signals, num_connections=DEFAULT_CONNECTIONS,
+                 file_name=None):
         super().__init__()
         self.url = url
+        self.file_name = file_name or os.path.basename(urlparse(url).path) or 'download'
         self.save_path = save_path
         self.download_id = download_id
         self.signals = signals
         self.num_connections = min(num_connections, MAX_CONNECTIONS)
-        self.is_paused = False
-        self.is_cancelled = False
+        self.pause_event = threading.Event()
+        self.pause_event.set()  # set == running
+        self.cancel_event = threading.Event()
         self.daemon = True  # Thread will end when main program exits
         self.chunk_downloaders = []
+        # State read by progress_snapshot() from the GUI thread
+        self._chunk_queue = None
+        self._tracker = None
+        self._already_downloaded = 0
+        self._total_str = ""
+    
+    @property
+    def is_paused(self):
+        return not self.pause_event.is_set()
+    
+    @property
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
         
     def run(self):
-        file_name = os.path.basename(urlparse(self.url).path) or 'download'
-        full_path = os.path.join(self.save_path, file_name)
+        full_path = os.path.join(self.save_path, self.file_name)
         temp_path = full_path + ".download"
         
+        # One pooled session serves the HEAD probe and every chunk request
+        session = requests.Session()
+        adapter = DownloadAdapter(pool_connections=self.num_connections, pool_maxsize=self.num_connections, pool_block=False)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        first_response = None
         try:
             # Get file size
             self.signals.status.emit(self.download_id, "Checking file info...")
-            response = requests.head(self.url, timeout=DEFAULT_TIMEOUT)
-            
-            # Check if server supports range requests
-            supports_range = 'accept-ranges' in response.headers and response.headers['accept-ranges'] == 'bytes'
-            
-            # Get total file size
-            total_size = int(response.headers.get('content-length', 0))
+            total_size, supports_range, first_response = self._probe(session)
             
             if total_size == 0:
                 self.signals.status.emit(self.download_id, "Error: Could not determine file size")
                 return
             
+            # The total never changes, so format it once for every progress report
+            total_str = self.format_size(total_size)
+            complete_str = f"{total_str} / {total_str}"
+            
             # Check if the file is already downloaded
             if os.path.exists(full_path) and os.path.getsize(full_path) == total_size:
                 self.signals.status.emit(self.download_id, "File already downloaded")
-                downloaded_str = f"{self.format_size(total_size)} / {self.format_size(total_size)}"
+                downloaded_str = complete_str
                 self.signals.progress.emit(self.download_id, 100, "0 KB/s", downloaded_str)
                 self.signals.completed.emit(self.download_id)
                 return
@@ -175,70 +546,66 @@ class DownloadThread(threading.Thread):
                 self.num_connections = 1
             
             # Calculate chunk sizes
-            chunk_size = total_size // self.num_connections
-            if chunk_size < 1024 * 1024:  # If chunks would be smaller than 1MB
-                self.num_connections = max(1, total_size // (1024 * 1024))
+            initial_data = b''
+            if first_response is not None and self.num_connections > 1:
+                initial_data, throughput = self._measure_throughput(first_response, total_size)
+                rtt = first_response.elapsed.total_seconds()
+            if initial_data and throughput > 0:
+                # Enough connections to reach the target bandwidth, with ranges
+                # large enough (two bandwidth-delay products) to amortize each request
+                wanted = math.ceil(TARGET_BANDWIDTH / throughput)
+                self.num_connections = max(min(wanted, self.num_connections), min(MIN_CONNECTIONS, self.num_connections))
+                min_chunk = max(2 * throughput * rtt, MIN_CHUNK_SIZE)
+                self.num_connections = max(1, min(self.num_connections, int(total_size // min_chunk)))
+                chunk_size = total_size // self.num_connections
+            else:
                 chunk_size = total_size // self.num_connections
+                if chunk_size < MIN_CHUNK_SIZE:  # If chunks would be smaller than 1MB
+                    self.num_connections = max(1, total_size // MIN_CHUNK_SIZE)
+                    chunk_size = total_size // self.num_connections
             
             self.signals.status.emit(self.download_id, f"Starting download with {self.num_connections} connections...")
             
-            # Create download tracker
-            download_tracker = DownloadTracker(total_size, self.num_connections)
+            # Reserve the whole file up front; chunks write straight into it
+            self._preallocate(temp_path, total_size)
             
-            # Create a queue for chunk completion messages
-            chunk_queue = queue.Queue()
-            
-            # Create and start chunk downloaders
+            # Byte ranges; the last chunk gets the remainder
+            ranges = []
             for i in range(self.num_connections):
                 start_byte = i * chunk_size
-                # Last chunk gets the remainder
                 end_byte = total_size - 1 if i == self.num_connections - 1 else start_byte + chunk_size - 1
-                
-                chunk_downloader = ChunkDownloader(
-                    self.url, start_byte, end_byte, temp_path, i, chunk_queue, download_tracker
-                )
-                self.chunk_downloaders.append(chunk_downloader)
-                chunk_downloader.start()
+                ranges.append((start_byte, end_byte))
             
-            # Monitor download progress
-            chunks_completed = 0
-            chunks_failed = []
-            start_time = time.time()
             download_start = time.time()
+            chunks_failed = self._download_chunks(
+                session, temp_path, total_size, total_str, ranges, first_response, initial_data
+            )
+            first_response = None
             
-            while chunks_completed + len(chunks_failed) < self.num_connections:
-                if self.is_cancelled:
-                    for downloader in self.chunk_downloaders:
-                        downloader.is_cancelled = True
-                    self.signals.status.emit(self.download_id, "Cancelled")
-                    self._cleanup_temp_files(temp_path)
-                    return
-                
-                # Update pause state for all chunk downloaders
-                for downloader in self.chunk_downloaders:
-                    downloader.is_paused = self.is_paused
-                
-                # Check for completed chunks
-                try:
-                    chunk_id, success, message = chunk_queue.get(timeout=0.5)
-                    if success:
-                        chunks_completed += 1
-                    else:
+            # When most chunks failed the server is probably throttling parallel
+            # connections, so fetch the missing ranges again one at a time
+            if chunks_failed and len(ranges) > 1 and 2 * len(chunks_failed) > len(ranges):
+                self.signals.status.emit(self.download_id, "Retrying failed chunks with a single connection...")
+                # Bytes a failed chunk already wrote stay in place
+                failed_ranges = [
+                    (ranges[chunk_id][0] + self.chunk_downloaders[chunk_id].downloaded, ranges[chunk_id][1])
+                    for chunk_id, message in chunks_failed
+                ]
+                done = total_size - sum(end - start + 1 for start, end in failed_ranges)
+                chunks_failed = []
+                for start_byte, end_byte in failed_ranges:
+                    for chunk_id, message in self._download_chunks(
+                        session, temp_path, total_size, total_str, [(start_byte, end_byte)], already_downloaded=done
+                    ) or []:
                         chunks_failed.append((chunk_id, message))
-                        self.signals.status.emit(self.download_id, f"Chunk {chunk_id} failed: {message}")
-                except queue.Empty:
-                    # No completed chunks in this cycle, just update progress
-                    pass
-                
-                # Update progress
-                current_time = time.time()
-                if current_time - start_time >= 0.5:
-                    with download_tracker.lock:
-                        progress = int((download_tracker.total_downloaded / total_size) * 100)
-                        speed_str = self.format_size(download_tracker.current_speed) + "/s"
-                        downloaded_str = f"{self.format_size(download_tracker.total_downloaded)} / {self.format_size(total_size)}"
-                        self.signals.progress.emit(self.download_id, progress, speed_str, downloaded_str)
-                    start_time = current_time
+                    if self.is_cancelled:
+                        break
+                    done += end_byte - start_byte + 1
+            
+            if self.is_cancelled:
+                self.signals.status.emit(self.download_id, "Cancelled")
+                self._cleanup_temp_files(temp_path)
+                return
             
             # All chunks completed or failed
             if chunks_failed:
@@ -247,15 +614,14 @@ class DownloadThread(threading.Thread):
                 self._cleanup_temp_files(temp_path)
                 return
             
-            # Merge chunks
-            self.signals.status.emit(self.download_id, "Merging downloaded chunks...")
-            self._merge_chunks(temp_path, full_path, self.num_connections)
+            # All ranges are in place, so the temporary file is the download
+            os.replace(temp_path, full_path)
             
             # Calculate final statistics
             total_time = time.time() - download_start
             avg_speed = total_size / total_time if total_time > 0 else 0
             avg_speed_str = self.format_size(avg_speed) + "/s"
-            downloaded_str = f"{self.format_size(total_size)} / {self.format_size(total_size)}"
+            downloaded_str = complete_str
             
             self.signals.progress.emit(self.download_id, 100, avg_speed_str, downloaded_str)
             self.signals.status.emit(self.download_id, "Completed")
@@ -267,65 +633,216 @@ class DownloadThread(threading.Thread):
             else:
                 self.signals.status.emit(self.download_id, f"Error: {str(e)}")
             self._cleanup_temp_files(temp_path)
+        except OSError as e:
+            # Creating, sizing or renaming the output file failed
+            self.signals.status.emit(self.download_id, f"Error: {str(e)}")
+            self._cleanup_temp_files(temp_path)
+        finally:
+            if first_response is not None:
+                first_response.close()
+            session.close()
+    
+    def _download_chunks(self, session, temp_path, total_size, total_str, ranges,
+                         first_response=None, initial_data=b'', already_downloaded=0):
+        """Download ranges in parallel, one ChunkDownloader each
+        
+        Returns the list of (chunk_id, message) for failed chunks, or None
+        if the download was cancelled.
+        """
+        # Create download tracker
+        download_tracker = DownloadTracker(total_size, len(ranges))
+        
+        # Create a queue for chunk completion messages
+        chunk_queue = queue.Queue()
+        
+        # Publish the tracker for progress_snapshot()
+        self._already_downloaded = already_downloaded
+        self._total_str = total_str
+        self._tracker = download_tracker
+        self._chunk_queue = chunk_queue
+        if self.is_cancelled:
+            # cancel() may have run before the queue existed
+            return None
+        
+        # Create and start chunk downloaders
+        self.chunk_downloaders = []
+        for i, (start_byte, end_byte) in enumerate(ranges):
+            chunk_downloader = ChunkDownloader(
+                self.url, start_byte, end_byte, temp_path, i, chunk_queue, download_tracker,
+                session, self.pause_event, self.cancel_event,
+                # Chunk 0 keeps reading the probe's bytes=0- response
+                first_response if i == 0 else None,
+                initial_data if i == 0 else b''
+            )
+            self.chunk_downloaders.append(chunk_downloader)
+            chunk_downloader.start()
+        
+        # Wait for the chunks to finish; progress is polled by the GUI through
+        # progress_snapshot(), so this thread only wakes when a chunk is done
+        chunks_completed = 0
+        chunks_failed = []
+        
+        while chunks_completed + len(chunks_failed) < len(ranges):
+            item = chunk_queue.get()
+            if self.is_cancelled:
+                return None
+            if item is None:
+                continue
+            
+            chunk_id, success, message = item
+            if success:
+                chunks_completed += 1
+            else:
+                chunks_failed.append((chunk_id, message))
+                self.signals.status.emit(self.download_id, f"Chunk {chunk_id} failed: {message}")
+        
+        return chunks_failed
+    
+    def progress_snapshot(self):
+        """Get (progress, speed, size info) for the running transfer, or None"""
+        download_tracker = self._tracker
+        if download_tracker is None:
+            return None
+        
+        total_downloaded = self._already_downloaded + download_tracker.total_downloaded
+        progress = int((total_downloaded / download_tracker.total_size) * 100)
+        speed_str = self.format_size(download_tracker.current_speed) + "/s"
+        downloaded_str = f"{self.format_size(total_downloaded)} / {self._total_str}"
+        return progress, speed_str, downloaded_str
+    
+    @staticmethod
+    def _measure_throughput(response, total_size):
+        """Read the start of response, returning (data, bytes per second)"""
+        raw = response.raw
+        raw.decode_content = False
+        wanted = min(PROBE_SIZE, total_size)
+        data = b''
+        start = time.time()
+        try:
+            while len(data) < wanted:
+                block = raw.read(wanted - len(data))
+                if not block:
+                    break
+                data += block
+        except Exception:
+            # Chunk 0 will report the broken stream itself
+            pass
+        elapsed = time.time() - start
+        throughput = len(data) / elapsed if elapsed > 0 else 0
+        return data, throughput
+    
+    def _probe(self, session):
+        """Get (total_size, supports_range, response) for the download URL
+        
+        The HEAD request and a speculative GET for bytes=0- are sent together.
+        When the GET comes back as 206 its Content-Range gives the size without
+        waiting for HEAD, and the still open response is returned so the first
+        chunk can continue reading it; otherwise response is None.
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        try:
+            head_future = executor.submit(session.head, self.url, timeout=DEFAULT_TIMEOUT)
+            get_future = executor.submit(
+                session.get, self.url, headers={'Range': 'bytes=0-', 'Accept-Encoding': 'identity'},
+                stream=True, timeout=DEFAULT_TIMEOUT
+            )
+            
+            try:
+                response = get_future.result()
+            except requests.exceptions.RequestException:
+                response = None
+            
+            if response is not None:
+                if response.status_code == 206:
+                    # Content-Range: bytes 0-1233/1234
+                    total = response.headers.get('content-range', '').rpartition('/')[2]
+                    if total.isdigit() and int(total) > 0:
+                        return int(total), True, response
+                response.close()
+            
+            response = head_future.result()
+            
+            # Check if server supports range requests
+            supports_range = 'accept-ranges' in response.headers and response.headers['accept-ranges'] == 'bytes'
+            
+            # Get total file size
+            total_size = int(response.headers.get('content-length', 0))
+            return total_size, supports_range, None
+        finally:
+            # A HEAD still in flight is simply left to finish
+            executor.shutdown(wait=False)
     
     def _cleanup_temp_files(self, temp_path):
-        # Clean up partial files
-        for i in range(self.num_connections):
-            part_file = f"{temp_path}.part{i}"
-            if os.path.exists(part_file):
+        # Clean up the partial file
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except:
+                pass
+    
+    @staticmethod
+    def _preallocate(path, size):
+        with open(path, 'wb') as f:
+            if hasattr(os, 'posix_fallocate'):
                 try:
-                    os.remove(part_file)
-                except:
+                    os.posix_fallocate(f.fileno(), 0, size)
+                    return
+                except OSError:
+                    # Not supported by every filesystem
                     pass
-    
-    def _merge_chunks(self, temp_path, output_path, num_chunks):
-        with open(output_path, 'wb') as outfile:
-            for i in range(num_chunks):
-                part_file = f"{temp_path}.part{i}"
-                if os.path.exists(part_file):
-                    with open(part_file, 'rb') as infile:
-                        outfile.write(infile.read())
-                    try:
-                        os.remove(part_file)  # Delete part file after merging
-                    except:
-                        pass
+            f.truncate(size)
     
     def pause(self):
-        self.is_paused = True
+        self.pause_event.clear()
         self.signals.status.emit(self.download_id, "Paused")
     
     def resume(self):
-        self.is_paused = False
+        self.pause_event.set()
         self.signals.status.emit(self.download_id, "Downloading...")
     
     def cancel(self):
-        self.is_cancelled = True
+        self.cancel_event.set()
+        # Wake paused chunks so they notice the cancellation
+        self.pause_event.set()
+        # Wake the monitor even if every chunk is stuck in a slow read
+        if self._chunk_queue is not None:
+            self._chunk_queue.put(None)
     
     @staticmethod
     def format_size(size_bytes):
-        if size_bytes < 1024:
-            return f"{size_bytes:.2f} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes/1024:.2f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes/(1024*1024):.2f} MB"
-        else:
-            return f"{size_bytes/(1024*1024*1024):.2f} GB"
+        if not size_bytes:
+            # Idle chunks report zero speed on every tick
+            return "0.00 B"
+        # Every unit is 2**10 times the previous one, so the bit length picks it directly
+        index = min(len(SIZE_UNITS) - 1, max(0, (int(size_bytes).bit_length() - 1) // 10))
+        divisor, unit = SIZE_UNITS[index]
+        return f"{size_bytes / divisor:.2f} {unit}"
 
 
 class DownloadItem(QWidget):
+    # Every row has the same layout, so its size hint is measured only once
+    _size_hint_cache = None
+    
     def __init__(self, download_id, url, save_path, num_connections=DEFAULT_CONNECTIONS, parent=None):
         super().__init__(parent)
         self.download_id = download_id
         self.url = url
+        # Parse the URL once; both the label and the download thread use it
+        self.file_name_str = os.path.basename(urlparse(url).path)
         self.save_path = save_path
         self.num_connections = num_connections
         self.download_thread = None
+        self.progress_style = None
         self.signals = DownloadSignals()
         
         self.initUI()
         self.connectSignals()
     
+    def sizeHint(self):
+        if DownloadItem._size_hint_cache is None:
+            DownloadItem._size_hint_cache = super().sizeHint()
+        return QSize(DownloadItem._size_hint_cache)
+    
     def initUI(self):
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 5, 0, 5)
@@ -347,7 +864,7 @@ class DownloadItem(QWidget):
         # Top row: filename and control buttons
         top_row = QHBoxLayout()
         
-        self.file_name = QLabel(os.path.basename(urlparse(self.url).path) or translations.get_text("download"))
+        self.file_name = QLabel(self.file_name_str or translations.get_text("download"))
         self.file_name.setFont(QFont("Arial", 11, QFont.Bold))
         self.file_name.setStyleSheet(f"color: {TEXT_COLOR};")
         top_row.addWidget(self.file_name)
@@ -521,15 +1038,35 @@ class DownloadItem(QWidget):
             self.save_path, 
             self.download_id, 
             self.signals,
-            self.num_connections
+            self.num_connections,
+            self.file_name_str or 'download'
         )
         self.download_thread.start()
+    
+    def poll_progress(self):
+        # Called from DownloadManager's refresh timer
+        if self.download_thread is None or not self.download_thread.is_alive():
+            return
+        
+        snapshot = self.download_thread.progress_snapshot()
+        if snapshot is not None:
+            self.update_progress(self.download_id, *snapshot)
         
     def update_progress(self, download_id, progress, speed, size_info):
         if download_id == self.download_id:
-            self.progress_bar.setValue(progress)
-            self.speed_label.setText(speed)
-            self.size_label.setText(size_info)
+            # Only touch widgets whose value changed; each set triggers a repaint
+            if progress != self.progress_bar.value():
+                self.progress_bar.setValue(progress)
+            if speed != self.speed_label.text():
+                self.speed_label.setText(speed)
+            if size_info != self.size_label.text():
+                self.size_label.setText(size_info)
+    
+    def set_progress_style(self, style):
+        # Restyling forces Qt to re-parse the sheet, so skip repeats
+        if style is not self.progress_style:
+            self.progress_style = style
+            self.progress_bar.setStyleSheet(style)
     
     def update_status(self, download_id, status):
         if download_id == self.download_id:
@@ -552,56 +1089,11 @@ class DownloadItem(QWidget):
             
             # Update button text and progress bar color based on status
             if status == "Paused":
-                self.progress_bar.setStyleSheet(f"""
-                    QProgressBar {{
-                        border: 1px solid #555555;
-                        border-radius: 3px;
-                        background-color: {DARK_TERTIARY};
-                        height: 15px;
-                        text-align: center;
-                        color: {TEXT_COLOR};
-                        font-weight: bold;
-                    }}
-                    
-                    QProgressBar::chunk {{
-                        background-color: #f39c12;
-                        border-radius: 2px;
-                    }}
-                """)
+                self.set_progress_style(PROGRESS_STYLE_PAUSED)
             elif status in ["Downloading...", "Resuming download..."]:
-                self.progress_bar.setStyleSheet(f"""
-                    QProgressBar {{
-                        border: 1px solid #555555;
-                        border-radius: 3px;
-                        background-color: {DARK_TERTIARY};
-                        height: 15px;
-                        text-align: center;
-                        color: {TEXT_COLOR};
-                        font-weight: bold;
-                    }}
-                    
-                    QProgressBar::chunk {{
-                        background-color: {PROGRESS_COLOR};
-                        border-radius: 2px;
-                    }}
-                """)
+                self.set_progress_style(PROGRESS_STYLE_DOWNLOADING)
             elif status == "Completed":
-                self.progress_bar.setStyleSheet(f"""
-                    QProgressBar {{
-                        border: 1px solid #555555;
-                        border-radius: 3px;
-                        background-color: {DARK_TERTIARY};
-                        height: 15px;
-                        text-align: center;
-                        color: {TEXT_COLOR};
-                        font-weight: bold;
-                    }}
-                    
-                    QProgressBar::chunk {{
-                        background-color: #3498db;
-                        border-radius: 2px;
-                    }}
-                """)
+                self.set_progress_style(PROGRESS_STYLE_COMPLETED)
             
             # Disable buttons when completed or cancelled
             if status in ["Completed", "Cancelled"]:
@@ -635,7 +1127,7 @@ class DownloadManager(QMainWindow):
         self.download_items = {}
         self.download_counter = 0
         self.num_connections = DEFAULT_CONNECTIONS
-        self.database = Database()  # Initialize database
+        self.database = Database.instance()  # Shared with the settings dialog
         self.notification_manager = NotificationManager(app_name="FlashGet")  # Initialize notification manager
         
         # Load language from database
@@ -647,12 +1139,18 @@ class DownloadManager(QMainWindow):
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         
-        # Variables for window dragging
-        self.dragging = False
-        self.offset = QPoint()
+        # Cursor position relative to the window's top-left while dragging, else None
+        self.drag_origin = None
         
+        self.active_theme = None
         self.initUI()
         self.setDarkTheme()
+        
+        # One timer pulls progress for every download row instead of each
+        # row scheduling its own
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self.refresh_download_rows)
+        self._refresh_timer.start(int(PROGRESS_INTERVAL * 1000))
     
     def initUI(self):
         self.setWindowTitle("FlashGet")
@@ -661,13 +1159,6 @@ class DownloadManager(QMainWindow):
         # Create main container with border and shadow
         self.main_container = QFrame(self)
         self.main_container.setObjectName("mainContainer")
-        self.main_container.setStyleSheet(f"""
-            #mainContainer {{
-                background-color: {DARK_PRIMARY};
-                border-radius: 10px;
-                border: 1px solid {DARK_TERTIARY};
-            }}
-        """)
         
         # Add shadow effect
         shadow = QGraphicsDropShadowEffect(self)
@@ -684,13 +1175,6 @@ class DownloadManager(QMainWindow):
         # Custom title bar
         title_bar = QFrame()
         title_bar.setObjectName("titleBar")
-        title_bar.setStyleSheet(f"""
-            #titleBar {{
-                background-color: {DARK_PRIMARY};
-                border-top-left-radius: 10px;
-                border-top-right-radius: 10px;
-            }}
-        """)
         title_bar.setFixedHeight(40)
         title_bar.mousePressEvent = self.title_bar_mouse_press
         title_bar.mouseMoveEvent = self.title_bar_mouse_move
@@ -700,11 +1184,7 @@ class DownloadManager(QMainWindow):
         title_layout.setContentsMargins(15, 0, 15, 0)
         
         app_title = QLabel("FlashGet")
-        app_title.setStyleSheet(f"""
-            color: {TEXT_COLOR};
-            font-size: 18px;
-            font-weight: bold;
-        """)
+        app_title.setObjectName("appTitle")
         title_layout.addWidget(app_title)
         
         title_layout.addStretch()
@@ -712,40 +1192,15 @@ class DownloadManager(QMainWindow):
         # Language selector in title bar
         self.language_selector = QComboBox()
         self.language_selector.setFixedWidth(120)
-        self.language_selector.setStyleSheet(f"""
-            QComboBox {{
-                background-color: {DARK_TERTIARY};
-                color: {TEXT_COLOR};
-                border: none;
-                border-radius: 5px;
-                padding: 5px;
-                min-height: 25px;
-            }}
-            QComboBox::drop-down {{
-                width: 20px;
-                border: none;
-                background: {DARK_TERTIARY};
-            }}
-            QComboBox QAbstractItemView {{
-                background-color: {DARK_SECONDARY};
-                color: {TEXT_COLOR};
-                selection-background-color: {ACCENT_COLOR};
-                selection-color: {TEXT_COLOR};
-                border: none;
-                outline: none;
-            }}
-        """)
+        self.language_selector.setObjectName("languageSelector")
         
-        # Fill language selector
-        for lang_code, lang_name in translations.get_available_languages():
+        # Fill language selector and select the current language by position
+        languages = translations.get_available_languages()
+        for lang_code, lang_name in languages:
             self.language_selector.addItem(lang_name, lang_code)
-            
-        # Set current language in UI
         current_lang = translations.current_language
-        for i in range(self.language_selector.count()):
-            if self.language_selector.itemData(i) == current_lang:
-                self.language_selector.setCurrentIndex(i)
-                break
+        self.language_selector.setCurrentIndex(
+            next((i for i, (code, _) in enumerate(languages) if code == current_lang), 0))
                 
         # Connect language change signal
         self.language_selector.currentIndexChanged.connect(self.change_language)
@@ -756,36 +1211,12 @@ class DownloadManager(QMainWindow):
         # Window control buttons
         btn_minimize = QPushButton("—")
         btn_minimize.setFixedSize(30, 30)
-        btn_minimize.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_PRIMARY};
-                color: {TEXT_COLOR};
-                border: none;
-                font-size: 16px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {DARK_TERTIARY};
-                border-radius: 15px;
-            }}
-        """)
+        btn_minimize.setObjectName("minimizeBtn")
         btn_minimize.clicked.connect(self.showMinimized)
         
         btn_close = QPushButton("×")
         btn_close.setFixedSize(30, 30)
-        btn_close.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_PRIMARY};
-                color: {TEXT_COLOR};
-                border: none;
-                font-size: 16px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ACCENT_COLOR};
-                border-radius: 15px;
-            }}
-        """)
+        btn_close.setObjectName("closeBtn")
         btn_close.clicked.connect(self.close)
         
         title_layout.addWidget(btn_minimize)
@@ -802,24 +1233,13 @@ class DownloadManager(QMainWindow):
         # App header with logo and title
         header_container = QFrame()
         header_container.setObjectName("headerContainer")
-        header_container.setStyleSheet(f"""
-            #headerContainer {{
-                background-color: {DARK_PRIMARY};
-                border-radius: 8px;
-                padding: 0px;
-            }}
-        """)
         header_container.setMaximumHeight(60)
         
         header_layout = QHBoxLayout(header_container)
         header_layout.setContentsMargins(15, 0, 15, 0)
         
         app_title = QLabel("FlashGet")
-        app_title.setStyleSheet(f"""
-            color: {TEXT_COLOR};
-            font-size: 18px;
-            font-weight: bold;
-        """)
+        app_title.setObjectName("appTitle")
         header_layout.addWidget(app_title)
         
         header_layout.addStretch()
@@ -830,73 +1250,14 @@ class DownloadManager(QMainWindow):
         toolbar_layout.setContentsMargins(0, 0, 0, 0)
         toolbar_layout.setSpacing(12)
         
-        # Settings button with icon
-        self.settings_btn = QPushButton(translations.get_text("settings"))
-        self.settings_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_TERTIARY};
-                color: {TEXT_COLOR};
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ACCENT_COLOR};
-            }}
-        """)
-        self.settings_btn.clicked.connect(self.open_settings)
-        toolbar_layout.addWidget(self.settings_btn)
-        
-        # History button with icon
-        self.history_btn = QPushButton(translations.get_text("history"))
-        self.history_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_TERTIARY};
-                color: {TEXT_COLOR};
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ACCENT_COLOR};
-            }}
-        """)
-        self.history_btn.clicked.connect(self.show_history)
-        toolbar_layout.addWidget(self.history_btn)
-        
-        # Cloud Services button
-        self.cloud_btn = QPushButton(translations.get_text("cloud_services"))
-        self.cloud_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_TERTIARY};
-                color: {TEXT_COLOR};
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ACCENT_COLOR};
-            }}
-        """)
-        self.cloud_btn.clicked.connect(self.open_cloud_services)
-        toolbar_layout.addWidget(self.cloud_btn)
-        
-        # Notifications button
-        self.notif_btn = QPushButton(translations.get_text("notifications"))
-        self.notif_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_TERTIARY};
-                color: {TEXT_COLOR};
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ACCENT_COLOR};
-            }}
-        """)
-        self.notif_btn.clicked.connect(self.manage_notifications)
-        toolbar_layout.addWidget(self.notif_btn)
+        # Toolbar buttons share the QPushButton#toolbarBtn rule in _APP_QSS
+        self._toolbar_btns = []
+        self.settings_btn = self._make_toolbar_button("settings", self.open_settings)
+        self.history_btn = self._make_toolbar_button("history", self.show_history)
+        self.cloud_btn = self._make_toolbar_button("cloud_services", self.open_cloud_services)
+        self.notif_btn = self._make_toolbar_button("notifications", self.manage_notifications)
+        for btn, _ in self._toolbar_btns:
+            toolbar_layout.addWidget(btn)
         
         header_layout.addWidget(toolbar_widget)
         
@@ -905,199 +1266,79 @@ class DownloadManager(QMainWindow):
         # URL input and buttons in an elegant card
         input_container = QFrame()
         input_container.setObjectName("inputContainer")
-        input_container.setStyleSheet(f"""
-            #inputContainer {{
-                background-color: {DARK_SECONDARY};
-                border-radius: 10px;
-                padding: 0px;
-            }}
-        """)
         
-        input_layout = QVBoxLayout(input_container)
+        # One grid for the whole card: label, field and extra control per row
+        input_layout = QGridLayout(input_container)
         input_layout.setContentsMargins(20, 20, 20, 20)
-        input_layout.setSpacing(15)
-        
-        # URL input with icon
-        url_container = QFrame()
-        url_container.setStyleSheet(f"""
-            background-color: {DARK_TERTIARY};
-            border-radius: 8px;
-        """)
-        url_layout = QHBoxLayout(url_container)
-        url_layout.setContentsMargins(12, 0, 12, 0)
+        input_layout.setHorizontalSpacing(12)
+        input_layout.setVerticalSpacing(15)
+        input_layout.setColumnStretch(1, 1)
         
+        # URL input
         url_label = QLabel(translations.get_text("url") + ":")
         url_label.setObjectName("url_label")
-        url_label.setStyleSheet(f"color: {TEXT_COLOR}; font-weight: bold;")
-        url_layout.addWidget(url_label)
+        input_layout.addWidget(url_label, 0, 0)
         
         self.url_input = QLineEdit()
         self.url_input.setPlaceholderText(translations.get_text("url_placeholder"))
-        self.url_input.setStyleSheet(f"""
-            QLineEdit {{
-                background-color: transparent;
-                color: {TEXT_COLOR};
-                border: none;
-                padding: 12px 5px;
-                font-size: 13px;
-            }}
-        """)
-        url_layout.addWidget(self.url_input, 1)
-        
-        input_layout.addWidget(url_container)
-        
-        # Save location with icon
-        save_container = QFrame()
-        save_container.setStyleSheet(f"""
-            background-color: {DARK_TERTIARY};
-            border-radius: 8px;
-        """)
-        save_layout = QHBoxLayout(save_container)
-        save_layout.setContentsMargins(12, 0, 12, 0)
+        self.url_input.setObjectName("urlInput")
+        input_layout.addWidget(self.url_input, 0, 1, 1, 2)
         
+        # Save location
         save_label = QLabel(translations.get_text("save_to") + ":")
         save_label.setObjectName("save_label")
-        save_label.setStyleSheet(f"color: {TEXT_COLOR}; font-weight: bold;")
-        save_layout.addWidget(save_label)
+        input_layout.addWidget(save_label, 1, 0)
         
         self.save_path_input = QLineEdit()
         self.save_path_input.setPlaceholderText(translations.get_text("save_to_placeholder"))
-        self.save_path_input.setStyleSheet(f"""
-            QLineEdit {{
-                background-color: transparent;
-                color: {TEXT_COLOR};
-                border: none;
-                padding: 12px 5px;
-                font-size: 13px;
-            }}
-        """)
+        self.save_path_input.setObjectName("savePathInput")
         # Default to Downloads folder
-        downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
-        self.save_path_input.setText(downloads_path)
-        save_layout.addWidget(self.save_path_input, 1)
+        self.save_path_input.setText(_DEFAULT_DOWNLOAD_DIR)
+        input_layout.addWidget(self.save_path_input, 1, 1)
         
         self.browse_btn = QPushButton(translations.get_text("browse"))
-        self.browse_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_PRIMARY};
-                color: {TEXT_COLOR};
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ACCENT_COLOR};
-            }}
-        """)
+        self.browse_btn.setObjectName("browseBtn")
         self.browse_btn.clicked.connect(self.select_save_location)
-        save_layout.addWidget(self.browse_btn)
-        
-        input_layout.addWidget(save_container)
+        input_layout.addWidget(self.browse_btn, 1, 2)
         
         # Connection settings with slider
-        conn_container = QFrame()
-        conn_container.setStyleSheet(f"""
-            background-color: {DARK_TERTIARY};
-            border-radius: 8px;
-            padding: 8px;
-        """)
-        conn_layout = QHBoxLayout(conn_container)
-        conn_layout.setContentsMargins(12, 6, 12, 6)
-        
         conn_label = QLabel(translations.get_text("connections") + ":")
         conn_label.setObjectName("conn_label")
-        conn_label.setStyleSheet(f"color: {TEXT_COLOR}; font-weight: bold;")
-        conn_layout.addWidget(conn_label)
+        input_layout.addWidget(conn_label, 2, 0)
         
         self.conn_slider = QSlider(Qt.Horizontal)
         self.conn_slider.setMinimum(1)
         self.conn_slider.setMaximum(MAX_CONNECTIONS)
         self.conn_slider.setValue(DEFAULT_CONNECTIONS)
-        self.conn_slider.setTickInterval(1)
-        self.conn_slider.setTickPosition(QSlider.TicksBelow)
-        self.conn_slider.setStyleSheet(f"""
-            QSlider::groove:horizontal {{
-                height: 8px;
-                background: {DARK_PRIMARY};
-                margin: 2px 0;
-                border-radius: 4px;
-            }}
-
-            QSlider::handle:horizontal {{
-                background: {ACCENT_COLOR};
-                border: none;
-                width: 18px;
-                height: 18px;
-                margin: -5px 0;
-                border-radius: 9px;
-            }}
-            
-            QSlider::handle:horizontal:hover {{
-                background: #ff5b76;
-            }}
-            
-            QSlider::sub-page:horizontal {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 0,
-                    stop: 0 {ACCENT_COLOR}, stop: 1 #ff5b76);
-                height: 8px;
-                border-radius: 4px;
-            }}
-        """)
+        self.conn_slider.setObjectName("connSlider")
         self.conn_slider.valueChanged.connect(self.update_connections)
-        conn_layout.addWidget(self.conn_slider, 1)
+        input_layout.addWidget(self.conn_slider, 2, 1)
         
         self.conn_value = QLabel(f"{DEFAULT_CONNECTIONS}")
-        self.conn_value.setStyleSheet(f"color: {TEXT_COLOR}; min-width: 25px; text-align: center;")
-        conn_layout.addWidget(self.conn_value)
+        self.conn_value.setObjectName("connValue")
+        input_layout.addWidget(self.conn_value, 2, 2)
         
-        input_layout.addWidget(conn_container)
+        for row in range(3):
+            input_layout.setRowMinimumHeight(row, 44)
         
         # Download button - centered and prominent
-        btn_container = QFrame()
-        btn_container.setStyleSheet("background-color: transparent;")
-        btn_layout = QHBoxLayout(btn_container)
-        btn_layout.setContentsMargins(0, 10, 0, 10)
-        
-        btn_layout.addStretch()
-        
         self.download_btn = QPushButton("شروع دانلود")
         self.download_btn.setMinimumWidth(150)
         self.download_btn.setMinimumHeight(45)
-        self.download_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {ACCENT_COLOR};
-                color: white;
-                border-radius: 8px;
-                padding: 12px 20px;
-                font-weight: bold;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: #ff5b76;
-            }}
-        """)
+        self.download_btn.setObjectName("downloadBtn")
         self.download_btn.clicked.connect(self.add_download)
-        btn_layout.addWidget(self.download_btn)
-        
-        btn_layout.addStretch()
-        
-        input_layout.addWidget(btn_container)
+        input_layout.addWidget(self.download_btn, 3, 0, 1, 3, Qt.AlignHCenter)
         
         content_layout.addWidget(input_container)
         
         # Downloads section header
         downloads_header_container = QFrame()
-        downloads_header_container.setStyleSheet("background-color: transparent;")
+        downloads_header_container.setObjectName("downloadsHeaderContainer")
         downloads_header_layout = QHBoxLayout(downloads_header_container)
         downloads_header_layout.setContentsMargins(5, 5, 5, 5)
         
         downloads_header = QLabel(translations.get_text("active_downloads"))
         downloads_header.setObjectName("downloads_header")
-        downloads_header.setStyleSheet(f"""
-            color: {TEXT_COLOR}; 
-            font-size: 16px; 
-            font-weight: bold;
-        """)
         downloads_header_layout.addWidget(downloads_header)
         
         downloads_header_layout.addStretch()
@@ -1107,31 +1348,22 @@ class DownloadManager(QMainWindow):
         # Downloads list with better styling
         downloads_container = QFrame()
         downloads_container.setObjectName("downloadsContainer")
-        downloads_container.setStyleSheet(f"""
-            #downloadsContainer {{
-                background-color: {DARK_SECONDARY};
-                border-radius: 10px;
-            }}
-        """)
         downloads_layout = QVBoxLayout(downloads_container)
         downloads_layout.setContentsMargins(15, 15, 15, 15)
         
         self.downloads_list = QListWidget()
-        self.downloads_list.setStyleSheet(f"""
-            QListWidget {{
-                background-color: transparent;
-                color: {TEXT_COLOR};
-                border: none;
-                outline: none;
-            }}
-            QListWidget::item {{
-                border: none;
-                padding: 4px;
-            }}
-        """)
+        self.downloads_list.setObjectName("downloadsList")
         self.downloads_list.setSelectionMode(QListWidget.NoSelection)
+        # Every row is a DownloadItem of the same height
+        self.downloads_list.setUniformItemSizes(True)
         self.downloads_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.downloads_list.customContextMenuRequested.connect(self.show_context_menu)
+        
+        # Context menu for download rows, styled by the QMenu rules in _APP_QSS
+        self.context_menu = QMenu(self)
+        self.context_download = None
+        open_folder_action = self.context_menu.addAction("Open Folder")
+        open_folder_action.triggered.connect(self.open_context_folder)
         self.downloads_list.setIconSize(QSize(32, 32))
         downloads_layout.addWidget(self.downloads_list)
         
@@ -1140,44 +1372,58 @@ class DownloadManager(QMainWindow):
         # Status bar at the bottom
         status_container = QFrame()
         status_container.setMaximumHeight(30)
-        status_container.setStyleSheet(f"""
-            background-color: {DARK_PRIMARY};
-            border-radius: 6px;
-        """)
+        status_container.setObjectName("statusContainer")
         status_layout = QHBoxLayout(status_container)
         status_layout.setContentsMargins(15, 0, 15, 0)
         
         self.status_label = QLabel("آماده برای دانلود")
-        self.status_label.setStyleSheet(f"color: {TEXT_COLOR};")
+        self.status_label.setObjectName("statusLabel")
         status_layout.addWidget(self.status_label)
         
         status_layout.addStretch()
         
         self.version_label = QLabel(f"نسخه: 1.0")
-        self.version_label.setStyleSheet(f"color: {TEXT_COLOR};")
+        self.version_label.setObjectName("versionLabel")
         status_layout.addWidget(self.version_label)
         
         content_layout.addWidget(status_container)
         
         container_layout.addWidget(content_widget)
         
+        # Widgets retranslated by update_ui_text: (widget, key, suffix)
+        self._translatable = [
+            (url_label, "url", ":"),
+            (save_label, "save_to", ":"),
+            (self.browse_btn, "browse", ""),
+            (conn_label, "connections", ":"),
+            (self.download_btn, "start_download", ""),
+            (downloads_header, "active_downloads", ""),
+            (self.status_label, "ready", ""),
+        ]
+        
         # Set the main container as the central widget
         self.setCentralWidget(self.main_container)
         
+    def _make_toolbar_button(self, key, slot):
+        btn = QPushButton(translations.get_text(key))
+        btn.setObjectName("toolbarBtn")
+        btn.clicked.connect(slot)
+        self._toolbar_btns.append((btn, key))
+        return btn
+    
     def title_bar_mouse_press(self, event):
         """Handle mouse press events for custom title bar"""
         if event.button() == Qt.LeftButton:
-            self.dragging = True
-            self.offset = event.pos()
+            self.drag_origin = event.globalPos() - self.frameGeometry().topLeft()
     
     def title_bar_mouse_move(self, event):
         """Handle mouse move events for custom title bar"""
-        if self.dragging and self.offset is not None:
-            self.move(self.mapToGlobal(event.pos() - self.offset))
+        if self.drag_origin is not None:
+            self.move(event.globalPos() - self.drag_origin)
     
     def title_bar_mouse_release(self, event):
         """Handle mouse release events for custom title bar"""
-        self.dragging = False
+        self.drag_origin = None
 
     def update_connections(self, value):
         self.num_connections = value
@@ -1205,27 +1451,9 @@ class DownloadManager(QMainWindow):
         
         app.setPalette(dark_palette)
         
-        # Additional stylesheet for the application
-        app.setStyleSheet(f"""
-            QToolTip {{ 
-                border: 1px solid #555555; 
-                background-color: {DARK_TERTIARY}; 
-                color: {TEXT_COLOR}; 
-                padding: 5px;
-                opacity: 200; 
-            }}
-            QMenu {{
-                background-color: {DARK_SECONDARY};
-                color: {TEXT_COLOR};
-                border: 1px solid #555555;
-            }}
-            QMenu::item {{
-                padding: 5px 30px 5px 20px;
-            }}
-            QMenu::item:selected {{
-                background-color: {ACCENT_COLOR};
-            }}
-        """)
+        # Main window styles and the shared tooltip/menu rules, parsed once
+        app.setStyleSheet(_APP_QSS)
+        self.active_theme = 'dark'
     
     def select_save_location(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Save Location")
@@ -1244,12 +1472,7 @@ class DownloadManager(QMainWindow):
             QMessageBox.warning(self, "Error", "Please select a valid save location")
             return
         
-        try:
-            # Test if URL is valid
-            parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
-                raise ValueError("Invalid URL format")
-        except Exception:
+        if not _URL_RE.match(url):
             QMessageBox.warning(self, "Error", "Please enter a valid URL")
             return
         
@@ -1277,46 +1500,47 @@ class DownloadManager(QMainWindow):
         # Clear URL input
         self.url_input.clear()
     
+    def refresh_download_rows(self):
+        if self.isMinimized() or not self.isVisible():
+            return
+        
+        # Rows scrolled out of view catch up on the next tick they are visible
+        viewport_rect = self.downloads_list.viewport().rect()
+        for download_data in self.download_items.values():
+            if self._is_row_visible(download_data["list_item"], viewport_rect):
+                download_data["widget"].poll_progress()
+    
+    def _is_row_visible(self, list_item, viewport_rect):
+        return self.downloads_list.visualItemRect(list_item).intersects(viewport_rect)
+    
     def show_context_menu(self, position):
         item = self.downloads_list.itemAt(position)
         if not item:
             return
             
-        download_widget = self.downloads_list.itemWidget(item)
-        
-        menu = QMenu()
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {DARK_SECONDARY};
-                color: {TEXT_COLOR};
-                border: 1px solid #555555;
-            }}
-            QMenu::item {{
-                padding: 5px 30px 5px 20px;
-            }}
-            QMenu::item:selected {{
-                background-color: {ACCENT_COLOR};
-            }}
-        """)
-        
-        open_folder_action = menu.addAction("Open Folder")
-        open_folder_action.triggered.connect(
-            lambda: os.startfile(download_widget.save_path))
-        
-        action = menu.exec_(self.downloads_list.mapToGlobal(position))
+        # The menu is built once in initUI; only its target changes per click
+        self.context_download = self.downloads_list.itemWidget(item)
+        self.context_menu.exec_(self.downloads_list.mapToGlobal(position))
+    
+    def open_context_folder(self):
+        if self.context_download is not None:
+            os.startfile(self.context_download.save_path)
 
     # Add methods for handling toolbar buttons
     def open_settings(self):
         from settings_dialog import SettingsDialog
-        settings_dialog = SettingsDialog(self)
+        settings_dialog = SettingsDialog.shared(self)
         if settings_dialog.exec_():
+            # The dialog saves in the background; wait for it before reading back
+            settings_dialog.database.flush()
+            
             # Reload settings if needed
             self.num_connections = self.database.get_setting('default_connections', DEFAULT_CONNECTIONS)
             self.conn_slider.setValue(self.num_connections)
             
             # Update UI theme if changed
             theme = self.database.get_setting('theme', 'dark')
-            if theme == 'dark':
+            if theme == 'dark' and theme != self.active_theme:
                 self.setDarkTheme()
                 
             # Update language if needed
@@ -1325,28 +1549,35 @@ class DownloadManager(QMainWindow):
                 translations.set_language(lang)
                 self.update_ui_text()
                 
-                # Update language selector
-                for i in range(self.language_selector.count()):
-                    if self.language_selector.itemData(i) == lang:
-                        self.language_selector.setCurrentIndex(i)
-                        break
+                # Update language selector without re-running change_language
+                self.language_selector.blockSignals(True)
+                self.language_selector.setCurrentIndex(max(0, self.language_selector.findData(lang)))
+                self.language_selector.blockSignals(False)
     
     def show_history(self):
-        downloads = self.database.get_download_history(limit=50)
+        import utils
+        downloads = self.database.get_download_history(
+            limit=50, fields=('file_name', 'file_size', 'status', 'start_time'))
         if not downloads:
             QMessageBox.information(self, "Download History", "No download history found.")
             return
             
-        history_text = "Download History:\n\n"
+        # Bind the per-row helpers once rather than on every iteration
+        strftime = time.strftime
+        localtime = time.localtime
+        format_size = utils.format_size
+        
+        lines = ["Download History:", ""]
         for download in downloads:
             status = download.get('status', 'Unknown')
             filename = download.get('file_name', 'Unknown')
-            size = utils.format_size(download.get('file_size', 0)) if download.get('file_size') else 'Unknown'
-            date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(download.get('start_time', 0)))
+            file_size = download.get('file_size')
+            size = format_size(file_size) if file_size else 'Unknown'
+            date = strftime('%Y-%m-%d %H:%M:%S', localtime(download.get('start_time', 0)))
             
-            history_text += f"{filename} - {size} - {status} - {date}\n"
+            lines.append(f"{filename} - {size} - {status} - {date}")
             
-        QMessageBox.information(self, "Download History", history_text)
+        QMessageBox.information(self, "Download History", "\n".join(lines))
     
     def open_cloud_services(self):
         QMessageBox.information(self, "Cloud Services", "Cloud Services functionality will be implemented.")
@@ -1370,40 +1601,14 @@ class DownloadManager(QMainWindow):
     
     def update_ui_text(self):
         """Update all UI elements with translated text"""
-        # Update toolbar buttons
-        self.settings_btn.setText(translations.get_text("settings"))
-        self.history_btn.setText(translations.get_text("history"))
-        self.cloud_btn.setText(translations.get_text("cloud_services"))
-        self.notif_btn.setText(translations.get_text("notifications"))
-        
-        # URL input area
-        url_label = self.findChild(QLabel, "url_label")
-        if url_label:
-            url_label.setText(translations.get_text("url") + ":")
-        self.url_input.setPlaceholderText(translations.get_text("url_placeholder"))
+        for btn, key in self._toolbar_btns:
+            btn.setText(translations.get_text(key))
+        for widget, key, suffix in self._translatable:
+            widget.setText(translations.get_text(key) + suffix)
         
-        # Save location area
-        save_label = self.findChild(QLabel, "save_label")
-        if save_label:
-            save_label.setText(translations.get_text("save_to") + ":")
+        # Placeholders and formatted labels
+        self.url_input.setPlaceholderText(translations.get_text("url_placeholder"))
         self.save_path_input.setPlaceholderText(translations.get_text("save_to_placeholder"))
-        self.browse_btn.setText(translations.get_text("browse"))
-        
-        # Connection slider area
-        conn_label = self.findChild(QLabel, "conn_label")
-        if conn_label:
-            conn_label.setText(translations.get_text("connections") + ":")
-        
-        # Download button
-        self.download_btn.setText(translations.get_text("start_download"))
-        
-        # Downloads header
-        downloads_header = self.findChild(QLabel, "downloads_header")
-        if downloads_header:
-            downloads_header.setText(translations.get_text("active_downloads"))
-        
-        # Status bar
-        self.status_label.setText(translations.get_text("ready"))
         self.version_label.setText(f"{translations.get_text('version')}: 1.0")
         
         # We need to update dynamically created download items too
@@ -2,16 +2,8 @@ import sys
 from PyQt5.QtWidgets import QApplication
 from settings_dialog import SettingsDialog, DARK_TERTIARY, TEXT_COLOR, DARK_SECONDARY, ACCENT_COLOR
 
-app = QApplication(sys.argv)
-
-# Crear una instancia de SettingsDialog
-dialog = SettingsDialog()
-
-# Modificar el tamaño
-dialog.resize(600, 450)
-
-# Modificar el estilo de las pestañas
-new_style = f"""
+# Estilo de las pestañas, formateado una sola vez
+TAB_STYLE = f"""
     QTabBar::tab {{
         background-color: {DARK_TERTIARY};
         color: {TEXT_COLOR};
@@ -30,13 +22,27 @@ new_style = f"""
     }}
 """
 
-# Aplicar el estilo específico a las pestañas
-dialog.tab_widget.setStyleSheet(new_style)
 
-# Asegurarse de que las pestañas estén centradas
-dialog.tab_widget.tabBar().setExpanding(True)
+def main():
+    app = QApplication(sys.argv)
+
+    # Crear una instancia de SettingsDialog
+    dialog = SettingsDialog()
+
+    # Modificar el tamaño
+    dialog.resize(600, 450)
+
+    # Aplicar el estilo específico a las pestañas
+    dialog.tab_widget.setStyleSheet(TAB_STYLE)
+
+    # Asegurarse de que las pestañas estén centradas
+    dialog.tab_widget.tabBar().setExpanding(True)
+
+    # Mostrar el diálogo en el único bucle de eventos; la aplicación termina
+    # al cerrarlo porque no queda ninguna otra ventana
+    dialog.show()
+    sys.exit(app.exec_())
 
-# Mostrar el diálogo
-dialog.exec_()
 
-sys.exit(app.exec_()) 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -2,28 +2,172 @@ import os
 import time
 import platform
 import threading
+import queue
 import subprocess
 import tempfile
 import json
+import socket
+import struct
+import itertools
+import concurrent.futures
+from collections import OrderedDict
+from urllib.parse import unquote
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer
 from PyQt5.QtWidgets import QSystemTrayIcon, QMenu, QAction
 from PyQt5.QtGui import QIcon
 
-# Attempt to import platform-specific notification libraries
-try:
-    if platform.system() == 'Windows':
-        from win10toast import ToastNotifier
-    elif platform.system() == 'Darwin':  # macOS
-        import objc
-        import Foundation
-        import AppKit
-    else:  # Linux
-        import dbus
-except ImportError:
-    pass  # We'll handle fallbacks later
+# Platform-specific notification libraries (win10toast, PyObjC, dbus-python)
+# are imported by the matching _init_*_notifications method, so only the
+# current platform's library is ever loaded
+
+# D-Bus signature of org.freedesktop.Notifications.Notify
+NOTIFY_SIGNATURE = 'susssasa{sv}i'
+# Minimum seconds between email/Telegram sends
+REMOTE_SEND_INTERVAL = 1.0
+# Oldest notifications are forgotten beyond this many
+MAX_ACTIVE_NOTIFICATIONS = 256
+# Identical notifications within this many seconds are sent only once
+DUPLICATE_WINDOW = 5.0
+RECENT_NOTIFICATIONS_SIZE = 128
+# With coalesce=True, a queued item with the same title updated this recently
+# absorbs the new message
+COALESCE_WINDOW = 0.5
+# Seconds before a Telegram request is abandoned
+TELEGRAM_TIMEOUT = 10
+
+# Minimal D-Bus wire protocol, used when dbus-python is not installed
+DBUS_NO_REPLY_EXPECTED = 0x1
+
+def _dbus_pad(buf, alignment):
+    """Pad a marshalled D-Bus message to the given alignment"""
+    buf.extend(b'\0' * (-len(buf) % alignment))
+
+def _dbus_string(buf, value):
+    """Marshal a D-Bus string or object path"""
+    data = value.encode('utf-8')
+    _dbus_pad(buf, 4)
+    buf.extend(struct.pack('<I', len(data)))
+    buf.extend(data)
+    buf.append(0)
+
+def _dbus_header_fields(fields):
+    """Marshal a method call's header fields, padded so the body can follow"""
+    # Alignment counts from the start of the message, so marshal behind a
+    # stand-in for the 12-byte fixed header and strip it afterwards
+    buf = bytearray(16)
+    for code, sig, value in fields:
+        _dbus_pad(buf, 8)
+        buf.append(code)
+        buf.extend(bytes([len(sig)]) + sig.encode('ascii') + b'\0')
+        if sig == 'g':
+            buf.extend(bytes([len(value)]) + value.encode('ascii') + b'\0')
+        else:
+            _dbus_string(buf, value)
+    struct.pack_into('<I', buf, 12, len(buf) - 16)
+    _dbus_pad(buf, 8)
+    return bytes(buf[12:])
+
+# Header fields never change for these calls, so they are marshalled once
+_HELLO_HEADER_FIELDS = _dbus_header_fields([
+    (1, 'o', '/org/freedesktop/DBus'),
+    (2, 's', 'org.freedesktop.DBus'),
+    (3, 's', 'Hello'),
+    (6, 's', 'org.freedesktop.DBus'),
+])
+_NOTIFY_HEADER_FIELDS = _dbus_header_fields([
+    (1, 'o', '/org/freedesktop/Notifications'),
+    (2, 's', 'org.freedesktop.Notifications'),
+    (3, 's', 'Notify'),
+    (6, 's', 'org.freedesktop.Notifications'),
+    (8, 'g', NOTIFY_SIGNATURE),
+])
+
+class RawSessionBus:
+    """Fire-and-forget Notify calls written straight to the session bus socket"""
+
+    def __init__(self, address):
+        self._serial = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(self._parse_address(address))
+            self._authenticate()
+            # The bus drops every other call until the connection says Hello
+            self._send(_HELLO_HEADER_FIELDS, b'')
+        except Exception:
+            self._sock.close()
+            raise
+
+    @staticmethod
+    def _parse_address(address):
+        """Return the socket address of the first unix: entry in a bus address"""
+        for entry in (address or '').split(';'):
+            transport, _, params = entry.partition(':')
+            if transport != 'unix':
+                continue
+            options = dict(param.partition('=')[::2] for param in params.split(','))
+            if 'path' in options:
+                return unquote(options['path'])
+            if 'abstract' in options:
+                return '\0' + unquote(options['abstract'])
+        raise ValueError(f"No usable unix socket in D-Bus address: {address!r}")
+
+    def _authenticate(self):
+        """Perform the one-time SASL EXTERNAL handshake"""
+        uid = str(os.getuid()).encode('ascii').hex().encode('ascii')
+        self._sock.sendall(b'\0AUTH EXTERNAL ' + uid + b'\r\n')
+        reply = b''
+        while not reply.endswith(b'\r\n'):
+            chunk = self._sock.recv(256)
+            if not chunk:
+                break
+            reply += chunk
+        if not reply.startswith(b'OK '):
+            raise OSError(f"D-Bus authentication failed: {reply!r}")
+        self._sock.sendall(b'BEGIN\r\n')
+
+    def _send(self, header_fields, body):
+        """Write one method call that expects no reply"""
+        with self._lock:
+            header = struct.pack('<cBBBII', b'l', 1, DBUS_NO_REPLY_EXPECTED, 1,
+                                 len(body), next(self._serial))
+            self._sock.sendall(header + header_fields + body)
+
+    def notify(self, app_name, icon, title, message, actions, timeout_ms):
+        """Call org.freedesktop.Notifications.Notify"""
+        body = bytearray()
+        _dbus_string(body, app_name)
+        _dbus_pad(body, 4)
+        body.extend(struct.pack('<I', 0))  # ID (0 = create new)
+        _dbus_string(body, icon)
+        _dbus_string(body, title)
+        _dbus_string(body, message)
+
+        # Actions: array length, then the strings themselves
+        _dbus_pad(body, 4)
+        length_at = len(body)
+        body.extend(b'\0\0\0\0')
+        for action in actions:
+            _dbus_string(body, action)
+        struct.pack_into('<I', body, length_at, len(body) - length_at - 4)
+
+        # Hints: an empty a{sv} still pads to its 8-byte entry alignment
+        _dbus_pad(body, 4)
+        body.extend(b'\0\0\0\0')
+        _dbus_pad(body, 8)
+
+        body.extend(struct.pack('<i', int(timeout_ms)))
+        self._send(_NOTIFY_HEADER_FIELDS, bytes(body))
+
+    def close(self):
+        """Close the bus socket"""
+        self._sock.close()
 
 class Notification:
     """Simple notification data class"""
+    __slots__ = ('title', 'message', 'icon', 'timeout', 'actions', 'timestamp', 'id')
+    _ids = itertools.count(1)  # Process-wide sequence; next() is atomic under the GIL
+    
     def __init__(self, title, message, icon=None, timeout=5, actions=None):
         self.title = title
         self.message = message
@@ -31,10 +175,12 @@ class Notification:
         self.timeout = timeout  # in seconds
         self.actions = actions or []  # List of (action_name, callback) tuples
         self.timestamp = time.time()
-        self.id = f"notification_{int(self.timestamp)}_{id(self)}"
+        self.id = f"notification_{next(self._ids)}"
 
 class NotificationAction:
     """Action that can be attached to a notification"""
+    __slots__ = ('name', 'callback')
+    
     def __init__(self, name, callback):
         self.name = name
         self.callback = callback
@@ -52,51 +198,114 @@ class NotificationSystem:
         self.app_name = app_name
         self.app_icon = app_icon
         self.signals = NotificationSignals()
-        self.active_notifications = {}
+        self.active_notifications = OrderedDict()  # Insertion order == age
+        self._latest_id = None
         self.system = platform.system()
         self.enabled = True
         self.sound_enabled = True
         
-        # Initialize platform-specific notification systems
-        self._init_notification_system()
+        # Resolve the sound once; None when the file is missing
+        sound_file = os.path.join(os.path.dirname(__file__), 'sounds', 'notification.wav')
+        self._sound_file = sound_file if os.path.exists(sound_file) else None
+        self._sound_process = None
+        self._icon_cache = {}  # icon path -> QIcon, decoded once
+        
+        # Platform-specific notification systems are set up by the first
+        # notify(), so a disabled notifier never loads them
+        self.has_native = None
     
     def _init_notification_system(self):
         """Initialize the appropriate notification system for the platform"""
+        # The platform never changes, so the per-notification handlers are
+        # bound here once instead of branching on self.system every time
         if self.system == 'Windows':
             self._init_windows_notifications()
+            self._native_send = self._send_windows_notification
+            self._play_sound_impl = self._play_windows_sound
         elif self.system == 'Darwin':  # macOS
             self._init_macos_notifications()
+            self._native_send = self._send_macos_notification
+            self._play_sound_impl = self._play_subprocess_sound
         else:  # Linux and others
+            # Bound first: without dbus-python the init swaps in the raw bus sender
+            self._native_send = self._send_linux_notification
+            self._play_sound_impl = self._play_subprocess_sound
             self._init_linux_notifications()
     
     def _init_windows_notifications(self):
         """Initialize Windows notification system"""
         try:
+            from win10toast import ToastNotifier
             self.win_notifier = ToastNotifier()
             self.has_native = True
         except (ImportError, NameError):
             self.has_native = False
+            return
+        
+        # win10toast drops a threaded toast while another is showing, so
+        # toasts go through one worker and are shown one after another
+        self._toast_queue = queue.SimpleQueue()
+        threading.Thread(target=self._process_toast_queue, daemon=True).start()
+    
+    def _process_toast_queue(self):
+        """Show queued Windows toasts one at a time"""
+        while True:
+            notification, icon_path = self._toast_queue.get()
+            try:
+                # Blocks for the toast's duration, which paces the queue
+                self.win_notifier.show_toast(
+                    title=notification.title,
+                    msg=notification.message,
+                    icon_path=icon_path,
+                    duration=notification.timeout,
+                    threaded=False
+                )
+            except Exception as e:
+                print(f"Error sending Windows notification: {e}")
     
     def _init_macos_notifications(self):
         """Initialize macOS notification system"""
         try:
+            import objc
+            import Foundation
+            import AppKit  # noqa: F401  (loads the AppKit bundle for notification center)
+            
+            self._NSDate = Foundation.NSDate
+            self._NSUserNotification = objc.lookUpClass('NSUserNotification')
+            self._NSUserNotificationCenter = objc.lookUpClass('NSUserNotificationCenter')
             self.has_native = True
-        except (ImportError, NameError):
+        except Exception:
             self.has_native = False
     
     def _init_linux_notifications(self):
         """Initialize Linux notification system"""
         try:
+            import dbus
             self.session_bus = dbus.SessionBus()
+            # The Notify signature is fixed by the spec, so skip introspecting
+            # the server and resolve the method proxy once
             self.notify_interface = dbus.Interface(
                 self.session_bus.get_object(
                     'org.freedesktop.Notifications',
-                    '/org/freedesktop/Notifications'
+                    '/org/freedesktop/Notifications',
+                    introspect=False
                 ),
                 'org.freedesktop.Notifications'
             )
+            self._notify_method = self.notify_interface.get_dbus_method('Notify')
+            self.has_native = True
+        except ImportError:
+            self._init_raw_dbus_notifications()
+        except (NameError, Exception):
+            self.has_native = False
+    
+    def _init_raw_dbus_notifications(self):
+        """Talk to the session bus socket directly when dbus-python is missing"""
+        try:
+            self.raw_bus = RawSessionBus(os.environ.get('DBUS_SESSION_BUS_ADDRESS'))
+            self._native_send = self._send_raw_dbus_notification
             self.has_native = True
-        except (ImportError, NameError, Exception):
+        except (OSError, ValueError):
             self.has_native = False
     
     def set_enabled(self, enabled):
@@ -112,8 +321,14 @@ class NotificationSystem:
         if not self.enabled:
             return None
         
+        if self.has_native is None:
+            self._init_notification_system()
+        
         notification = Notification(title, message, icon, timeout, actions)
         self.active_notifications[notification.id] = notification
+        self._latest_id = notification.id
+        if len(self.active_notifications) > MAX_ACTIVE_NOTIFICATIONS:
+            self._prune_notifications()
         
         if self.has_native:
             self._send_native_notification(notification)
@@ -127,48 +342,30 @@ class NotificationSystem:
     
     def _send_native_notification(self, notification):
         """Send notification using native APIs"""
-        if self.system == 'Windows':
-            self._send_windows_notification(notification)
-        elif self.system == 'Darwin':
-            self._send_macos_notification(notification)
-        else:
-            self._send_linux_notification(notification)
+        self._native_send(notification)
     
     def _send_windows_notification(self, notification):
         """Send Windows toast notification"""
         icon_path = notification.icon or self.app_icon
         
-        try:
-            # Windows 10 Toast Notifications
-            self.win_notifier.show_toast(
-                title=notification.title,
-                msg=notification.message,
-                icon_path=icon_path,
-                duration=notification.timeout,
-                threaded=True
-            )
-        except Exception as e:
-            print(f"Error sending Windows notification: {e}")
-            self._send_fallback_notification(notification)
+        # Windows 10 Toast Notifications, shown by _process_toast_queue
+        self._toast_queue.put((notification, icon_path))
     
     def _send_macos_notification(self, notification):
         """Send macOS notification center notification"""
         try:
             # Create and deliver notification using NSUserNotification
-            NSUserNotification = objc.lookUpClass('NSUserNotification')
-            NSUserNotificationCenter = objc.lookUpClass('NSUserNotificationCenter')
-            
-            notification_obj = NSUserNotification.alloc().init()
+            notification_obj = self._NSUserNotification.alloc().init()
             notification_obj.setTitle_(notification.title)
             notification_obj.setInformativeText_(notification.message)
             
             # Set the notification timeout
-            notification_obj.setDeliveryDate_(Foundation.NSDate.dateWithTimeInterval_sinceDate_(
-                notification.timeout, Foundation.NSDate.date()
+            notification_obj.setDeliveryDate_(self._NSDate.dateWithTimeInterval_sinceDate_(
+                notification.timeout, self._NSDate.date()
             ))
             
             # Deliver notification
-            NSUserNotificationCenter.defaultUserNotificationCenter().scheduleNotification_(notification_obj)
+            self._NSUserNotificationCenter.defaultUserNotificationCenter().scheduleNotification_(notification_obj)
         except Exception as e:
             print(f"Error sending macOS notification: {e}")
             self._send_fallback_notification(notification)
@@ -184,7 +381,9 @@ class NotificationSystem:
             for action in notification.actions:
                 actions_list.extend([action.name, action.name])
             
-            self.notify_interface.Notify(
+            # Fire and forget: waiting for the server's reply only told us the
+            # notification id, which nothing uses, and cost a bus round trip
+            self._notify_method(
                 self.app_name,  # App name
                 0,              # ID (0 = create new)
                 icon,           # Icon path
@@ -192,7 +391,28 @@ class NotificationSystem:
                 notification.message,  # Body
                 actions_list,   # Actions
                 hints,          # Hints
-                notification.timeout * 1000  # Timeout in ms
+                notification.timeout * 1000,  # Timeout in ms
+                signature=NOTIFY_SIGNATURE,
+                ignore_reply=True
+            )
+        except Exception as e:
+            print(f"Error sending Linux notification: {e}")
+            self._send_fallback_notification(notification)
+    
+    def _send_raw_dbus_notification(self, notification):
+        """Send Linux notification without dbus-python"""
+        try:
+            actions_list = []
+            for action in notification.actions:
+                actions_list.extend([action.name, action.name])
+            
+            self.raw_bus.notify(
+                self.app_name,
+                notification.icon or '',
+                notification.title,
+                notification.message,
+                actions_list,
+                notification.timeout * 1000
             )
         except Exception as e:
             print(f"Error sending Linux notification: {e}")
@@ -205,7 +425,10 @@ class NotificationSystem:
             print(f"Notification (fallback): {notification.title} - {notification.message}")
             return
         
-        icon = QIcon(notification.icon) if notification.icon else QIcon()
+        icon = self._icon_cache.get(notification.icon)
+        if icon is None:
+            icon = QIcon(notification.icon) if notification.icon else QIcon()
+            self._icon_cache[notification.icon] = icon
         self.tray_icon.showMessage(
             notification.title,
             notification.message,
@@ -218,24 +441,33 @@ class NotificationSystem:
         if not self.sound_enabled:
             return
         
-        sound_file = os.path.join(os.path.dirname(__file__), 'sounds', 'notification.wav')
-        
-        if not os.path.exists(sound_file):
+        sound_file = self._sound_file
+        if sound_file is None:
             return
         
         try:
-            if self.system == 'Windows':
-                import winsound
-                winsound.PlaySound(sound_file, winsound.SND_FILENAME | winsound.SND_ASYNC)
-            else:
-                # Use subprocess to play sound on other platforms
-                if self.system == 'Darwin':  # macOS
-                    subprocess.Popen(['afplay', sound_file])
-                else:  # Linux
-                    subprocess.Popen(['aplay', sound_file])
+            self._play_sound_impl(sound_file)
         except Exception as e:
             print(f"Error playing notification sound: {e}")
     
+    def _play_windows_sound(self, sound_file):
+        import winsound
+        winsound.PlaySound(sound_file, winsound.SND_FILENAME | winsound.SND_ASYNC)
+    
+    def _play_subprocess_sound(self, sound_file):
+        # A burst of notifications shares one chime instead of
+        # spawning a player per notification
+        if self._sound_process is not None and self._sound_process.poll() is None:
+            return
+        
+        # Use subprocess to play sound on other platforms
+        player = 'afplay' if self.system == 'Darwin' else 'aplay'
+        self._sound_process = subprocess.Popen(
+            [player, sound_file],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    
     def setup_tray_icon(self, tray_icon):
         """Set up system tray icon for fallback notifications"""
         self.tray_icon = tray_icon
@@ -245,26 +477,30 @@ class NotificationSystem:
     
     def _handle_tray_notification_clicked(self):
         """Handle click on tray notification"""
-        # Find the most recent notification
-        if not self.active_notifications:
-            return
-        
-        # Get most recent notification
-        latest_notification = max(
-            self.active_notifications.values(),
-            key=lambda n: n.timestamp
-        )
-        
-        self.signals.notification_clicked.emit(latest_notification.id)
+        if self._latest_id is not None:
+            self.signals.notification_clicked.emit(self._latest_id)
+    
+    def _prune_notifications(self):
+        """Forget expired notifications, oldest first, and enforce the size cap"""
+        now = time.time()
+        while len(self.active_notifications) > 1:
+            oldest = next(iter(self.active_notifications.values()))
+            expired = now - oldest.timestamp >= oldest.timeout * 2
+            if not expired and len(self.active_notifications) <= MAX_ACTIVE_NOTIFICATIONS:
+                break
+            self.active_notifications.popitem(last=False)
     
     def clear_notifications(self):
         """Clear all active notifications"""
         self.active_notifications.clear()
+        self._latest_id = None
     
     def remove_notification(self, notification_id):
         """Remove a notification from active list"""
         if notification_id in self.active_notifications:
             del self.active_notifications[notification_id]
+            if notification_id == self._latest_id:
+                self._latest_id = next(reversed(self.active_notifications), None)
 
 
 class EmailNotifier:
@@ -277,40 +513,96 @@ class EmailNotifier:
         self.password = password
         self.use_tls = use_tls
         self.enabled = False
+        # Logged-in SMTP connection kept between notifications
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+        self._header_template = None  # (to_email, encoded From/To/MIME headers)
     
     def set_enabled(self, enabled):
         """Enable or disable email notifications"""
         self.enabled = enabled
+        if not enabled:
+            self.close()
     
-    def send_notification(self, to_email, subject, message):
-        """Send email notification"""
-        if not self.enabled:
-            return False
+    def _ensure_connected(self):
+        """Return a live SMTP connection, reconnecting only if the old one died"""
+        import smtplib
+        
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop_connection()
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        if self.use_tls:
+            server.starttls()
         
+        server.login(self.username, self.password)
+        self._smtp = server
+        return server
+    
+    def _drop_connection(self):
         try:
-            import smtplib
+            self._smtp.close()
+        except Exception:
+            pass
+        self._smtp = None
+    
+    def close(self):
+        """Log out of the SMTP server if connected"""
+        with self._smtp_lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except Exception:
+                    pass
+                self._drop_connection()
+    
+    def _build_message(self, to_email, subject, message):
+        """Encode a plain-text email, reusing the headers rendered for this recipient"""
+        import base64
+        
+        if self._header_template is None or self._header_template[0] != to_email:
+            from email import policy
             from email.mime.text import MIMEText
-            from email.mime.multipart import MIMEMultipart
-            
-            msg = MIMEMultipart()
-            msg['From'] = self.username
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(message, 'plain'))
             
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            if self.use_tls:
-                server.starttls()
-            
-            server.login(self.username, self.password)
-            server.send_message(msg)
-            server.quit()
-            
-            return True
-        except Exception as e:
-            print(f"Error sending email notification: {e}")
+            template = MIMEText('', 'plain', 'utf-8')
+            template['From'] = self.username
+            template['To'] = to_email
+            headers = template.as_bytes(policy=policy.SMTP).split(b'\r\n\r\n', 1)[0]
+            self._header_template = (to_email, headers)
+        
+        if subject.isascii():
+            subject_bytes = subject.encode('ascii')
+        else:
+            from email.header import Header
+            # Long subjects are folded; use CRLF like the rest of the headers
+            subject_bytes = Header(subject, 'utf-8', header_name='Subject').encode(
+                linesep='\r\n').encode('ascii')
+        
+        body = base64.encodebytes(message.encode('utf-8')).replace(b'\n', b'\r\n')
+        return self._header_template[1] + b'\r\nSubject: ' + subject_bytes + b'\r\n\r\n' + body
+    
+    def send_notification(self, to_email, subject, message):
+        """Send email notification"""
+        if not self.enabled:
             return False
+        
+        with self._smtp_lock:
+            try:
+                self._ensure_connected().sendmail(
+                    self.username, [to_email], self._build_message(to_email, subject, message))
+                
+                return True
+            except Exception as e:
+                print(f"Error sending email notification: {e}")
+                # Start from a fresh connection next time
+                if self._smtp is not None:
+                    self._drop_connection()
+                return False
 
 
 class TelegramNotifier:
@@ -320,6 +612,7 @@ class TelegramNotifier:
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.enabled = False
+        self._session = None  # Keeps the TLS connection to the Bot API alive
     
     def set_enabled(self, enabled):
         """Enable or disable Telegram notifications"""
@@ -331,7 +624,12 @@ class TelegramNotifier:
             return False
         
         try:
-            import requests
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                self._session = requests.Session()
+                self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            
             url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
             data = {
                 "chat_id": self.chat_id,
@@ -339,7 +637,7 @@ class TelegramNotifier:
                 "parse_mode": "Markdown"
             }
             
-            response = requests.post(url, data=data)
+            response = self._session.post(url, data=data, timeout=TELEGRAM_TIMEOUT)
             return response.status_code == 200
         except Exception as e:
             print(f"Error sending Telegram notification: {e}")
@@ -356,10 +654,18 @@ class NotificationManager:
         self.email_notifier = None
         self.telegram_notifier = None
         
-        # Notification queue for rate limiting
-        self.notification_queue = []
-        self.queue_lock = threading.Lock()
-        self.queue_processing = False
+        # Notification queue for rate limiting, drained by one long-lived worker
+        self.notification_queue = queue.SimpleQueue()
+        self.queue_lock = threading.Lock()  # Guards _recent_notifications and _pending
+        # (title, channels) -> queued item the worker has not picked up yet
+        self._pending = {}
+        self._next_remote_send = 0.0  # time.monotonic() deadline for the next remote send
+        # (title, message, channels) -> (time.monotonic(), notification_id), oldest first
+        self._recent_notifications = OrderedDict()
+        # Email and Telegram for the same item are sent side by side
+        self._remote_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="notify-remote")
+        threading.Thread(target=self._process_notification_queue, daemon=True).start()
     
     def setup_email_notifier(self, smtp_server, smtp_port, username, password, use_tls=True):
         """Set up email notifier"""
@@ -388,26 +694,26 @@ class NotificationManager:
         """Enable or disable notification sounds"""
         self.system_notifier.set_sound_enabled(enabled)
     
-    def notify(self, title, message, channels=None, icon=None, timeout=5, actions=None):
-        """Send notification to specified channels"""
+    def notify(self, title, message, channels=None, icon=None, timeout=5, actions=None, coalesce=False):
+        """Send notification to specified channels
+        
+        Pass coalesce=True for progress-style updates: a newer message then
+        replaces one with the same title that is still waiting to be sent.
+        """
         notification_id = None
         channels = channels or ['system']
         
-        # Add to notification queue
+        # Retry paths can report the same event several times in a row
+        key = (title, message, tuple(channels))
+        now = time.monotonic()
         with self.queue_lock:
-            self.notification_queue.append({
-                'title': title,
-                'message': message,
-                'channels': channels,
-                'icon': icon,
-                'timeout': timeout,
-                'actions': actions,
-                'timestamp': time.time()
-            })
-            
-            if not self.queue_processing:
-                self.queue_processing = True
-                threading.Thread(target=self._process_notification_queue, daemon=True).start()
+            recent = self._recent_notifications.get(key)
+            if recent is not None and now - recent[0] < DUPLICATE_WINDOW:
+                return recent[1]
+        
+        # Queue the remote channels; the system one is sent right here
+        if any(channel != 'system' for channel in channels):
+            self._enqueue_remote(title, message, channels, icon, timeout, actions, now, coalesce)
         
         # Always send system notification immediately
         if 'system' in channels:
@@ -415,36 +721,88 @@ class NotificationManager:
                 title, message, icon, timeout, actions
             )
         
+        with self.queue_lock:
+            self._recent_notifications[key] = (now, notification_id)
+            self._recent_notifications.move_to_end(key)
+            if len(self._recent_notifications) > RECENT_NOTIFICATIONS_SIZE:
+                self._recent_notifications.popitem(last=False)
+        
         return notification_id
     
+    def _enqueue_remote(self, title, message, channels, icon, timeout, actions, now, coalesce):
+        """Queue an item, or with coalesce fold it into a still-waiting one with the same title"""
+        # Ordinary notifications are never merged, so distinct events all arrive
+        pending_key = (title, tuple(channels)) if coalesce else None
+        with self.queue_lock:
+            pending = self._pending.get(pending_key) if coalesce else None
+            if pending is not None and now - pending['updated'] < COALESCE_WINDOW:
+                # Progress-style bursts: only the newest message is worth sending
+                pending['message'] = message
+                pending['updated'] = now
+                return
+            
+            item = {
+                'title': title,
+                'message': message,
+                'channels': channels,
+                'icon': icon,
+                'timeout': timeout,
+                'actions': actions,
+                'timestamp': time.time(),
+                'updated': now,
+                'key': pending_key
+            }
+            if coalesce:
+                self._pending[pending_key] = item
+        self.notification_queue.put(item)
+    
     def _process_notification_queue(self):
         """Process notification queue with rate limiting"""
         while True:
+            notification = self.notification_queue.get()
             with self.queue_lock:
-                if not self.notification_queue:
-                    self.queue_processing = False
-                    break
-                
-                notification = self.notification_queue.pop(0)
-            
-            # Process other channels with rate limiting
-            channels = notification['channels']
-            
-            if 'email' in channels and self.email_notifier and self.email_notifier.enabled:
-                if hasattr(self.email_notifier, 'to_email') and self.email_notifier.to_email:
-                    self.email_notifier.send_notification(
-                        self.email_notifier.to_email,
-                        notification['title'],
-                        notification['message']
-                    )
-            
-            if 'telegram' in channels and self.telegram_notifier and self.telegram_notifier.enabled:
-                self.telegram_notifier.send_notification(
-                    f"*{notification['title']}*\n{notification['message']}"
-                )
-            
-            # Rate limiting delay
-            time.sleep(1)
+                # Once taken, later notifications must queue a new item
+                if self._pending.get(notification['key']) is notification:
+                    del self._pending[notification['key']]
+            try:
+                self._send_remote_notification(notification)
+            except Exception as e:
+                # Never let one bad item stop the worker
+                print(f"Error processing queued notification: {e}")
+    
+    def _send_remote_notification(self, notification):
+        """Send one queued notification to the email/Telegram channels"""
+        channels = notification['channels']
+        send_email = ('email' in channels and self.email_notifier and self.email_notifier.enabled
+                      and getattr(self.email_notifier, 'to_email', None))
+        send_telegram = 'telegram' in channels and self.telegram_notifier and self.telegram_notifier.enabled
+        if not (send_email or send_telegram):
+            # Channels that are not set up or are disabled have nothing to rate limit
+            return
+        
+        # Wait out whatever is left of the interval since the last remote send
+        delay = self._next_remote_send - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        
+        futures = []
+        if send_email:
+            futures.append(self._remote_executor.submit(
+                self.email_notifier.send_notification,
+                self.email_notifier.to_email,
+                notification['title'],
+                notification['message']
+            ))
+        
+        if send_telegram:
+            futures.append(self._remote_executor.submit(
+                self.telegram_notifier.send_notification,
+                f"*{notification['title']}*\n{notification['message']}"
+            ))
+        
+        # Both senders catch their own errors; this only waits for the slower one
+        concurrent.futures.wait(futures)
+        self._next_remote_send = time.monotonic() + REMOTE_SEND_INTERVAL
     
     def setup_tray_icon(self, tray_icon):
         """Set up system tray icon for notifications"""
@@ -3,9 +3,10 @@ import sys
 from PyQt5.QtWidgets import (QDialog, QTabWidget, QVBoxLayout, QHBoxLayout, QWidget,
                           QLabel, QLineEdit, QCheckBox, QSpinBox, QComboBox,
                           QPushButton, QFileDialog, QFormLayout, QGroupBox,
-                          QRadioButton, QSlider, QMessageBox, QScrollArea, QFrame)
-from PyQt5.QtCore import Qt, QSettings, QPoint
-from PyQt5.QtGui import QIcon, QFont, QColor
+                          QRadioButton, QSlider, QMessageBox, QScrollArea, QFrame,
+                          QApplication)
+from PyQt5.QtCore import Qt, QSettings, QPoint, pyqtSlot
+from PyQt5.QtGui import QIcon, QFont
 
 from database import Database
 import utils
@@ -21,12 +22,322 @@ DISABLED_COLOR = "#555555"
 PROGRESS_COLOR = "#4CAF50"  # Green
 CARD_SHADOW = "0px 2px 6px rgba(0, 0, 0, 0.3)"
 
+# The check mark is looked up next to this module once, at import. A bare
+# url(check.png) is resolved against the working directory, and when the file
+# is missing the stylesheet is left without an image instead of probing for it
+_CHECK_ICON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'check.png')
+_CHECK_IMAGE_RULE = (
+    f'image: url("{_CHECK_ICON.replace(os.sep, "/")}");' if os.path.exists(_CHECK_ICON) else ''
+)
+
+# Settings dialog stylesheet, installed once on the QApplication by
+# SettingsDialog.install_global_style. Every rule is scoped to the dialog so
+# the main window is not repolished.
+_SETTINGS_QSS = f"""
+QDialog#SettingsDialog {{
+    background-color: {DARK_PRIMARY};
+    color: {TEXT_COLOR};
+}}
+QDialog#SettingsDialog QTabWidget::pane {{
+    border: none;
+    background-color: {DARK_SECONDARY};
+    border-radius: 8px;
+}}
+QDialog#SettingsDialog QTabBar {{
+    alignment: center;
+}}
+QDialog#SettingsDialog QTabBar::tab {{
+    background-color: {DARK_TERTIARY};
+    color: {TEXT_COLOR};
+    padding: 10px 5px;
+    min-width: 135px;
+    max-width: 135px;
+    border-top-left-radius: 6px;
+    border-top-right-radius: 6px;
+    font-weight: bold;
+    margin-right: 2px;
+    margin-left: 2px;
+}}
+QDialog#SettingsDialog QTabBar::tab:selected {{
+    background-color: {DARK_SECONDARY};
+    border-bottom: 3px solid {ACCENT_COLOR};
+}}
+QDialog#SettingsDialog QLabel {{
+    color: {TEXT_COLOR};
+}}
+QDialog#SettingsDialog QLineEdit, QDialog#SettingsDialog QSpinBox, QDialog#SettingsDialog QComboBox {{
+    background-color: {DARK_TERTIARY};
+    color: {TEXT_COLOR};
+    border: none;
+    border-radius: 5px;
+    padding: 8px;
+    selection-background-color: {ACCENT_COLOR};
+    min-height: 18px;
+}}
+QDialog#SettingsDialog QSpinBox {{
+    min-width: 80px;
+    max-width: 150px;
+}}
+QDialog#SettingsDialog QComboBox {{
+    min-width: 150px;
+}}
+QDialog#SettingsDialog QLineEdit:focus, QDialog#SettingsDialog QSpinBox:focus, QDialog#SettingsDialog QComboBox:focus {{
+    border: 1px solid {ACCENT_COLOR};
+}}
+QDialog#SettingsDialog QCheckBox {{
+    color: {TEXT_COLOR};
+    padding: 5px;
+    margin-left: 5px;
+    spacing: 8px;
+}}
+QDialog#SettingsDialog QCheckBox::indicator {{
+    width: 18px;
+    height: 18px;
+    border-radius: 3px;
+    background-color: {DARK_TERTIARY};
+}}
+QDialog#SettingsDialog QCheckBox::indicator:checked {{
+    background-color: {ACCENT_COLOR};
+    {_CHECK_IMAGE_RULE}
+}}
+QDialog#SettingsDialog QPushButton {{
+    background-color: {DARK_TERTIARY};
+    color: {TEXT_COLOR};
+    border-radius: 6px;
+    padding: 10px 15px;
+    font-weight: bold;
+}}
+QDialog#SettingsDialog QPushButton:hover {{
+    background-color: {ACCENT_COLOR};
+}}
+QDialog#SettingsDialog QPushButton#primaryButton {{
+    background-color: {ACCENT_COLOR};
+    color: white;
+    font-weight: bold;
+    font-size: 13px;
+}}
+QDialog#SettingsDialog QPushButton#primaryButton:hover {{
+    background-color: #ff5b76;
+}}
+QDialog#SettingsDialog QGroupBox {{
+    color: {TEXT_COLOR};
+    border: 1px solid #444;
+    border-radius: 6px;
+    margin-top: 15px;
+    padding-top: 22px;
+    font-weight: bold;
+}}
+QDialog#SettingsDialog QGroupBox::title {{
+    subcontrol-origin: margin;
+    subcontrol-position: top left;
+    padding: 0 10px;
+    left: 7px;
+}}
+QDialog#SettingsDialog QRadioButton {{
+    color: {TEXT_COLOR};
+    padding: 5px;
+}}
+QDialog#SettingsDialog QRadioButton::indicator {{
+    width: 15px;
+    height: 15px;
+    border-radius: 7px;
+    background-color: {DARK_TERTIARY};
+}}
+QDialog#SettingsDialog QRadioButton::indicator:checked {{
+    background-color: {ACCENT_COLOR};
+    border: 3px solid {DARK_TERTIARY};
+    width: 9px;
+    height: 9px;
+}}
+QDialog#SettingsDialog QSlider::groove:horizontal {{
+    height: 8px;
+    background: {DARK_TERTIARY};
+    margin: 2px 0;
+    border-radius: 4px;
+}}
+QDialog#SettingsDialog QSlider::handle:horizontal {{
+    background: {ACCENT_COLOR};
+    border: none;
+    width: 18px;
+    height: 18px;
+    margin: -5px 0;
+    border-radius: 9px;
+}}
+QDialog#SettingsDialog QSlider::handle:horizontal:hover {{
+    background: #ff5b76;
+}}
+QDialog#SettingsDialog QSlider::sub-page:horizontal {{
+    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 0,
+        stop: 0 {ACCENT_COLOR}, stop: 1 #ff5b76);
+    height: 8px;
+    border-radius: 4px;
+}}
+QDialog#SettingsDialog QScrollArea {{
+    border: none;
+    background-color: transparent;
+}}
+QDialog#SettingsDialog QScrollBar:vertical {{
+    border: none;
+    background: {DARK_PRIMARY};
+    width: 10px;
+    margin: 0px;
+}}
+QDialog#SettingsDialog QScrollBar::handle:vertical {{
+    background: {DARK_TERTIARY};
+    min-height: 20px;
+    border-radius: 5px;
+}}
+QDialog#SettingsDialog QScrollBar::handle:vertical:hover {{
+    background: {ACCENT_COLOR};
+}}
+QDialog#SettingsDialog QScrollBar::add-line:vertical, QDialog#SettingsDialog QScrollBar::sub-line:vertical {{
+    height: 0px;
+}}
+QDialog#SettingsDialog QFormLayout {{
+    spacing: 12px;
+}}
+QDialog#SettingsDialog #mainContainer {{
+    background-color: {DARK_PRIMARY};
+    border-radius: 10px;
+    border: 1px solid {DARK_TERTIARY};
+}}
+QDialog#SettingsDialog #titleBar {{
+    background-color: {DARK_PRIMARY};
+    border-top-left-radius: 10px;
+    border-top-right-radius: 10px;
+}}
+QDialog#SettingsDialog QLabel#dialogTitle {{
+    color: {TEXT_COLOR};
+    font-size: 16px;
+    font-weight: bold;
+}}
+QDialog#SettingsDialog QPushButton#closeBtn {{
+    background-color: {DARK_PRIMARY};
+    color: {TEXT_COLOR};
+    border: none;
+    font-size: 16px;
+    font-weight: bold;
+}}
+QDialog#SettingsDialog QPushButton#closeBtn:hover {{
+    background-color: {ACCENT_COLOR};
+    border-radius: 15px;
+}}
+"""
+
+def _make_form_layout(vertical_spacing=15):
+    """Create a left-aligned QFormLayout as used by every settings group"""
+    form = QFormLayout()
+    form.setLabelAlignment(Qt.AlignLeft)
+    form.setFormAlignment(Qt.AlignLeft | Qt.AlignTop)
+    form.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
+    form.setVerticalSpacing(vertical_spacing)
+    form.setHorizontalSpacing(15)
+    return form
+
+# Cloud tab groups: (attribute prefix, group title, folder label, auth provider)
+CLOUD_SERVICES = (
+    ("gdrive", "Google Drive", "Folder name:", "Google"),
+    ("dropbox", "Dropbox", "Folder path:", "Dropbox"),
+    ("onedrive", "OneDrive", "Folder path:", "OneDrive"),
+)
+
+# Values shown for settings that were never saved; merged under the stored
+# settings once per load so the loaders can index them directly
+_SETTINGS_DEFAULTS = {
+    # General tab
+    'default_save_path': '',
+    'ask_location': False,
+    'theme': 'dark',
+    'minimize_to_tray': False,
+    'autostart': False,
+    'auto_start_queue': True,
+    'remember_history': True,
+    'schedule_shutdown': False,
+    # Connection tab
+    'default_connections': 8,
+    'max_connections': 16,
+    'bandwidth_limit': 0,
+    'proxy_enabled': False,
+    'proxy_url': '',
+    'proxy_username': '',
+    'proxy_password': '',
+    # Notifications tab
+    'notifications_enabled': True,
+    'sound_enabled': True,
+    'email_notifications': False,
+    'email_address': '',
+    'smtp_server': '',
+    'smtp_password': '',
+    'telegram_notifications': False,
+    'telegram_token': '',
+    'telegram_chat_id': '',
+    # Cloud Services tab
+    'gdrive_enabled': False,
+    'gdrive_auto': False,
+    'gdrive_folder': False,
+    'gdrive_folder_name': '',
+    'dropbox_enabled': False,
+    'dropbox_auto': False,
+    'dropbox_folder': False,
+    'dropbox_folder_path': '',
+    'onedrive_enabled': False,
+    'onedrive_auto': False,
+    'onedrive_folder': False,
+    'onedrive_folder_path': '',
+}
+
+# Every translated string the dialog shows, looked up together once per language
+_TEXT_KEYS = (
+    "always_ask", "app_name", "app_settings", "auto_start_queue",
+    "bandwidth_control", "bandwidth_limit", "behavior", "browse", "cancel",
+    "cloud_services", "connection", "connection_settings", "dark",
+    "default_connections", "default_path", "download_location", "general",
+    "language", "language_changed", "light", "limit_bandwidth", "max_connections",
+    "notifications", "password", "proxy_settings", "proxy_url", "remember_history",
+    "requires_auth", "save", "settings", "shutdown_after", "start_with_windows",
+    "system_tray", "theme", "ui_settings", "use_proxy", "username",
+)
+
 class SettingsDialog(QDialog):
+    _installed_style = None  # Application stylesheet after our rules were added
+    
+    @classmethod
+    def install_global_style(cls, app):
+        """Append the dialog's rules to the application stylesheet once"""
+        # Comparing against what was installed also catches a theme change
+        # that replaced the application stylesheet since
+        if app.styleSheet() == cls._installed_style:
+            return
+        cls._installed_style = app.styleSheet() + _SETTINGS_QSS
+        app.setStyleSheet(cls._installed_style)
+    
+    # Last dialog built by shared() and the language its labels are in
+    _shared_dialog = None
+    _shared_language = None
+    _flush_on_quit = False  # aboutToQuit already flushes the shared Database
+    
+    @classmethod
+    def shared(cls, parent=None):
+        """Return a settings dialog, reusing the last one while the language is unchanged"""
+        dialog = cls._shared_dialog
+        if (dialog is not None and cls._shared_language == translations.current_language
+                and dialog.parent() is parent):
+            # The widget tree is still valid; only the values need refreshing
+            dialog.loadSettings()
+            return dialog
+        
+        if dialog is not None:
+            dialog.deleteLater()
+        cls._shared_dialog = cls(parent)
+        cls._shared_language = translations.current_language
+        return cls._shared_dialog
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle(translations.get_text("settings"))
+        self.texts = translations.get_texts(_TEXT_KEYS)
+        self.setWindowTitle(self.texts["settings"])
         self.resize(600, 450)  # Increased size for better layout
-        self.database = Database()
+        self.database = Database.instance()
         
         # Set window flags for frameless window
         self.setWindowFlags(Qt.FramelessWindowHint)
@@ -36,169 +347,14 @@ class SettingsDialog(QDialog):
         self.dragging = False
         self.offset = QPoint()
         
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {DARK_PRIMARY};
-                color: {TEXT_COLOR};
-            }}
-            QTabWidget::pane {{
-                border: none;
-                background-color: {DARK_SECONDARY};
-                border-radius: 8px;
-            }}
-            QTabBar {{
-                alignment: center;
-            }}
-            QTabBar::tab {{
-                background-color: {DARK_TERTIARY};
-                color: {TEXT_COLOR};
-                padding: 10px 5px;
-                min-width: 135px;
-                max-width: 135px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-                font-weight: bold;
-                margin-right: 2px;
-                margin-left: 2px;
-            }}
-            QTabBar::tab:selected {{
-                background-color: {DARK_SECONDARY};
-                border-bottom: 3px solid {ACCENT_COLOR};
-            }}
-            QLabel {{
-                color: {TEXT_COLOR};
-            }}
-            QLineEdit, QSpinBox, QComboBox {{
-                background-color: {DARK_TERTIARY};
-                color: {TEXT_COLOR};
-                border: none;
-                border-radius: 5px;
-                padding: 8px;
-                selection-background-color: {ACCENT_COLOR};
-                min-height: 18px;
-            }}
-            QSpinBox {{
-                min-width: 80px;
-                max-width: 150px;
-            }}
-            QComboBox {{
-                min-width: 150px;
-            }}
-            QLineEdit:focus, QSpinBox:focus, QComboBox:focus {{
-                border: 1px solid {ACCENT_COLOR};
-            }}
-            QCheckBox {{
-                color: {TEXT_COLOR};
-                padding: 5px;
-                spacing: 8px;
-            }}
-            QCheckBox::indicator {{
-                width: 18px;
-                height: 18px;
-                border-radius: 3px;
-                background-color: {DARK_TERTIARY};
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {ACCENT_COLOR};
-                image: url(check.png);
-            }}
-            QPushButton {{
-                background-color: {DARK_TERTIARY};
-                color: {TEXT_COLOR};
-                border-radius: 6px;
-                padding: 10px 15px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ACCENT_COLOR};
-            }}
-            QPushButton#primaryButton {{
-                background-color: {ACCENT_COLOR};
-                color: white;
-                font-weight: bold;
-                font-size: 13px;
-            }}
-            QPushButton#primaryButton:hover {{
-                background-color: #ff5b76;
-            }}
-            QGroupBox {{
-                color: {TEXT_COLOR};
-                border: 1px solid #444;
-                border-radius: 6px;
-                margin-top: 15px;
-                padding-top: 22px;
-                font-weight: bold;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                left: 7px;
-            }}
-            QRadioButton {{
-                color: {TEXT_COLOR};
-                padding: 5px;
-            }}
-            QRadioButton::indicator {{
-                width: 15px;
-                height: 15px;
-                border-radius: 7px;
-                background-color: {DARK_TERTIARY};
-            }}
-            QRadioButton::indicator:checked {{
-                background-color: {ACCENT_COLOR};
-                border: 3px solid {DARK_TERTIARY};
-                width: 9px;
-                height: 9px;
-            }}
-            QSlider::groove:horizontal {{
-                height: 8px;
-                background: {DARK_TERTIARY};
-                margin: 2px 0;
-                border-radius: 4px;
-            }}
-            QSlider::handle:horizontal {{
-                background: {ACCENT_COLOR};
-                border: none;
-                width: 18px;
-                height: 18px;
-                margin: -5px 0;
-                border-radius: 9px;
-            }}
-            QSlider::handle:horizontal:hover {{
-                background: #ff5b76;
-            }}
-            QSlider::sub-page:horizontal {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 0,
-                    stop: 0 {ACCENT_COLOR}, stop: 1 #ff5b76);
-                height: 8px;
-                border-radius: 4px;
-            }}
-            QScrollArea {{
-                border: none;
-                background-color: transparent;
-            }}
-            QScrollBar:vertical {{
-                border: none;
-                background: {DARK_PRIMARY};
-                width: 10px;
-                margin: 0px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {DARK_TERTIARY};
-                min-height: 20px;
-                border-radius: 5px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background: {ACCENT_COLOR};
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-            QFormLayout {{
-                spacing: 12px;
-            }}
-        """)
+        self.setObjectName("SettingsDialog")
+        app = QApplication.instance()
+        self.install_global_style(app)
+        # Saves are written in the background; finish them before the app
+        # exits. Every dialog shares one Database, so connect only once
+        if not SettingsDialog._flush_on_quit:
+            app.aboutToQuit.connect(self.database.flush)
+            SettingsDialog._flush_on_quit = True
         
         self.initUI()
         self.loadSettings()
@@ -207,13 +363,6 @@ class SettingsDialog(QDialog):
         # Create main container with border and shadow
         main_container = QFrame(self)
         main_container.setObjectName("mainContainer")
-        main_container.setStyleSheet(f"""
-            #mainContainer {{
-                background-color: {DARK_PRIMARY};
-                border-radius: 10px;
-                border: 1px solid {DARK_TERTIARY};
-            }}
-        """)
         
         # Main layout for the container
         container_layout = QVBoxLayout(main_container)
@@ -223,13 +372,6 @@ class SettingsDialog(QDialog):
         # Custom title bar
         title_bar = QFrame()
         title_bar.setObjectName("titleBar")
-        title_bar.setStyleSheet(f"""
-            #titleBar {{
-                background-color: {DARK_PRIMARY};
-                border-top-left-radius: 10px;
-                border-top-right-radius: 10px;
-            }}
-        """)
         title_bar.setFixedHeight(40)
         title_bar.mousePressEvent = self.title_bar_mouse_press
         title_bar.mouseMoveEvent = self.title_bar_mouse_move
@@ -239,32 +381,16 @@ class SettingsDialog(QDialog):
         title_layout.setContentsMargins(15, 0, 15, 0)
         
         # Dialog title
-        title_label = QLabel("FlashGet - " + translations.get_text("app_settings"))
-        title_label.setStyleSheet(f"""
-            color: {TEXT_COLOR};
-            font-size: 16px;
-            font-weight: bold;
-        """)
+        title_label = QLabel("FlashGet - " + self.texts["app_settings"])
+        title_label.setObjectName("dialogTitle")
         title_layout.addWidget(title_label)
         
         title_layout.addStretch()
         
         # Close button
         btn_close = QPushButton("×")
+        btn_close.setObjectName("closeBtn")
         btn_close.setFixedSize(30, 30)
-        btn_close.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_PRIMARY};
-                color: {TEXT_COLOR};
-                border: none;
-                font-size: 16px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {ACCENT_COLOR};
-                border-radius: 15px;
-            }}
-        """)
         btn_close.clicked.connect(self.reject)
         title_layout.addWidget(btn_close)
         
@@ -289,21 +415,22 @@ class SettingsDialog(QDialog):
         self.cloud_tab = QWidget()
         
         # Add tabs to widget
-        self.tab_widget.addTab(self.general_tab, translations.get_text("general"))
-        self.tab_widget.addTab(self.connection_tab, translations.get_text("connection"))
-        self.tab_widget.addTab(self.notification_tab, translations.get_text("notifications"))
-        self.tab_widget.addTab(self.cloud_tab, translations.get_text("cloud_services"))
-        
-        # Distribute the tabs evenly
-        tab_width = self.width() / 4
-        for i in range(self.tab_widget.count()):
-            self.tab_widget.tabBar().setTabTextColor(i, QColor(TEXT_COLOR))
-        
-        # Setup tab contents
-        self.setup_general_tab()
-        self.setup_connection_tab()
-        self.setup_notification_tab()
-        self.setup_cloud_tab()
+        self.tab_widget.addTab(self.general_tab, self.texts["general"])
+        self.tab_widget.addTab(self.connection_tab, self.texts["connection"])
+        self.tab_widget.addTab(self.notification_tab, self.texts["notifications"])
+        self.tab_widget.addTab(self.cloud_tab, self.texts["cloud_services"])
+        
+        # Tab contents are built the first time a tab is shown; each entry
+        # pairs a builder with the loader and saver of the widgets it makes
+        self._tab_handlers = (
+            (self.setup_general_tab, self._load_general_settings, self._save_general_settings),
+            (self.setup_connection_tab, self._load_connection_settings, self._save_connection_settings),
+            (self.setup_notification_tab, self._load_notification_settings, self._save_notification_settings),
+            (self.setup_cloud_tab, self._load_cloud_settings, self._save_cloud_settings),
+        )
+        self._tab_built = [False] * len(self._tab_handlers)
+        self._settings = None
+        self.tab_widget.currentChanged.connect(self._ensure_tab_built)
         
         # Add tab widget to layout
         content_layout.addWidget(self.tab_widget)
@@ -313,11 +440,11 @@ class SettingsDialog(QDialog):
         btn_layout.setContentsMargins(0, 10, 0, 0)
         btn_layout.addStretch()
         
-        self.cancel_btn = QPushButton(translations.get_text("cancel"))
+        self.cancel_btn = QPushButton(self.texts["cancel"])
         self.cancel_btn.clicked.connect(self.reject)
         btn_layout.addWidget(self.cancel_btn)
         
-        self.save_btn = QPushButton(translations.get_text("save"))
+        self.save_btn = QPushButton(self.texts["save"])
         self.save_btn.setObjectName("primaryButton")
         self.save_btn.setMinimumWidth(150)
         self.save_btn.clicked.connect(self.save_settings)
@@ -335,6 +462,11 @@ class SettingsDialog(QDialog):
     def title_bar_mouse_press(self, event):
         """Handle mouse press events for custom title bar"""
         if event.button() == Qt.LeftButton:
+            # Qt 5.15+ hands the drag to the window manager, so no move events
+            # reach Python; older Qt (or a refusing platform) drags manually
+            handle = self.windowHandle()
+            if hasattr(handle, 'startSystemMove') and handle.startSystemMove():
+                return
             self.dragging = True
             self.offset = event.pos()
     
@@ -347,37 +479,40 @@ class SettingsDialog(QDialog):
         """Handle mouse release events for custom title bar"""
         self.dragging = False
     
-    def setup_general_tab(self):
-        # Create a scroll area for the general tab
+    def _make_scrolled_tab(self, tab, spacing=20):
+        """Put a scroll area on a tab page and return the layout for its content"""
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         scroll_area.setFrameShape(QScrollArea.NoFrame)
         
-        # Create a widget to hold the content
+        # Widget holding the tab's content
         content_widget = QWidget()
-        
-        # Layout for the content
         layout = QVBoxLayout(content_widget)
         layout.setContentsMargins(15, 20, 15, 20)
-        layout.setSpacing(20)
+        layout.setSpacing(spacing)
+        scroll_area.setWidget(content_widget)
+        
+        # The scroll area fills the whole tab
+        tab_layout = QVBoxLayout(tab)
+        tab_layout.setContentsMargins(0, 0, 0, 0)
+        tab_layout.addWidget(scroll_area)
+        return layout
+    
+    def setup_general_tab(self):
+        layout = self._make_scrolled_tab(self.general_tab)
         
         # Download location group
-        location_group = QGroupBox(translations.get_text("download_location"))
+        location_group = QGroupBox(self.texts["download_location"])
         location_layout = QVBoxLayout(location_group)
         location_layout.setContentsMargins(15, 20, 15, 15)
         location_layout.setSpacing(15)
         
         # Use QFormLayout for better alignment
-        path_form = QFormLayout()
-        path_form.setLabelAlignment(Qt.AlignLeft)
-        path_form.setFormAlignment(Qt.AlignLeft | Qt.AlignTop)
-        path_form.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
+        path_form = _make_form_layout(10)
         path_form.setRowWrapPolicy(QFormLayout.WrapLongRows)
-        path_form.setVerticalSpacing(10)
-        path_form.setHorizontalSpacing(15)
         
-        self.default_path_label = QLabel(translations.get_text("default_path"))
+        self.default_path_label = QLabel(self.texts["default_path"])
         self.default_path_label.setMinimumWidth(120)
         
         path_field = QWidget()
@@ -389,7 +524,7 @@ class SettingsDialog(QDialog):
         self.default_path_edit.setMinimumWidth(250)
         path_field_layout.addWidget(self.default_path_edit)
         
-        self.browse_btn = QPushButton(translations.get_text("browse"))
+        self.browse_btn = QPushButton(self.texts["browse"])
         self.browse_btn.setFixedWidth(100)
         self.browse_btn.clicked.connect(self.browse_download_path)
         path_field_layout.addWidget(self.browse_btn)
@@ -400,40 +535,37 @@ class SettingsDialog(QDialog):
         # Add a small spacer
         location_layout.addSpacing(5)
         
-        self.always_ask_check = QCheckBox(translations.get_text("always_ask"))
-        self.always_ask_check.setContentsMargins(5, 0, 0, 0)
+        self.always_ask_check = QCheckBox(self.texts["always_ask"])
         location_layout.addWidget(self.always_ask_check)
         
         layout.addWidget(location_group)
         
         # UI Settings group
-        ui_group = QGroupBox(translations.get_text("ui_settings"))
+        ui_group = QGroupBox(self.texts["ui_settings"])
         ui_layout = QVBoxLayout(ui_group)
         ui_layout.setContentsMargins(15, 20, 15, 15)
         ui_layout.setSpacing(15)
         
         # Use QFormLayout for better alignment
-        ui_form = QFormLayout()
-        ui_form.setLabelAlignment(Qt.AlignLeft)
-        ui_form.setFormAlignment(Qt.AlignLeft | Qt.AlignTop)
-        ui_form.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        ui_form.setVerticalSpacing(15)
-        ui_form.setHorizontalSpacing(15)
+        ui_form = _make_form_layout()
         
         # Theme selection
-        theme_label = QLabel(translations.get_text("theme"))
+        theme_label = QLabel(self.texts["theme"])
         theme_label.setMinimumWidth(120)
         self.theme_combo = QComboBox()
-        self.theme_combo.addItem(translations.get_text("dark"), "dark")
-        self.theme_combo.addItem(translations.get_text("light"), "light")
+        self.theme_combo.addItem(self.texts["dark"], "dark")
+        self.theme_combo.addItem(self.texts["light"], "light")
         ui_form.addRow(theme_label, self.theme_combo)
         
         # Language selection
-        lang_label = QLabel(translations.get_text("language"))
+        lang_label = QLabel(self.texts["language"])
         lang_label.setMinimumWidth(120)
         self.lang_combo = QComboBox()
-        for code, name in translations.get_available_languages():
+        # Combo position of each language code, so loading needs no findData scan
+        self._lang_index = {}
+        for index, (code, name) in enumerate(translations.get_available_languages()):
             self.lang_combo.addItem(name, code)
+            self._lang_index[code] = index
         ui_form.addRow(lang_label, self.lang_combo)
         
         ui_layout.addLayout(ui_form)
@@ -442,33 +574,28 @@ class SettingsDialog(QDialog):
         ui_layout.addSpacing(5)
         
         # System tray option
-        self.tray_check = QCheckBox(translations.get_text("system_tray"))
-        self.tray_check.setContentsMargins(5, 0, 0, 0)
+        self.tray_check = QCheckBox(self.texts["system_tray"])
         ui_layout.addWidget(self.tray_check)
         
         # Start with Windows option
-        self.startup_check = QCheckBox(translations.get_text("start_with_windows"))
-        self.startup_check.setContentsMargins(5, 0, 0, 0)
+        self.startup_check = QCheckBox(self.texts["start_with_windows"])
         ui_layout.addWidget(self.startup_check)
         
         layout.addWidget(ui_group)
         
         # Behavior group
-        behavior_group = QGroupBox(translations.get_text("behavior"))
+        behavior_group = QGroupBox(self.texts["behavior"])
         behavior_layout = QVBoxLayout(behavior_group)
         behavior_layout.setContentsMargins(15, 20, 15, 15)
         behavior_layout.setSpacing(10)
         
-        self.auto_start_check = QCheckBox(translations.get_text("auto_start_queue"))
-        self.auto_start_check.setContentsMargins(5, 0, 0, 0)
+        self.auto_start_check = QCheckBox(self.texts["auto_start_queue"])
         behavior_layout.addWidget(self.auto_start_check)
         
-        self.history_check = QCheckBox(translations.get_text("remember_history"))
-        self.history_check.setContentsMargins(5, 0, 0, 0)
+        self.history_check = QCheckBox(self.texts["remember_history"])
         behavior_layout.addWidget(self.history_check)
         
-        self.shutdown_check = QCheckBox(translations.get_text("shutdown_after"))
-        self.shutdown_check.setContentsMargins(5, 0, 0, 0)
+        self.shutdown_check = QCheckBox(self.texts["shutdown_after"])
         behavior_layout.addWidget(self.shutdown_check)
         
         behavior_group.setLayout(behavior_layout)
@@ -476,46 +603,21 @@ class SettingsDialog(QDialog):
         
         # Add stretch to push everything to the top
         layout.addStretch()
-        
-        # Set the content widget to the scroll area
-        scroll_area.setWidget(content_widget)
-        
-        # Set the scroll area as the main widget for the tab
-        tab_layout = QVBoxLayout(self.general_tab)
-        tab_layout.setContentsMargins(0, 0, 0, 0)
-        tab_layout.addWidget(scroll_area)
     
     def setup_connection_tab(self):
-        # Create a scroll area for the connection tab
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setFrameShape(QScrollArea.NoFrame)
-        
-        # Create a widget to hold the content
-        content_widget = QWidget()
-        
-        # Layout for the content
-        layout = QVBoxLayout(content_widget)
-        layout.setContentsMargins(15, 20, 15, 20)
-        layout.setSpacing(20)
+        layout = self._make_scrolled_tab(self.connection_tab)
         
         # Connection settings group
-        conn_group = QGroupBox(translations.get_text("connection_settings"))
+        conn_group = QGroupBox(self.texts["connection_settings"])
         conn_layout = QVBoxLayout(conn_group)
         conn_layout.setContentsMargins(15, 20, 15, 15)
         conn_layout.setSpacing(15)
         
         # Use QFormLayout for better alignment
-        conn_form = QFormLayout()
-        conn_form.setLabelAlignment(Qt.AlignLeft)
-        conn_form.setFormAlignment(Qt.AlignLeft | Qt.AlignTop)
-        conn_form.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        conn_form.setVerticalSpacing(15)
-        conn_form.setHorizontalSpacing(15)
+        conn_form = _make_form_layout()
         
         # Default connections
-        default_conn_label = QLabel(translations.get_text("default_connections"))
+        default_conn_label = QLabel(self.texts["default_connections"])
         default_conn_label.setMinimumWidth(120)
         
         self.default_conn_spin = QSpinBox()
@@ -524,7 +626,7 @@ class SettingsDialog(QDialog):
         conn_form.addRow(default_conn_label, self.default_conn_spin)
         
         # Max connections
-        max_conn_label = QLabel(translations.get_text("max_connections"))
+        max_conn_label = QLabel(self.texts["max_connections"])
         max_conn_label.setMinimumWidth(120)
         
         self.max_conn_spin = QSpinBox()
@@ -536,25 +638,21 @@ class SettingsDialog(QDialog):
         layout.addWidget(conn_group)
         
         # Bandwidth control group
-        bandwidth_group = QGroupBox(translations.get_text("bandwidth_control"))
+        bandwidth_group = QGroupBox(self.texts["bandwidth_control"])
         bandwidth_layout = QVBoxLayout(bandwidth_group)
         bandwidth_layout.setContentsMargins(15, 20, 15, 15)
         bandwidth_layout.setSpacing(15)
         
-        self.limit_bandwidth_check = QCheckBox(translations.get_text("limit_bandwidth"))
-        self.limit_bandwidth_check.setContentsMargins(5, 0, 0, 0)
-        self.limit_bandwidth_check.toggled.connect(self.toggle_bandwidth_limit)
+        self.limit_bandwidth_check = QCheckBox(self.texts["limit_bandwidth"])
+        # clicked (unlike toggled) is not emitted by setChecked, so loading
+        # settings does not run the toggle_* slots; the loaders call them once
+        self.limit_bandwidth_check.clicked.connect(self.toggle_bandwidth_limit)
         bandwidth_layout.addWidget(self.limit_bandwidth_check)
         
         # Bandwidth limit slider
-        bandwidth_form = QFormLayout()
-        bandwidth_form.setLabelAlignment(Qt.AlignLeft)
-        bandwidth_form.setFormAlignment(Qt.AlignLeft | Qt.AlignTop)
-        bandwidth_form.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        bandwidth_form.setVerticalSpacing(15)
-        bandwidth_form.setHorizontalSpacing(15)
-        
-        limit_label = QLabel(translations.get_text("bandwidth_limit"))
+        bandwidth_form = _make_form_layout()
+        
+        limit_label = QLabel(self.texts["bandwidth_limit"])
         limit_label.setMinimumWidth(120)
         
         slider_widget = QWidget()
@@ -573,6 +671,8 @@ class SettingsDialog(QDialog):
         self.bandwidth_value = QLabel("200 KB/s")
         self.bandwidth_value.setFixedWidth(80)
         slider_layout.addWidget(self.bandwidth_value)
+        # Only the label follows the drag; the value is stored on Save
+        self.bandwidth_slider.valueChanged.connect(self.update_bandwidth_label)
         
         bandwidth_form.addRow(limit_label, slider_widget)
         bandwidth_layout.addLayout(bandwidth_form)
@@ -580,26 +680,20 @@ class SettingsDialog(QDialog):
         layout.addWidget(bandwidth_group)
         
         # Proxy settings group
-        proxy_group = QGroupBox(translations.get_text("proxy_settings"))
+        proxy_group = QGroupBox(self.texts["proxy_settings"])
         proxy_layout = QVBoxLayout(proxy_group)
         proxy_layout.setContentsMargins(15, 20, 15, 15)
         proxy_layout.setSpacing(15)
         
-        self.use_proxy_check = QCheckBox(translations.get_text("use_proxy"))
-        self.use_proxy_check.setContentsMargins(5, 0, 0, 0)
-        self.use_proxy_check.toggled.connect(self.toggle_proxy_settings)
+        self.use_proxy_check = QCheckBox(self.texts["use_proxy"])
+        self.use_proxy_check.clicked.connect(self.toggle_proxy_settings)
         proxy_layout.addWidget(self.use_proxy_check)
         
         # Proxy form for better alignment
-        proxy_form = QFormLayout()
-        proxy_form.setLabelAlignment(Qt.AlignLeft)
-        proxy_form.setFormAlignment(Qt.AlignLeft | Qt.AlignTop)
-        proxy_form.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        proxy_form.setVerticalSpacing(15)
-        proxy_form.setHorizontalSpacing(15)
+        proxy_form = _make_form_layout()
         
         # Proxy URL
-        proxy_url_label = QLabel(translations.get_text("proxy_url"))
+        proxy_url_label = QLabel(self.texts["proxy_url"])
         proxy_url_label.setMinimumWidth(120)
         
         self.proxy_url_edit = QLineEdit()
@@ -609,22 +703,16 @@ class SettingsDialog(QDialog):
         proxy_layout.addLayout(proxy_form)
         
         # Proxy authentication
-        self.proxy_auth_check = QCheckBox(translations.get_text("requires_auth"))
-        self.proxy_auth_check.setContentsMargins(5, 0, 0, 0)
-        self.proxy_auth_check.toggled.connect(self.toggle_proxy_auth)
+        self.proxy_auth_check = QCheckBox(self.texts["requires_auth"])
+        self.proxy_auth_check.clicked.connect(self.toggle_proxy_auth)
         self.proxy_auth_check.setEnabled(False)
         proxy_layout.addWidget(self.proxy_auth_check)
         
         # Auth form
-        auth_form = QFormLayout()
-        auth_form.setLabelAlignment(Qt.AlignLeft)
-        auth_form.setFormAlignment(Qt.AlignLeft | Qt.AlignTop)
-        auth_form.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-        auth_form.setVerticalSpacing(15)
-        auth_form.setHorizontalSpacing(15)
+        auth_form = _make_form_layout()
         
         # Proxy username
-        proxy_user_label = QLabel(translations.get_text("username"))
+        proxy_user_label = QLabel(self.texts["username"])
         proxy_user_label.setMinimumWidth(120)
         
         self.proxy_user_edit = QLineEdit()
@@ -632,7 +720,7 @@ class SettingsDialog(QDialog):
         auth_form.addRow(proxy_user_label, self.proxy_user_edit)
         
         # Proxy password
-        proxy_pass_label = QLabel(translations.get_text("password"))
+        proxy_pass_label = QLabel(self.texts["password"])
         proxy_pass_label.setMinimumWidth(120)
         
         self.proxy_pass_edit = QLineEdit()
@@ -645,39 +733,10 @@ class SettingsDialog(QDialog):
         
         # Add stretch to push everything to the top
         layout.addStretch()
-        
-        # Set the content widget to the scroll area
-        scroll_area.setWidget(content_widget)
-        
-        # Set the scroll area as the main widget for the tab
-        tab_layout = QVBoxLayout(self.connection_tab)
-        tab_layout.setContentsMargins(0, 0, 0, 0)
-        tab_layout.addWidget(scroll_area)
     
     def setup_notification_tab(self):
-        # Create a scroll area for the notification tab
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setFrameShape(QScrollArea.NoFrame)
-        
-        # Create a widget to hold the content
-        content_widget = QWidget()
-        
-        # Layout for the content
-        layout = QVBoxLayout(content_widget)
-        layout.setContentsMargins(15, 20, 15, 20)
-        layout.setSpacing(15)
-        
-        # Set the content widget to the scroll area
-        scroll_area.setWidget(content_widget)
-        
-        # Set the scroll area as the main widget for the tab
-        tab_layout = QVBoxLayout(self.notification_tab)
-        tab_layout.setContentsMargins(0, 0, 0, 0)
-        tab_layout.addWidget(scroll_area)
+        layout = self._make_scrolled_tab(self.notification_tab, spacing=15)
         
-        # Implement the rest of the notification tab content as before
         # Add notification checkboxes
         self.notify_complete_check = QCheckBox("Notify on download completion")
         layout.addWidget(self.notify_complete_check)
@@ -695,7 +754,7 @@ class SettingsDialog(QDialog):
         email_layout.setSpacing(15)
         
         self.email_check = QCheckBox("Send email notifications")
-        self.email_check.toggled.connect(self.toggle_email_settings)
+        self.email_check.clicked.connect(self.toggle_email_settings)
         email_layout.addWidget(self.email_check)
         
         # SMTP server settings
@@ -759,7 +818,7 @@ class SettingsDialog(QDialog):
         telegram_layout.setSpacing(15)
         
         self.telegram_check = QCheckBox("Send Telegram notifications")
-        self.telegram_check.toggled.connect(self.toggle_telegram_settings)
+        self.telegram_check.clicked.connect(self.toggle_telegram_settings)
         telegram_layout.addWidget(self.telegram_check)
         
         # Bot token
@@ -797,136 +856,64 @@ class SettingsDialog(QDialog):
         layout.addStretch()
 
     def setup_cloud_tab(self):
-        # Create a scroll area for the cloud services tab
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setFrameShape(QScrollArea.NoFrame)
-        
-        # Create a widget to hold the content
-        content_widget = QWidget()
-        
-        # Layout for the content
-        layout = QVBoxLayout(content_widget)
-        layout.setContentsMargins(15, 20, 15, 20)
-        layout.setSpacing(15)
+        layout = self._make_scrolled_tab(self.cloud_tab, spacing=15)
         
-        # Set the content widget to the scroll area
-        scroll_area.setWidget(content_widget)
-        
-        # Set the scroll area as the main widget for the tab
-        tab_layout = QVBoxLayout(self.cloud_tab)
-        tab_layout.setContentsMargins(0, 0, 0, 0)
-        tab_layout.addWidget(scroll_area)
+        for key, title, folder_label_text, provider in CLOUD_SERVICES:
+            layout.addWidget(self._build_cloud_group(key, title, folder_label_text, provider))
         
-        # Implement the rest of the cloud services tab content as before
-        # Google Drive group
-        gdrive_group = QGroupBox("Google Drive")
-        gdrive_layout = QVBoxLayout()
-        gdrive_layout.setContentsMargins(15, 20, 15, 15)
-        gdrive_layout.setSpacing(15)
+        # Add stretch to push everything to the top
+        layout.addStretch()
+    
+    def _build_cloud_group(self, key, title, folder_label_text, provider):
+        """Build one cloud service group; its widgets become self.<key>_* attributes"""
+        group = QGroupBox(title)
+        group_layout = QVBoxLayout()
+        group_layout.setContentsMargins(15, 20, 15, 15)
+        group_layout.setSpacing(15)
         
-        self.gdrive_check = QCheckBox("Enable Google Drive integration")
-        gdrive_layout.addWidget(self.gdrive_check)
+        enable_check = QCheckBox(f"Enable {title} integration")
+        setattr(self, f"{key}_check", enable_check)
+        group_layout.addWidget(enable_check)
         
-        self.gdrive_auto_check = QCheckBox("Automatically upload completed downloads")
-        gdrive_layout.addWidget(self.gdrive_auto_check)
+        auto_check = QCheckBox("Automatically upload completed downloads")
+        setattr(self, f"{key}_auto_check", auto_check)
+        group_layout.addWidget(auto_check)
         
-        self.gdrive_folder_check = QCheckBox("Use specific folder")
-        gdrive_layout.addWidget(self.gdrive_folder_check)
+        folder_check = QCheckBox("Use specific folder")
+        setattr(self, f"{key}_folder_check", folder_check)
+        group_layout.addWidget(folder_check)
         
         # Folder selection
         folder_layout = QHBoxLayout()
-        folder_label = QLabel("Folder name:")
-        folder_layout.addWidget(folder_label)
+        folder_layout.addWidget(QLabel(folder_label_text))
         
-        self.gdrive_folder_edit = QLineEdit()
-        folder_layout.addWidget(self.gdrive_folder_edit, 1)
+        folder_edit = QLineEdit()
+        setattr(self, f"{key}_folder_edit", folder_edit)
+        folder_layout.addWidget(folder_edit, 1)
         
-        gdrive_layout.addLayout(folder_layout)
+        group_layout.addLayout(folder_layout)
         
         # Authenticate button
-        auth_btn = QPushButton("Authenticate with Google")
-        gdrive_layout.addWidget(auth_btn)
-        
-        gdrive_group.setLayout(gdrive_layout)
-        layout.addWidget(gdrive_group)
-        
-        # Dropbox group
-        dropbox_group = QGroupBox("Dropbox")
-        dropbox_layout = QVBoxLayout()
-        dropbox_layout.setContentsMargins(15, 20, 15, 15)
-        dropbox_layout.setSpacing(15)
-        
-        self.dropbox_check = QCheckBox("Enable Dropbox integration")
-        dropbox_layout.addWidget(self.dropbox_check)
-        
-        self.dropbox_auto_check = QCheckBox("Automatically upload completed downloads")
-        dropbox_layout.addWidget(self.dropbox_auto_check)
-        
-        self.dropbox_folder_check = QCheckBox("Use specific folder")
-        dropbox_layout.addWidget(self.dropbox_folder_check)
-        
-        # Folder selection
-        db_folder_layout = QHBoxLayout()
-        db_folder_label = QLabel("Folder path:")
-        db_folder_layout.addWidget(db_folder_label)
-        
-        self.dropbox_folder_edit = QLineEdit()
-        db_folder_layout.addWidget(self.dropbox_folder_edit, 1)
-        
-        dropbox_layout.addLayout(db_folder_layout)
-        
-        # Authenticate button
-        db_auth_btn = QPushButton("Authenticate with Dropbox")
-        dropbox_layout.addWidget(db_auth_btn)
-        
-        dropbox_group.setLayout(dropbox_layout)
-        layout.addWidget(dropbox_group)
-        
-        # OneDrive group
-        onedrive_group = QGroupBox("OneDrive")
-        onedrive_layout = QVBoxLayout()
-        onedrive_layout.setContentsMargins(15, 20, 15, 15)
-        onedrive_layout.setSpacing(15)
-        
-        self.onedrive_check = QCheckBox("Enable OneDrive integration")
-        onedrive_layout.addWidget(self.onedrive_check)
-        
-        self.onedrive_auto_check = QCheckBox("Automatically upload completed downloads")
-        onedrive_layout.addWidget(self.onedrive_auto_check)
-        
-        self.onedrive_folder_check = QCheckBox("Use specific folder")
-        onedrive_layout.addWidget(self.onedrive_folder_check)
-        
-        # Folder selection
-        od_folder_layout = QHBoxLayout()
-        od_folder_label = QLabel("Folder path:")
-        od_folder_layout.addWidget(od_folder_label)
+        group_layout.addWidget(QPushButton(f"Authenticate with {provider}"))
         
-        self.onedrive_folder_edit = QLineEdit()
-        od_folder_layout.addWidget(self.onedrive_folder_edit, 1)
-        
-        onedrive_layout.addLayout(od_folder_layout)
-        
-        # Authenticate button
-        od_auth_btn = QPushButton("Authenticate with OneDrive")
-        onedrive_layout.addWidget(od_auth_btn)
-        
-        onedrive_group.setLayout(onedrive_layout)
-        layout.addWidget(onedrive_group)
-        
-        # Add stretch to push everything to the top
-        layout.addStretch()
-
+        group.setLayout(group_layout)
+        return group
+    
+    @pyqtSlot()
     def browse_download_path(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Default Download Location")
         if folder:
             self.default_path_edit.setText(folder)
     
+    @pyqtSlot(bool)
     def toggle_bandwidth_limit(self, enabled):
         self.bandwidth_slider.setEnabled(enabled)
     
+    @pyqtSlot(int)
+    def update_bandwidth_label(self, value):
+        self.bandwidth_value.setText(f"{value} KB/s")
+    
+    @pyqtSlot(bool)
     def toggle_proxy_settings(self, enabled):
         self.proxy_url_edit.setEnabled(enabled)
         self.proxy_auth_check.setEnabled(enabled)
@@ -935,6 +922,7 @@ class SettingsDialog(QDialog):
         self.proxy_user_edit.setEnabled(auth_enabled)
         self.proxy_pass_edit.setEnabled(auth_enabled)
     
+    @pyqtSlot(bool)
     def toggle_proxy_auth(self, enabled):
         if not self.use_proxy_check.isChecked():
             enabled = False
@@ -942,190 +930,231 @@ class SettingsDialog(QDialog):
         self.proxy_user_edit.setEnabled(enabled)
         self.proxy_pass_edit.setEnabled(enabled)
     
+    @pyqtSlot(bool)
     def toggle_email_settings(self, enabled):
         self.smtp_edit.setEnabled(enabled)
         self.email_acc_edit.setEnabled(enabled)
         self.email_pass_edit.setEnabled(enabled)
         self.recip_edit.setEnabled(enabled)
     
+    @pyqtSlot(bool)
     def toggle_telegram_settings(self, enabled):
         self.bot_edit.setEnabled(enabled)
         self.chat_edit.setEnabled(enabled)
     
+    @pyqtSlot()
     def test_email(self):
         # In a real implementation, this would test the email settings
         QMessageBox.information(self, "Test Email", "Email settings test functionality will be implemented.")
     
+    @pyqtSlot()
     def test_telegram(self):
         # In a real implementation, this would test the Telegram settings
         QMessageBox.information(self, "Test Telegram", "Telegram settings test functionality will be implemented.")
     
     def loadSettings(self):
         """Load settings from database to UI"""
-        # Get all settings
-        settings = self.database.get_all_settings()
+        # Get all settings over the defaults; tabs built later are filled
+        # from the same snapshot
+        self._settings = {**_SETTINGS_DEFAULTS, **self.database.get_all_settings()}
         
-        # General tab
-        self.default_path_edit.setText(settings.get('default_save_path', ''))
-        self.always_ask_check.setChecked(settings.get('ask_location', False))
+        for index, built in enumerate(self._tab_built):
+            if built:
+                self._tab_handlers[index][1](self._settings)
         
-        # Theme
-        theme_text = translations.get_text("dark") if settings.get('theme', 'dark') == 'dark' else translations.get_text("light")
-        index = self.theme_combo.findText(theme_text)
+        # The visible tab is built (and filled) before the dialog is shown
+        self._ensure_tab_built(self.tab_widget.currentIndex())
+    
+    @pyqtSlot(int)
+    def _ensure_tab_built(self, index):
+        """Build a tab's widgets the first time it is shown"""
+        if index < 0 or self._tab_built[index]:
+            return
+        
+        setup, load, _ = self._tab_handlers[index]
+        setup()
+        self._tab_built[index] = True
+        if self._settings is not None:
+            load(self._settings)
+    
+    def _load_general_settings(self, settings):
+        """Fill the General tab"""
+        self.default_path_edit.setText(settings['default_save_path'])
+        self.always_ask_check.setChecked(settings['ask_location'])
+        
+        # Theme - items carry their internal value, so no label comparison
+        theme = 'dark' if settings['theme'] == 'dark' else 'light'
+        index = self.theme_combo.findData(theme)
         if index >= 0:
             self.theme_combo.setCurrentIndex(index)
             
         # Language
         lang_code = settings.get('language', translations.current_language)
-        lang_index = self.lang_combo.findData(lang_code)
-        if lang_index >= 0:
+        lang_index = self._lang_index.get(lang_code)
+        if lang_index is not None:
             self.lang_combo.setCurrentIndex(lang_index)
             
-        self.tray_check.setChecked(settings.get('minimize_to_tray', False))
+        self.tray_check.setChecked(settings['minimize_to_tray'])
         if hasattr(self, 'startup_check'):
-            self.startup_check.setChecked(settings.get('autostart', False))
-        self.auto_start_check.setChecked(settings.get('auto_start_queue', True))
-        self.history_check.setChecked(settings.get('remember_history', True))
-        self.shutdown_check.setChecked(settings.get('schedule_shutdown', False))
-        
-        # Connection tab
-        self.default_conn_spin.setValue(settings.get('default_connections', 8))
-        self.max_conn_spin.setValue(settings.get('max_connections', 16))
+            self.startup_check.setChecked(settings['autostart'])
+        self.auto_start_check.setChecked(settings['auto_start_queue'])
+        self.history_check.setChecked(settings['remember_history'])
+        self.shutdown_check.setChecked(settings['schedule_shutdown'])
+    
+    def _load_connection_settings(self, settings):
+        """Fill the Connection tab"""
+        self.default_conn_spin.setValue(settings['default_connections'])
+        self.max_conn_spin.setValue(settings['max_connections'])
         
-        bandwidth_limit = settings.get('bandwidth_limit', 0)
+        bandwidth_limit = settings['bandwidth_limit']
         self.limit_bandwidth_check.setChecked(bandwidth_limit > 0)
         self.bandwidth_slider.setValue(bandwidth_limit if bandwidth_limit > 0 else 200)
         self.toggle_bandwidth_limit(bandwidth_limit > 0)
         
-        proxy_enabled = settings.get('proxy_enabled', False)
+        proxy_enabled = settings['proxy_enabled']
         self.use_proxy_check.setChecked(proxy_enabled)
-        self.proxy_url_edit.setText(settings.get('proxy_url', ''))
+        self.proxy_url_edit.setText(settings['proxy_url'])
         
-        proxy_auth = settings.get('proxy_username', '') != ''
+        proxy_auth = settings['proxy_username'] != ''
         self.proxy_auth_check.setChecked(proxy_auth)
-        self.proxy_user_edit.setText(settings.get('proxy_username', ''))
-        self.proxy_pass_edit.setText(settings.get('proxy_password', ''))
+        self.proxy_user_edit.setText(settings['proxy_username'])
+        self.proxy_pass_edit.setText(settings['proxy_password'])
         
         self.toggle_proxy_settings(proxy_enabled)
         self.toggle_proxy_auth(proxy_auth)
+    
+    def _load_notification_settings(self, settings):
+        """Fill the Notifications tab"""
+        self.notify_complete_check.setChecked(settings['notifications_enabled'])
+        self.notify_error_check.setChecked(settings['sound_enabled'])
+        self.notify_start_check.setChecked(settings['notifications_enabled'])
         
-        # Notification tab
-        self.notify_complete_check.setChecked(settings.get('notifications_enabled', True))
-        self.notify_error_check.setChecked(settings.get('sound_enabled', True))
-        self.notify_start_check.setChecked(settings.get('notifications_enabled', True))
-        
-        email_enabled = settings.get('email_notifications', False)
+        email_enabled = settings['email_notifications']
         self.email_check.setChecked(email_enabled)
-        self.email_acc_edit.setText(settings.get('email_address', ''))
-        self.smtp_edit.setText(settings.get('smtp_server', ''))
-        self.email_pass_edit.setText(settings.get('smtp_password', ''))
-        self.recip_edit.setText(settings.get('email_address', ''))
+        self.email_acc_edit.setText(settings['email_address'])
+        self.smtp_edit.setText(settings['smtp_server'])
+        self.email_pass_edit.setText(settings['smtp_password'])
+        self.recip_edit.setText(settings['email_address'])
         
         self.toggle_email_settings(email_enabled)
         
-        telegram_enabled = settings.get('telegram_notifications', False)
+        telegram_enabled = settings['telegram_notifications']
         self.telegram_check.setChecked(telegram_enabled)
-        self.bot_edit.setText(settings.get('telegram_token', ''))
-        self.chat_edit.setText(settings.get('telegram_chat_id', ''))
+        self.bot_edit.setText(settings['telegram_token'])
+        self.chat_edit.setText(settings['telegram_chat_id'])
         
         self.toggle_telegram_settings(telegram_enabled)
-        
-        # Cloud tab
-        self.gdrive_check.setChecked(settings.get('gdrive_enabled', False))
-        self.gdrive_auto_check.setChecked(settings.get('gdrive_auto', False))
-        self.gdrive_folder_check.setChecked(settings.get('gdrive_folder', False))
-        self.gdrive_folder_edit.setText(settings.get('gdrive_folder_name', ''))
-        
-        self.dropbox_check.setChecked(settings.get('dropbox_enabled', False))
-        self.dropbox_auto_check.setChecked(settings.get('dropbox_auto', False))
-        self.dropbox_folder_check.setChecked(settings.get('dropbox_folder', False))
-        self.dropbox_folder_edit.setText(settings.get('dropbox_folder_path', ''))
-        
-        self.onedrive_check.setChecked(settings.get('onedrive_enabled', False))
-        self.onedrive_auto_check.setChecked(settings.get('onedrive_auto', False))
-        self.onedrive_folder_check.setChecked(settings.get('onedrive_folder', False))
-        self.onedrive_folder_edit.setText(settings.get('onedrive_folder_path', ''))
     
+    def _load_cloud_settings(self, settings):
+        """Fill the Cloud Services tab"""
+        self.gdrive_check.setChecked(settings['gdrive_enabled'])
+        self.gdrive_auto_check.setChecked(settings['gdrive_auto'])
+        self.gdrive_folder_check.setChecked(settings['gdrive_folder'])
+        self.gdrive_folder_edit.setText(settings['gdrive_folder_name'])
+        
+        self.dropbox_check.setChecked(settings['dropbox_enabled'])
+        self.dropbox_auto_check.setChecked(settings['dropbox_auto'])
+        self.dropbox_folder_check.setChecked(settings['dropbox_folder'])
+        self.dropbox_folder_edit.setText(settings['dropbox_folder_path'])
+        
+        self.onedrive_check.setChecked(settings['onedrive_enabled'])
+        self.onedrive_auto_check.setChecked(settings['onedrive_auto'])
+        self.onedrive_folder_check.setChecked(settings['onedrive_folder'])
+        self.onedrive_folder_edit.setText(settings['onedrive_folder_path'])
+    
+    @pyqtSlot()
     def save_settings(self):
         """Save settings from UI to database"""
-        # General tab
-        self.database.set_setting('default_save_path', self.default_path_edit.text())
-        self.database.set_setting('ask_location', self.always_ask_check.isChecked())
+        # Collected first and written in one transaction; tabs that were
+        # never opened keep their stored values
+        values = {}
+        for index, built in enumerate(self._tab_built):
+            if built:
+                self._tab_handlers[index][2](values)
+        
+        # Written by the database's background writer so the UI never waits on disk
+        self.database.submit_write(self.database.set_settings, values)
+        
+        QMessageBox.information(self, self.texts["app_name"], self.texts["save"])
+        self.accept()
+    
+    def _save_general_settings(self, values):
+        """Collect the General tab"""
+        values['default_save_path'] = self.default_path_edit.text()
+        values['ask_location'] = self.always_ask_check.isChecked()
         
-        # Theme - convert display text back to internal value
-        theme = 'dark' if self.theme_combo.currentText() == translations.get_text("dark") else 'light'
-        self.database.set_setting('theme', theme)
+        # Theme - stored as the item's internal value
+        values['theme'] = self.theme_combo.currentData()
         
         # Language
         new_lang = self.lang_combo.currentData()
         current_lang = self.database.get_setting('language', translations.current_language)
         
         if new_lang != current_lang:
-            self.database.set_setting('language', new_lang)
+            values['language'] = new_lang
             # Notify user about language change requiring restart
-            QMessageBox.information(self, translations.get_text("app_name"), 
-                                    translations.get_text("language_changed"))
+            QMessageBox.information(self, self.texts["app_name"], 
+                                    self.texts["language_changed"])
         
-        self.database.set_setting('minimize_to_tray', self.tray_check.isChecked())
+        values['minimize_to_tray'] = self.tray_check.isChecked()
         if hasattr(self, 'startup_check'):
-            self.database.set_setting('autostart', self.startup_check.isChecked())
-        self.database.set_setting('auto_start_queue', self.auto_start_check.isChecked())
-        self.database.set_setting('remember_history', self.history_check.isChecked())
-        self.database.set_setting('schedule_shutdown', self.shutdown_check.isChecked())
-        
-        # Connection tab
-        self.database.set_setting('default_connections', self.default_conn_spin.value())
-        self.database.set_setting('max_connections', self.max_conn_spin.value())
+            values['autostart'] = self.startup_check.isChecked()
+        values['auto_start_queue'] = self.auto_start_check.isChecked()
+        values['remember_history'] = self.history_check.isChecked()
+        values['schedule_shutdown'] = self.shutdown_check.isChecked()
+    
+    def _save_connection_settings(self, values):
+        """Collect the Connection tab"""
+        values['default_connections'] = self.default_conn_spin.value()
+        values['max_connections'] = self.max_conn_spin.value()
         
         bandwidth_limit = self.bandwidth_slider.value() if self.limit_bandwidth_check.isChecked() else 0
-        self.database.set_setting('bandwidth_limit', bandwidth_limit)
+        values['bandwidth_limit'] = bandwidth_limit
         
-        self.database.set_setting('proxy_enabled', self.use_proxy_check.isChecked())
-        self.database.set_setting('proxy_url', self.proxy_url_edit.text())
+        values['proxy_enabled'] = self.use_proxy_check.isChecked()
+        values['proxy_url'] = self.proxy_url_edit.text()
         
         if self.use_proxy_check.isChecked() and self.proxy_auth_check.isChecked():
-            self.database.set_setting('proxy_username', self.proxy_user_edit.text())
-            self.database.set_setting('proxy_password', self.proxy_pass_edit.text())
+            values['proxy_username'] = self.proxy_user_edit.text()
+            values['proxy_password'] = self.proxy_pass_edit.text()
         else:
-            self.database.set_setting('proxy_username', '')
-            self.database.set_setting('proxy_password', '')
-        
-        # Notification tab
-        self.database.set_setting('notifications_enabled', self.notify_complete_check.isChecked())
-        self.database.set_setting('sound_enabled', self.notify_error_check.isChecked())
+            values['proxy_username'] = ''
+            values['proxy_password'] = ''
+    
+    def _save_notification_settings(self, values):
+        """Collect the Notifications tab"""
+        values['notifications_enabled'] = self.notify_complete_check.isChecked()
+        values['sound_enabled'] = self.notify_error_check.isChecked()
         
-        self.database.set_setting('email_notifications', self.email_check.isChecked())
+        values['email_notifications'] = self.email_check.isChecked()
         if self.email_check.isChecked():
-            self.database.set_setting('email_address', self.email_acc_edit.text())
-            self.database.set_setting('smtp_server', self.smtp_edit.text())
-            self.database.set_setting('smtp_password', self.email_pass_edit.text())
+            values['email_address'] = self.email_acc_edit.text()
+            values['smtp_server'] = self.smtp_edit.text()
+            values['smtp_password'] = self.email_pass_edit.text()
         
-        self.database.set_setting('telegram_notifications', self.telegram_check.isChecked())
+        values['telegram_notifications'] = self.telegram_check.isChecked()
         if self.telegram_check.isChecked():
-            self.database.set_setting('telegram_token', self.bot_edit.text())
-            self.database.set_setting('telegram_chat_id', self.chat_edit.text())
-        
-        # Cloud tab
-        self.database.set_setting('gdrive_enabled', self.gdrive_check.isChecked())
-        self.database.set_setting('gdrive_auto', self.gdrive_auto_check.isChecked())
-        self.database.set_setting('gdrive_folder', self.gdrive_folder_check.isChecked())
-        self.database.set_setting('gdrive_folder_name', self.gdrive_folder_edit.text())
-        
-        self.database.set_setting('dropbox_enabled', self.dropbox_check.isChecked())
-        self.database.set_setting('dropbox_auto', self.dropbox_auto_check.isChecked())
-        self.database.set_setting('dropbox_folder', self.dropbox_folder_check.isChecked())
-        self.database.set_setting('dropbox_folder_path', self.dropbox_folder_edit.text())
-        
-        self.database.set_setting('onedrive_enabled', self.onedrive_check.isChecked())
-        self.database.set_setting('onedrive_auto', self.onedrive_auto_check.isChecked())
-        self.database.set_setting('onedrive_folder', self.onedrive_folder_check.isChecked())
-        self.database.set_setting('onedrive_folder_path', self.onedrive_folder_edit.text())
-        
-        QMessageBox.information(self, translations.get_text("app_name"), translations.get_text("save"))
-        self.accept()
+            values['telegram_token'] = self.bot_edit.text()
+            values['telegram_chat_id'] = self.chat_edit.text()
+    
+    def _save_cloud_settings(self, values):
+        """Collect the Cloud Services tab"""
+        values['gdrive_enabled'] = self.gdrive_check.isChecked()
+        values['gdrive_auto'] = self.gdrive_auto_check.isChecked()
+        values['gdrive_folder'] = self.gdrive_folder_check.isChecked()
+        values['gdrive_folder_name'] = self.gdrive_folder_edit.text()
+        
+        values['dropbox_enabled'] = self.dropbox_check.isChecked()
+        values['dropbox_auto'] = self.dropbox_auto_check.isChecked()
+        values['dropbox_folder'] = self.dropbox_folder_check.isChecked()
+        values['dropbox_folder_path'] = self.dropbox_folder_edit.text()
+        
+        values['onedrive_enabled'] = self.onedrive_check.isChecked()
+        values['onedrive_auto'] = self.onedrive_auto_check.isChecked()
+        values['onedrive_folder'] = self.onedrive_folder_check.isChecked()
+        values['onedrive_folder_path'] = self.onedrive_folder_edit.text()
 
 if __name__ == "__main__":
-    from PyQt5.QtWidgets import QApplication
     app = QApplication(sys.argv)
     
     dialog = SettingsDialog()
@@ -3,6 +3,8 @@ Multilingual support for FlashGet Download Manager
 Supported languages: Persian, English, Chinese, Arabic
 """
 
+from functools import lru_cache
+
 # Application name is "FlashGet" in all languages
 
 # Dictionary for translations
@@ -266,36 +268,54 @@ DEFAULT_LANGUAGE = "en"
 # Current language setting
 current_language = DEFAULT_LANGUAGE
 
+# Catalogs for get_text, rebound by set_language so lookups skip resolving
+# the language on every call
+_current_dict = TRANSLATIONS[DEFAULT_LANGUAGE]
+_fallback_dict = TRANSLATIONS["en"]
+
 def get_text(key):
     """Get translated text for a given key"""
-    if key in TRANSLATIONS[current_language]:
-        return TRANSLATIONS[current_language][key]
-    # Fallback to English if key not found in current language
-    elif key in TRANSLATIONS["en"]:
-        return TRANSLATIONS["en"][key]
-    # Return the key itself if not found
-    return key
+    text = _current_dict.get(key)
+    if text is None:
+        # Fallback to English, then to the key itself
+        return _fallback_dict.get(key, key)
+    return text
+
+def get_texts(keys):
+    """Get translated texts for several keys as a {key: text} dict
+    
+    The dict is shared between callers asking for the same keys, so it must
+    not be modified.
+    """
+    return _get_texts(current_language, tuple(keys))
+
+@lru_cache(maxsize=32)
+def _get_texts(lang_code, keys):
+    """Resolve a tuple of keys in one pass, memoized per (language, keys)"""
+    catalog = TRANSLATIONS[lang_code]
+    fallback = TRANSLATIONS["en"]
+    return {key: catalog.get(key, fallback.get(key, key)) for key in keys}
 
 def set_language(lang_code):
     """Set the current language"""
-    global current_language
+    global current_language, _current_dict
     if lang_code in TRANSLATIONS:
         current_language = lang_code
+        _current_dict = TRANSLATIONS[lang_code]
+        # Entries for the previous language will not be asked for again
+        _get_texts.cache_clear()
         return True
     return False
 
+# Display names of the catalogs; the list is built once, in TRANSLATIONS order
+_LANG_NAMES = {
+    "fa": "Persian - فارسی",
+    "en": "English",
+    "zh": "Chinese - 中文",
+    "ar": "Arabic - العربية",
+}
+_AVAILABLE_LANGUAGES = tuple((code, _LANG_NAMES.get(code, "")) for code in TRANSLATIONS)
+
 def get_available_languages():
     """Get available language codes and names"""
-    languages = []
-    for code in TRANSLATIONS.keys():
-        name = ""
-        if code == "fa":
-            name = "Persian - فارسی"
-        elif code == "en":
-            name = "English"
-        elif code == "zh":
-            name = "Chinese - 中文"
-        elif code == "ar":
-            name = "Arabic - العربية"
-        languages.append((code, name))
-    return languages 
\ No newline at end of file
+    return _AVAILABLE_LANGUAGES
@@ -1,6 +1,8 @@
 import os
+import re
 import sys
 import hashlib
+import functools
 import time
 import tempfile
 import subprocess
@@ -9,17 +11,64 @@ import platform
 import shutil
 from pathlib import Path
 import threading
+import concurrent.futures
 import webbrowser
 import mimetypes
+import mmap
 from urllib.parse import urlparse
-import ctypes
 from PyQt5.QtCore import QStandardPaths
 
+# blake3 is optional; get_file_hash only offers it when it's installed
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# psutil is optional; without it the process and network helpers shell out
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # Define constants
 APP_NAME = "ADX Downloader"
 APP_VERSION = "1.0.0"
 USER_AGENT = f"{APP_NAME}/{APP_VERSION}"
 
+# The platform can't change while the process runs, so look it up once
+_SYSTEM = platform.system()
+_IS_WINDOWS = _SYSTEM == 'Windows'
+_IS_DARWIN = _SYSTEM == 'Darwin'
+
+# Load the MIME tables now rather than on the first lookup
+mimetypes.init()
+
+# Units used by format_size, each 1024 times the previous one
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+# Number and unit of a size string such as "1.5 GB", for parse_size. Only
+# ASCII digits count; the old isdigit() loop accepting other digits was an
+# accident, not a feature
+_SIZE_RE = re.compile(r'^\s*([\d.]+)\s*([A-Z]*)\s*$', re.ASCII)
+_SIZE_MULTIPLIERS = {
+    "B": 1,
+    "KB": 1024,
+    "MB": 1024 * 1024,
+    "GB": 1024 * 1024 * 1024,
+    "TB": 1024 * 1024 * 1024 * 1024
+}
+
+# Hash algorithms accepted by get_file_hash
+_HASH_TYPES = ("md5", "sha1", "sha256") + (("blake3",) if blake3 else ())
+
+# get_file_hash maps files above this size instead of reading them; on
+# Windows very large mappings are skipped to spare the address space
+_MMAP_MIN_SIZE = 8 << 20
+_MMAP_MAX_SIZE_WINDOWS = 2 << 30
+
+# The directory helpers are cached: the locations don't change while the
+# app runs and the directories exist after the first call
+@functools.lru_cache(maxsize=1)
 def get_app_data_dir():
     """Get application data directory"""
     app_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
@@ -28,18 +77,18 @@ def get_app_data_dir():
         app_dir = os.path.join(os.path.expanduser("~"), ".adxdownloader")
     
     # Create directory if it doesn't exist
-    if not os.path.exists(app_dir):
-        os.makedirs(app_dir)
+    os.makedirs(app_dir, exist_ok=True)
     
     return app_dir
 
+@functools.lru_cache(maxsize=1)
 def get_app_config_dir():
     """Get application configuration directory"""
     config_dir = os.path.join(get_app_data_dir(), "config")
-    if not os.path.exists(config_dir):
-        os.makedirs(config_dir)
+    os.makedirs(config_dir, exist_ok=True)
     return config_dir
 
+@functools.lru_cache(maxsize=1)
 def get_downloads_dir():
     """Get default downloads directory"""
     return QStandardPaths.writableLocation(QStandardPaths.DownloadLocation)
@@ -54,11 +103,16 @@ def is_valid_url(url):
 
 def get_filename_from_url(url):
     """Extract filename from URL"""
-    parsed_url = urlparse(url)
-    path = parsed_url.path
+    # Slice the path out directly; a full urlparse is wasted on one segment
+    path = url.split('#', 1)[0].split('?', 1)[0]
+    scheme_end = path.find('://')
+    if scheme_end != -1:
+        # Drop the scheme and host; a bare host has no path at all
+        slash = path.find('/', scheme_end + 3)
+        path = path[slash:] if slash != -1 else ''
     
-    # Get basename from path
-    filename = os.path.basename(path)
+    # Get basename from path, without any ;params
+    filename = path.rsplit('/', 1)[-1].split(';', 1)[0]
     
     # If filename is empty or doesn't have an extension, use a default name
     if not filename or '.' not in filename:
@@ -75,41 +129,19 @@ def format_size(size_bytes):
     """Format size in bytes to human-readable string"""
     if size_bytes < 1024:
         return f"{size_bytes:.2f} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes/1024:.2f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes/(1024*1024):.2f} MB"
-    else:
-        return f"{size_bytes/(1024*1024*1024):.2f} GB"
+    # Every unit is 2**10 times the previous one, so the bit length picks it directly
+    index = min(len(_SIZE_UNITS) - 1, (int(size_bytes).bit_length() - 1) // 10)
+    return f"{size_bytes / (1 << (index * 10)):.2f} {_SIZE_UNITS[index]}"
 
 def parse_size(size_str):
     """Parse size string to bytes"""
-    size_str = size_str.strip().upper()
-    units = {
-        "B": 1,
-        "KB": 1024,
-        "MB": 1024 * 1024,
-        "GB": 1024 * 1024 * 1024,
-        "TB": 1024 * 1024 * 1024 * 1024
-    }
-    
     try:
-        number = ""
-        unit = ""
-        
-        for char in size_str:
-            if char.isdigit() or char == '.':
-                number += char
-            else:
-                unit += char
-        
-        number = float(number)
-        unit = unit.strip()
-        
-        if unit in units:
-            return int(number * units[unit])
-        else:
-            return int(number)
+        match = _SIZE_RE.match(size_str.upper())
+        if not match:
+            return 0
+        number, unit = match.groups()
+        # Unknown units are read as plain bytes
+        return int(float(number) * _SIZE_MULTIPLIERS.get(unit, 1))
     except:
         return 0
 
@@ -129,65 +161,124 @@ def format_time_detailed(seconds):
     if seconds < 0:
         return "--:--:--"
     
-    hours = int(seconds / 3600)
-    minutes = int((seconds % 3600) / 60)
-    secs = int(seconds % 60)
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
     
     if hours > 0:
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     else:
         return f"{minutes:02d}:{secs:02d}"
 
-def get_file_hash(file_path, hash_type="md5", block_size=65536):
-    """Calculate file hash"""
-    if not os.path.exists(file_path):
-        return None
-    
-    if hash_type == "md5":
-        hasher = hashlib.md5()
-    elif hash_type == "sha1":
-        hasher = hashlib.sha1()
-    elif hash_type == "sha256":
-        hasher = hashlib.sha256()
-    else:
+def _new_hasher(hash_type):
+    """Create a hash object for one of _HASH_TYPES"""
+    if hash_type == "blake3":
+        return blake3.blake3()
+    # Checksums aren't a security boundary here, which also keeps MD5
+    # available on FIPS-restricted OpenSSL builds
+    return hashlib.new(hash_type, usedforsecurity=False)
+
+def get_file_hash(file_path, hash_type="sha256", block_size=1 << 20):
+    """Calculate file hash
+
+    SHA-256 is the default: on CPUs with SHA extensions OpenSSL hashes it
+    faster than MD5.
+    """
+    if hash_type not in _HASH_TYPES or not os.path.exists(file_path):
         return None
-    
-    with open(file_path, 'rb') as f:
-        buf = f.read(block_size)
-        while len(buf) > 0:
-            hasher.update(buf)
-            buf = f.read(block_size)
-    
+
+    with open(file_path, 'rb', buffering=0) as f:
+        # Map large files and hash them in a single update; the OS pages
+        # the data in and no user-space buffer is filled or copied
+        size = os.fstat(f.fileno()).st_size
+        if size > _MMAP_MIN_SIZE and (not _IS_WINDOWS or size <= _MMAP_MAX_SIZE_WINDOWS):
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hasher = _new_hasher(hash_type)
+                    hasher.update(mm)
+                    return hasher.hexdigest()
+            except (OSError, ValueError):
+                # Not mappable (e.g. some network shares); read it instead
+                pass
+
+        # Python 3.11+ runs the whole read/update loop in C
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, lambda: _new_hasher(hash_type)).hexdigest()
+
+        # Read into one reusable buffer instead of a new bytes per chunk
+        hasher = _new_hasher(hash_type)
+        view = memoryview(bytearray(block_size))
+        n = f.readinto(view)
+        while n:
+            hasher.update(view[:n])
+            n = f.readinto(view)
+
     return hasher.hexdigest()
 
+def get_file_hashes(file_paths, hash_type="sha256", max_workers=None):
+    """Calculate the hashes of several files in parallel
+
+    hashlib releases the GIL while it hashes, so threads scale across cores.
+    Returns a dict mapping each path to its hash, or to None when the file
+    is missing or couldn't be read.
+    """
+    unique_paths = list(dict.fromkeys(file_paths))
+    if not unique_paths:
+        return {}
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(unique_paths))) as executor:
+        futures = {executor.submit(get_file_hash, path, hash_type): path for path in unique_paths}
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except OSError as e:
+                print(f"Error hashing {path}: {e}")
+                results[path] = None
+
+    return results
+
+@functools.lru_cache(maxsize=1024)
+def _guess_mime_type(suffixes):
+    """Guess the MIME type for a file name ending in suffixes"""
+    mime_type, _ = mimetypes.guess_type("file" + suffixes)
+    return mime_type or "application/octet-stream"
+
 def get_file_mime_type(file_path):
     """Get file MIME type"""
-    mime_type, _ = mimetypes.guess_type(file_path)
-    return mime_type or "application/octet-stream"
+    # Only the suffixes decide the type, so cache on those instead of the
+    # full path; keep the one before an encoding such as .gz (.tar.gz)
+    root, ext = os.path.splitext(os.path.basename(file_path))
+    if ext in mimetypes.encodings_map or ext in mimetypes.suffix_map:
+        ext = os.path.splitext(root)[1] + ext
+    return _guess_mime_type(ext)
 
 def open_file(file_path):
     """Open a file with the default application"""
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         os.startfile(file_path)
-    elif platform.system() == 'Darwin':  # macOS
+    elif _IS_DARWIN:  # macOS
         subprocess.call(['open', file_path])
     else:  # Linux and others
         subprocess.call(['xdg-open', file_path])
 
 def open_directory(dir_path):
     """Open directory in file explorer"""
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         os.startfile(dir_path)
-    elif platform.system() == 'Darwin':  # macOS
+    elif _IS_DARWIN:  # macOS
         subprocess.call(['open', dir_path])
     else:  # Linux and others
         subprocess.call(['xdg-open', dir_path])
 
 def show_in_explorer(file_path):
     """Show file in explorer/finder with selection"""
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         subprocess.run(['explorer', '/select,', file_path])
-    elif platform.system() == 'Darwin':  # macOS
+    elif _IS_DARWIN:  # macOS
         subprocess.call(['open', '-R', file_path])
     else:  # Linux
         directory = os.path.dirname(file_path)
@@ -195,22 +286,42 @@ def show_in_explorer(file_path):
 
 def check_free_space(path):
     """Check free space in directory"""
-    if platform.system() == 'Windows':
-        free_bytes = ctypes.c_ulonglong(0)
-        ctypes.windll.kernel32.GetDiskFreeSpaceExW(
-            ctypes.c_wchar_p(path), None, None, ctypes.pointer(free_bytes))
-        return free_bytes.value
-    else:
-        st = os.statvfs(path)
-        return st.f_bavail * st.f_frsize
+    # Calls GetDiskFreeSpaceExW from C on Windows and statvfs elsewhere
+    return shutil.disk_usage(path).free
+
+def _bind_port(port):
+    """Bind a TCP socket to localhost:port and return it, or None if taken"""
+    # No SO_REUSEADDR: on Windows, macOS and the BSDs it lets the probe bind
+    # next to a live listener and report a busy port as free
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        s.bind(('localhost', port))
+        return s
+    except OSError:
+        s.close()
+        return None
 
 def is_port_in_use(port):
     """Check if port is in use"""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('localhost', port)) == 0
+    # A bind is one local syscall; connecting ran a loopback TCP handshake
+    s = _bind_port(port)
+    if s is None:
+        return True
+    s.close()
+    return False
 
 def find_free_port(start_port=8000, max_port=9000):
-    """Find a free port in range"""
+    """Find a free port in range
+
+    Pass start_port=None to take any free port the system hands out.
+    """
+    if start_port is None:
+        s = _bind_port(0)
+        if s is None:
+            return None
+        with s:
+            return s.getsockname()[1]
+    
     for port in range(start_port, max_port):
         if not is_port_in_use(port):
             return port
@@ -218,54 +329,70 @@ def find_free_port(start_port=8000, max_port=9000):
 
 def is_process_running(process_name):
     """Check if a process is running by name"""
-    if platform.system() == 'Windows':
+    process_name = process_name.lower()
+    if psutil is not None:
+        # Enumerate in-process instead of spawning and parsing tasklist/ps
+        return any(process_name in (proc.info['name'] or '').lower()
+                   for proc in psutil.process_iter(['name']))
+    
+    if _IS_WINDOWS:
         output = subprocess.check_output(['tasklist']).decode()
-        return process_name.lower() in output.lower()
+        return process_name in output.lower()
     else:
         output = subprocess.check_output(['ps', '-A']).decode()
-        return process_name.lower() in output.lower()
+        return process_name in output.lower()
 
-def is_internet_connected(test_url="https://www.google.com", timeout=5):
+def is_internet_connected(host="1.1.1.1", port=53, timeout=5):
     """Check if internet is connected"""
+    # A bare TCP connect to a public DNS server needs no name lookup,
+    # TLS handshake or HTTP request
     try:
-        import urllib.request
-        urllib.request.urlopen(test_url, timeout=timeout)
-        return True
-    except:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
         return False
 
-def get_system_proxy():
-    """Get system proxy settings"""
+@functools.lru_cache(maxsize=1)
+def _read_system_proxy():
+    """Read the proxy settings from the registry once per run"""
     proxies = {}
     
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         try:
             import winreg
-            reg_key = winreg.OpenKey(
+            with winreg.OpenKey(
                 winreg.HKEY_CURRENT_USER,
                 r"Software\Microsoft\Windows\CurrentVersion\Internet Settings"
-            )
-            proxy_enabled = winreg.QueryValueEx(reg_key, "ProxyEnable")[0]
-            
-            if proxy_enabled:
-                proxy_server = winreg.QueryValueEx(reg_key, "ProxyServer")[0]
-                proxies["http"] = f"http://{proxy_server}"
-                proxies["https"] = f"http://{proxy_server}"
+            ) as reg_key:
+                proxy_enabled = winreg.QueryValueEx(reg_key, "ProxyEnable")[0]
+                
+                if proxy_enabled:
+                    proxy_server = winreg.QueryValueEx(reg_key, "ProxyServer")[0]
+                    proxies["http"] = f"http://{proxy_server}"
+                    proxies["https"] = f"http://{proxy_server}"
         except:
             pass
     
     return proxies
 
+def get_system_proxy():
+    """Get system proxy settings"""
+    # Copy so callers can't modify the cached settings
+    return dict(_read_system_proxy())
+
+# Call after the user changes the system proxy to read it again
+get_system_proxy.cache_clear = _read_system_proxy.cache_clear
+
 def shutdown_computer(delay=60):
     """Shut down the computer after delay (in seconds)"""
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         os.system(f'shutdown /s /t {delay}')
     else:
         os.system(f'shutdown -h +{delay//60}')
 
 def cancel_shutdown():
     """Cancel scheduled shutdown"""
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         os.system('shutdown /a')
     else:
         os.system('shutdown -c')
@@ -284,47 +411,47 @@ def create_temp_dir():
     """Create a temporary directory and return its path"""
     return tempfile.mkdtemp()
 
-def get_available_browsers():
-    """Get list of available browsers on the system"""
-    browsers = []
-    
-    # Check common browsers
-    common_browsers = {
-        'windows': [
-            ('chrome', r'C:\Program Files\Google\Chrome\Application\chrome.exe'),
-            ('chrome', r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe'),
-            ('firefox', r'C:\Program Files\Mozilla Firefox\firefox.exe'),
-            ('firefox', r'C:\Program Files (x86)\Mozilla Firefox\firefox.exe'),
-            ('edge', r'C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe'),
-            ('edge', r'C:\Program Files\Microsoft\Edge\Application\msedge.exe'),
-        ],
-        'darwin': [
-            ('chrome', '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'),
-            ('firefox', '/Applications/Firefox.app/Contents/MacOS/firefox'),
-            ('safari', '/Applications/Safari.app/Contents/MacOS/Safari'),
-        ],
-        'linux': [
-            ('chrome', '/usr/bin/google-chrome'),
-            ('chrome', '/usr/bin/google-chrome-stable'),
-            ('firefox', '/usr/bin/firefox'),
-            ('chromium', '/usr/bin/chromium'),
-            ('chromium', '/usr/bin/chromium-browser'),
-        ]
-    }
-    
-    system = platform.system().lower()
-    if system == 'windows':
-        check_paths = common_browsers['windows']
-    elif system == 'darwin':
-        check_paths = common_browsers['darwin']
+# Common browser install locations, per platform
+_COMMON_BROWSERS = {
+    'windows': [
+        ('chrome', r'C:\Program Files\Google\Chrome\Application\chrome.exe'),
+        ('chrome', r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe'),
+        ('firefox', r'C:\Program Files\Mozilla Firefox\firefox.exe'),
+        ('firefox', r'C:\Program Files (x86)\Mozilla Firefox\firefox.exe'),
+        ('edge', r'C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe'),
+        ('edge', r'C:\Program Files\Microsoft\Edge\Application\msedge.exe'),
+    ],
+    'darwin': [
+        ('chrome', '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'),
+        ('firefox', '/Applications/Firefox.app/Contents/MacOS/firefox'),
+        ('safari', '/Applications/Safari.app/Contents/MacOS/Safari'),
+    ],
+    'linux': [
+        ('chrome', '/usr/bin/google-chrome'),
+        ('chrome', '/usr/bin/google-chrome-stable'),
+        ('firefox', '/usr/bin/firefox'),
+        ('chromium', '/usr/bin/chromium'),
+        ('chromium', '/usr/bin/chromium-browser'),
+    ]
+}
+
+@functools.lru_cache(maxsize=1)
+def _find_browsers():
+    """Stat the browser locations for this platform once per run"""
+    if _IS_WINDOWS:
+        check_paths = _COMMON_BROWSERS['windows']
+    elif _IS_DARWIN:
+        check_paths = _COMMON_BROWSERS['darwin']
     else:
-        check_paths = common_browsers['linux']
-    
-    for browser_name, path in check_paths:
-        if os.path.exists(path):
-            browsers.append((browser_name, path))
+        check_paths = _COMMON_BROWSERS['linux']
     
-    return browsers
+    return tuple((browser_name, path) for browser_name, path in check_paths
+                 if os.path.isfile(path))
+
+def get_available_browsers():
+    """Get list of available browsers on the system"""
+    # Copy so callers can't modify the cached result
+    return list(_find_browsers())
 
 def open_browser(url, browser=None):
     """Open URL in specified browser or default browser"""
@@ -343,8 +470,12 @@ def make_portable_dir(install_dir):
     os.makedirs(os.path.join(install_dir, 'config'), exist_ok=True)
     os.makedirs(os.path.join(install_dir, 'data'), exist_ok=True)
     os.makedirs(os.path.join(install_dir, 'downloads'), exist_ok=True)
+    # The new config directory can turn portable mode on
+    is_portable_mode.cache_clear()
     return True
 
+# Cached: the answer only changes through make_portable_dir, which clears it
+@functools.lru_cache(maxsize=16)
 def is_portable_mode(app_path):
     """Check if application is running in portable mode"""
     app_dir = os.path.dirname(os.path.abspath(app_path))
@@ -353,9 +484,13 @@ def is_portable_mode(app_path):
 
 def get_network_interfaces():
     """Get list of network interfaces"""
+    if psutil is not None:
+        # Ask the OS directly instead of running and parsing ipconfig/ifconfig
+        return list(psutil.net_if_addrs())
+    
     interfaces = []
     
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         # Use ipconfig on Windows
         try:
             output = subprocess.check_output(['ipconfig', '/all']).decode('latin1')